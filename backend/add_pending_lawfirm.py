@@ -51,7 +51,7 @@ async def add_pending_lawfirm():
         "website": "www.singhassociates.com",
         "description": "A full-service corporate law firm specializing in M&A, banking, and commercial transactions. We serve startups, SMEs, and large corporations across India.",
         "status": "pending",
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "created_at": datetime.now(timezone.utc)
     }
     
     try:
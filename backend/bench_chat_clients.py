@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark the pooled LLM chat clients against the local stub provider.
+
+The stub charges a one-off setup cost (client construction plus connection/TLS
+handshake) the first time a client instance sends, then a fixed per-turn
+latency. Compares response latency for repeat chatters with the pool
+disabled and enabled.
+
+Usage:
+    python bench_chat_clients.py [--sessions 50] [--turns 5] [--setup-ms 150] [--turn-ms 20]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+ROOT_DIR = Path(__file__).parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from services import chat_service, llm_limiter, llm_providers
+
+
+async def run(sessions: int, turns: int) -> list:
+    """Send turns from every session concurrently; return per-turn latencies in ms"""
+    latencies = []
+
+    async def chatter(session_id: str):
+        for turn in range(turns):
+            started = time.perf_counter()
+            await chat_service.send_chat_message(f'question {turn}', session_id)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(chatter(f'bench_{i}') for i in range(sessions)))
+    return latencies
+
+
+def report(label: str, latencies: list):
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2]
+    p95 = ordered[int(len(ordered) * 0.95)]
+    print(f"{label:<14} p50 {p50:7.1f} ms   p95 {p95:7.1f} ms   mean {sum(ordered) / len(ordered):7.1f} ms")
+
+
+async def main(args):
+    llm_providers.LLM_STUB_SETUP_MS = args.setup_ms
+    llm_providers.LLM_STUB_LATENCY_MS = args.turn_ms
+    llm_providers.LLM_STUB_LATENCY_SIGMA = 0
+    llm_providers.set_provider(llm_providers.StubProvider())
+    # Keep admission control out of the comparison
+    llm_limiter.LLM_MAX_CONCURRENCY = args.sessions
+
+    chat_service.LLM_CLIENT_POOL_MAX_SESSIONS = 0
+    report('pool disabled', await run(args.sessions, args.turns))
+    await chat_service.close_chat_clients()
+
+    chat_service.LLM_CLIENT_POOL_MAX_SESSIONS = args.sessions
+    report('pool enabled', await run(args.sessions, args.turns))
+    print(chat_service.get_chat_client_stats())
+    await chat_service.close_chat_clients()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark pooled LLM chat clients')
+    parser.add_argument('--sessions', type=int, default=50)
+    parser.add_argument('--turns', type=int, default=5)
+    parser.add_argument('--setup-ms', type=float, default=150)
+    parser.add_argument('--turn-ms', type=float, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark free-text profile search over synthetic lawyer and law firm profiles.
+
+Loads N generated profiles into a scratch database (<DB_NAME>_bench, dropped
+afterwards unless --keep), builds the users indexes, then times
+search_profiles against a case-insensitive $regex scan over the same fields,
+which is what a search without the text index would have to do.
+
+Needs a real MongoDB ($text is not available in mongomock).
+
+Usage:
+    python bench_profile_search.py [--profiles 50000] [--queries 200] [--keep]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import re
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add backend to path
+ROOT_DIR = Path(__file__).parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from services import database, indexes, profile_search
+
+FIRST_NAMES = ['Aarav', 'Priya', 'Rohan', 'Ananya', 'Vikram', 'Meera', 'Arjun', 'Kavya', 'Sanjay', 'Neha', 'Imran', 'Farah']
+LAST_NAMES = ['Sharma', 'Iyer', 'Patel', 'Reddy', 'Khan', 'Mehta', 'Nair', 'Gupta', 'Singh', 'Das', 'Joshi', 'Kapoor']
+SPECIALIZATIONS = ['Property Law', 'Criminal Law', 'Family Law', 'Corporate Law', 'Tax Law', 'Labour Law',
+                   'Consumer Protection', 'Intellectual Property', 'Civil Litigation', 'Cyber Law']
+PLACES = [('Mumbai', 'Maharashtra', 'Bandra'), ('Mumbai', 'Maharashtra', 'Andheri'), ('Delhi', 'Delhi', 'Saket'),
+          ('Bengaluru', 'Karnataka', 'Koramangala'), ('Chennai', 'Tamil Nadu', 'Adyar'), ('Pune', 'Maharashtra', 'Kothrud'),
+          ('Kolkata', 'West Bengal', 'Salt Lake'), ('Hyderabad', 'Telangana', 'Banjara Hills')]
+COURTS = ['Bombay High Court', 'Delhi High Court', 'Supreme Court of India', 'District Court', 'Consumer Forum']
+LANGUAGES = ['English', 'Hindi', 'Marathi', 'Tamil', 'Kannada', 'Bengali', 'Telugu', 'Gujarati', 'Urdu']
+MATTERS = ['property disputes', 'tenancy and rent matters', 'bail applications', 'divorce and custody',
+           'cheque bounce cases', 'startup contracts', 'GST notices', 'wrongful termination', 'trademark filings',
+           'online fraud complaints', 'land acquisition', 'inheritance and wills']
+QUERIES = ['property dispute lawyer Bandra Hindi', 'divorce custody Pune', 'bail criminal Delhi High Court',
+           'trademark startup Bengaluru', 'GST tax notice', 'cheque bounce Marathi', 'wrongful termination labour',
+           'online fraud cyber Hyderabad', 'inheritance wills Kolkata Bengali', 'rent tenancy Andheri']
+
+
+def synthetic_profile(rng: random.Random) -> dict:
+    city, state, area = rng.choice(PLACES)
+    matters = rng.sample(MATTERS, 3)
+    user_type = rng.choices(['lawyer', 'firm_lawyer', 'law_firm'], weights=[6, 3, 1])[0]
+    profile = {
+        'id': str(uuid.uuid4()),
+        'user_type': user_type,
+        'city': city,
+        'state': state,
+        'rating': round(rng.uniform(3, 5), 1),
+        'is_active': True,
+    }
+    if user_type == 'law_firm':
+        profile.update({
+            'firm_name': f"{rng.choice(LAST_NAMES)} & {rng.choice(LAST_NAMES)} Associates",
+            'practice_areas': rng.sample(SPECIALIZATIONS, 3),
+            'description': f"Full-service firm in {area}, {city} handling {', '.join(matters)}.",
+        })
+    else:
+        profile.update({
+            'full_name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            'specialization': rng.choice(SPECIALIZATIONS),
+            'court': rng.choice(COURTS),
+            'languages': rng.sample(LANGUAGES, rng.randint(1, 3)),
+            'experience_years': rng.randint(1, 35),
+            'bio': f"Practising from {area}, {city}. Regularly appears in {', '.join(matters)}.",
+            'education': rng.choice(['LLB, Government Law College', 'BA LLB, NLSIU', 'LLM, Delhi University']),
+        })
+    return profile
+
+
+async def load(bench_db, count: int, seed: int):
+    rng = random.Random(seed)
+    await bench_db.users.drop()
+    for start in range(0, count, 5000):
+        await bench_db.users.insert_many([synthetic_profile(rng) for _ in range(min(5000, count - start))])
+    await bench_db.users.create_indexes(indexes.INDEXES['users'])
+
+
+async def regex_search(bench_db, q: str, limit: int) -> list:
+    """Baseline: any term in any text field, no ranking beyond rating"""
+    patterns = [re.compile(re.escape(term), re.IGNORECASE) for term in profile_search.query_terms(q)]
+    query = {
+        'user_type': {'$in': profile_search.SEARCHABLE_USER_TYPES},
+        '$or': [{field: pattern} for field in profile_search.TEXT_WEIGHTS for pattern in patterns],
+    }
+    return await bench_db.users.find(query, profile_search.RESULT_PROJECTION).sort('rating', -1).limit(limit).to_list(limit)
+
+
+async def timed(search, queries: list) -> list:
+    latencies = []
+    for q in queries:
+        started = time.perf_counter()
+        await search(q)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def report(label: str, latencies: list):
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2]
+    p95 = ordered[int(len(ordered) * 0.95)]
+    print(f"{label:<14} p50 {p50:7.1f} ms   p95 {p95:7.1f} ms   mean {sum(ordered) / len(ordered):7.1f} ms")
+
+
+async def main(args):
+    bench_db = database.client[f"{os.environ['DB_NAME']}_bench"]
+    started = time.perf_counter()
+    await load(bench_db, args.profiles, args.seed)
+    print(f"Loaded {args.profiles} profiles and built indexes in {time.perf_counter() - started:.1f} s")
+
+    # search_profiles reads services.database.db; point it at the scratch database
+    profile_search.db = bench_db
+    queries = [QUERIES[i % len(QUERIES)] for i in range(args.queries)]
+
+    top = await profile_search.search_profiles(QUERIES[0], limit=3)
+    for result in top:
+        print(f"  {result['score']:>7}  {result.get('full_name') or result.get('firm_name')}  {result['highlights']}")
+
+    report('text index', await timed(lambda q: profile_search.search_profiles(q, limit=args.limit), queries))
+    report('regex scan', await timed(lambda q: regex_search(bench_db, q, args.limit), queries))
+
+    if not args.keep:
+        await database.client.drop_database(bench_db.name)
+    database.client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark free-text profile search')
+    parser.add_argument('--profiles', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--keep', action='store_true', help='keep the scratch database afterwards')
+    asyncio.run(main(parser.parse_args()))
@@ -42,7 +42,7 @@ async def ensure_admin():
         'password': hash_password('Admin@123'),
         'full_name': 'Admin User',
         'user_type': 'admin',
-        'created_at': datetime.now(timezone.utc).isoformat()
+        'created_at': datetime.now(timezone.utc)
     }
     await db.users.insert_one(admin_data)
     print("✅ Admin created: {admin_data['email']}")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Load test the chat endpoints of a running backend.
+
+Start the server against the local stub provider so no provider calls are
+made, e.g.:
+    LLM_PROVIDER=stub LLM_STUB_LATENCY_MS=300 uvicorn server:app --port 8001
+
+then drive it:
+    python load_test_chat.py [--url http://localhost:8001/api] [--mode guest|auth|stream]
+                             [--concurrency 50] [--requests 1000] [--questions 20]
+
+The auth mode registers one client account per worker before the timed run
+so the chat_history writes are exercised too. Prints throughput, latency
+percentiles, status codes and the server's /metrics snapshot.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from collections import Counter
+
+import httpx
+
+QUESTIONS = [
+    'How do I get bail?', 'How to file an FIR?', 'Divorce process in India',
+    'Property dispute with my brother', 'Consumer complaint against a shop',
+    'Cheque bounce case', 'Tenant not paying rent', 'Domestic violence help',
+    'How to make a will?', 'Police refused to register my complaint',
+]
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0
+
+
+async def register(client: httpx.AsyncClient, url: str) -> dict:
+    """Create a throwaway client account and return auth headers"""
+    response = await client.post(f'{url}/auth/register', json={
+        'email': f'loadtest_{uuid.uuid4().hex[:12]}@example.com',
+        'password': 'loadtest123',
+        'full_name': 'Load Test',
+        'user_type': 'client'
+    })
+    response.raise_for_status()
+    return {'Authorization': f"Bearer {response.json()['token']}"}
+
+
+async def send(client: httpx.AsyncClient, url: str, mode: str, message: str, headers: dict) -> tuple:
+    """Send one chat request; return (status, seconds to first byte, total seconds)"""
+    path = {'guest': '/chat/guest', 'auth': '/chat', 'stream': '/chat/guest/stream'}[mode]
+    started = time.perf_counter()
+    first_byte = None
+    async with client.stream('POST', f'{url}{path}', json={'message': message}, headers=headers) as response:
+        async for _ in response.aiter_bytes():
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+    total = time.perf_counter() - started
+    return response.status_code, first_byte or total, total
+
+
+async def main(args):
+    questions = [f'{QUESTIONS[i % len(QUESTIONS)]} ({i // len(QUESTIONS)})' for i in range(args.questions)]
+    statuses = Counter()
+    first_bytes, totals = [], []
+    remaining = iter(range(args.requests))
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=args.timeout) as client:
+        # Register up front and one at a time: signups go through the bounded password pool
+        accounts = [await register(client, args.url) for _ in range(args.concurrency)] if args.mode == 'auth' else []
+
+        async def worker(worker_id: int):
+            headers = accounts[worker_id] if accounts else {}
+            for i in remaining:
+                try:
+                    status, first_byte, total = await send(client, args.url, args.mode, questions[i % len(questions)], headers)
+                except httpx.HTTPError as e:
+                    statuses[type(e).__name__] += 1
+                    continue
+                statuses[status] += 1
+                first_bytes.append(first_byte)
+                totals.append(total)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(w) for w in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+        metrics = (await client.get(f'{args.url}/metrics')).json()
+
+    totals.sort()
+    first_bytes.sort()
+    print(f"{args.mode}: {len(totals)} responses in {elapsed:.1f}s ({len(totals) / elapsed:.1f} req/s)")
+    print(f"latency  p50 {percentile(totals, 0.5) * 1000:7.1f} ms   p95 {percentile(totals, 0.95) * 1000:7.1f} ms   "
+          f"p99 {percentile(totals, 0.99) * 1000:7.1f} ms")
+    print(f"1st byte p50 {percentile(first_bytes, 0.5) * 1000:7.1f} ms   p95 {percentile(first_bytes, 0.95) * 1000:7.1f} ms")
+    print(f"status codes: {dict(statuses)}")
+    print(json.dumps(metrics, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Load test the chat endpoints')
+    parser.add_argument('--url', default='http://localhost:8001/api')
+    parser.add_argument('--mode', choices=['guest', 'auth', 'stream'], default='guest')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--questions', type=int, default=20, help='distinct questions to cycle through')
+    parser.add_argument('--timeout', type=float, default=120)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Convert ISO-string timestamps to native BSON dates.
+
+Streams each collection in _id order and rewrites string timestamp fields in
+batches. Progress is checkpointed in the `migrations` collection, so an
+interrupted run picks up where it left off.
+
+Usage:
+    python migrate_timestamps.py [--batch-size 500] [--collection users] [--dry-run] [--reset]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+from datetime import datetime, timezone
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from dotenv import load_dotenv
+
+# Add backend to path
+ROOT_DIR = Path(__file__).parent
+sys.path.insert(0, str(ROOT_DIR))
+
+load_dotenv(ROOT_DIR / '.env')
+
+# Database connection
+MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
+DB_NAME = os.environ.get('DB_NAME', 'test_database')
+client = AsyncIOMotorClient(MONGO_URL, tz_aware=True, tzinfo=timezone.utc)
+db = client[DB_NAME]
+
+# collection -> timestamp fields written by the routes
+TIMESTAMP_FIELDS = {
+    'users': ['created_at'],
+    'cases': ['created_at', 'updated_at'],
+    'documents': ['uploaded_at'],
+    'bookings': ['created_at'],
+    'chat_history': ['timestamp'],
+    'waitlist': ['created_at'],
+    'lawyer_applications': ['created_at'],
+    'lawfirm_applications': ['created_at'],
+    'firm_lawyer_applications': ['created_at', 'updated_at'],
+    'firm_tasks': ['created_at', 'completed_at'],
+    'firm_clients': ['created_at', 'approved_at', 'last_login'],
+    'firm_client_applications': ['created_at', 'reviewed_at'],
+    'client_case_updates': ['created_at'],
+}
+
+
+def parse_timestamp(value: str):
+    """Parse an ISO-8601 string into a UTC datetime, or None if it is not one"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        # Naive values were written with utcnow()
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+async def migrate_collection(name: str, fields: list, batch_size: int, dry_run: bool) -> dict:
+    """Convert one collection in _id-ordered batches, checkpointing after each"""
+    progress_id = f'timestamps:{name}'
+    progress = await db.migrations.find_one({'_id': progress_id}) or {}
+    if progress.get('done'):
+        print(f"⏭️  {name}: already migrated")
+        return progress
+
+    query = {'$or': [{field: {'$type': 'string'}} for field in fields]}
+    if progress.get('last_id') is not None:
+        query['_id'] = {'$gt': progress['last_id']}
+
+    converted = progress.get('converted', 0)
+    skipped = progress.get('skipped', 0)
+    projection = {field: 1 for field in fields}
+    cursor = db[name].find(query, projection).sort('_id', 1).batch_size(batch_size)
+
+    batch = []
+    last_id = progress.get('last_id')
+
+    async def flush():
+        nonlocal batch
+        if batch and not dry_run:
+            await db[name].bulk_write(batch, ordered=False)
+        if not dry_run:
+            await db.migrations.update_one(
+                {'_id': progress_id},
+                {'$set': {'last_id': last_id, 'converted': converted, 'skipped': skipped}},
+                upsert=True
+            )
+        batch = []
+
+    async for doc in cursor:
+        updates = {}
+        for field in fields:
+            value = doc.get(field)
+            if isinstance(value, str):
+                parsed = parse_timestamp(value)
+                if parsed is None:
+                    skipped += 1
+                else:
+                    updates[field] = parsed
+        if updates:
+            batch.append(UpdateOne({'_id': doc['_id']}, {'$set': updates}))
+            converted += 1
+        last_id = doc['_id']
+        if len(batch) >= batch_size:
+            await flush()
+            print(f"   {name}: {converted} documents converted")
+
+    await flush()
+    if not dry_run:
+        await db.migrations.update_one({'_id': progress_id}, {'$set': {'done': True}}, upsert=True)
+
+    print(f"✅ {name}: {converted} documents converted, {skipped} unparseable values left as-is")
+    return {'converted': converted, 'skipped': skipped}
+
+
+async def migrate(collections: list, batch_size: int, dry_run: bool, reset: bool):
+    """Run the migration over the selected collections"""
+    if reset:
+        await db.migrations.delete_many({'_id': {'$in': [f'timestamps:{name}' for name in collections]}})
+
+    for name in collections:
+        await migrate_collection(name, TIMESTAMP_FIELDS[name], batch_size, dry_run)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Convert ISO-string timestamps to BSON dates')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--collection', choices=sorted(TIMESTAMP_FIELDS), action='append')
+    parser.add_argument('--dry-run', action='store_true', help='Count conversions without writing')
+    parser.add_argument('--reset', action='store_true', help='Forget saved progress and rescan')
+    args = parser.parse_args()
+
+    asyncio.run(migrate(args.collection or list(TIMESTAMP_FIELDS), args.batch_size, args.dry_run, args.reset))
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 
 class ChatMessage(BaseModel):
@@ -8,6 +8,13 @@ class ChatMessage(BaseModel):
     system_prompt: Optional[str] = None
 
 
+class ChatCard(BaseModel):
+    type: str
+    title: str
+    content: str
+
+
 class ChatResponse(BaseModel):
     response: str
     session_id: str
+    cards: List[ChatCard] = []
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
 class FirmClientApplication(BaseModel):
     """Model for firm client applications"""
@@ -15,7 +15,7 @@ class FirmClientApplication(BaseModel):
     law_firm_id: str
     law_firm_name: str
     status: str = "pending"  # pending, approved, rejected
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     reviewed_at: Optional[datetime] = None
     reviewed_by: Optional[str] = None  # manager email
     rejection_reason: Optional[str] = None
@@ -35,7 +35,7 @@ class FirmClient(BaseModel):
     assigned_lawyer_id: Optional[str] = None
     assigned_lawyer_name: Optional[str] = None
     status: str = "active"  # active, inactive, completed
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     last_login: Optional[datetime] = None
 
 class ClientCaseUpdate(BaseModel):
@@ -47,7 +47,7 @@ class ClientCaseUpdate(BaseModel):
     title: str
     description: str
     created_by: str  # lawyer or manager email
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class FirmClientLogin(BaseModel):
     """Login credentials for firm clients"""
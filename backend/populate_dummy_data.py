@@ -304,7 +304,7 @@ async def create_law_firms():
             "user_type": "law_firm",
             "phone": firm["phone"],
             "firm_name": firm["firm_name"],
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
             "is_approved": True,
             "specialization": firm["specialization"],
             "address": firm["address"],
@@ -338,7 +338,7 @@ async def create_lawyers():
             "full_name": lawyer["full_name"],
             "user_type": "lawyer",
             "phone": lawyer["phone"],
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
             "is_approved": True,
             "specialization": lawyer["specialization"],
             "experience_years": lawyer["experience_years"],
@@ -379,7 +379,7 @@ async def create_firm_lawyers(law_firms):
             "phone": firm_lawyer["phone"],
             "firm_id": firm["id"],
             "firm_name": firm_lawyer["firm_name"],
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
             "is_active": True,
             "is_approved": True,
             "specialization": firm_lawyer["specialization"],
@@ -420,7 +420,7 @@ async def create_clients(law_firms, firm_lawyers):
             "full_name": client["full_name"],
             "user_type": "client",
             "phone": client["phone"],
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         }
         
         await db.users.insert_one(client_user)
@@ -445,8 +445,8 @@ async def create_clients(law_firms, firm_lawyers):
                     "assigned_lawyer_id": firm_lawyer["id"],
                     "assigned_lawyer_name": firm_lawyer["name"],
                     "status": "active",
-                    "created_at": datetime.now(timezone.utc).isoformat(),
-                    "approved_at": datetime.now(timezone.utc).isoformat()
+                    "created_at": datetime.now(timezone.utc),
+                    "approved_at": datetime.now(timezone.utc)
                 }
                 
                 await db.firm_clients.insert_one(firm_client)
@@ -484,7 +484,7 @@ async def create_applications(law_firms):
             **lawyer,
             "password_hash": hash_password("Pending@123"),
             "status": "pending",
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         }
         await db.lawyer_applications.insert_one(app_data)
         print(f"   ✅ Created pending lawyer application: {lawyer['full_name']}")
@@ -512,7 +512,7 @@ async def create_applications(law_firms):
             **pending_firm_lawyer,
             "password_hash": hash_password("Pending@123"),
             "status": "pending",
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         }
         await db.firm_lawyer_applications.insert_one(app_data)
         print(f"   ✅ Created pending firm lawyer application: {pending_firm_lawyer['full_name']}")
@@ -555,8 +555,8 @@ async def create_cases(clients, lawyers):
         case_data = {
             "id": case_id,
             **case,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc),
+            "updated_at": datetime.now(timezone.utc)
         }
         await db.cases.insert_one(case_data)
         print(f"   ✅ Created case: {case['title']}")
@@ -10,6 +10,9 @@ from .waitlist import router as waitlist_router
 from .admin import router as admin_router
 from .firm_lawyers import router as firm_lawyers_router
 from .firm_clients import router as firm_clients_router
+from .metrics import router as metrics_router
+from .search import router as search_router
+from .suggest import router as suggest_router
 
 __all__ = [
     'auth_router',
@@ -22,5 +25,8 @@ __all__ = [
     'waitlist_router',
     'admin_router',
     'firm_lawyers_router',
-    'firm_clients_router'
+    'firm_clients_router',
+    'metrics_router',
+    'search_router',
+    'suggest_router'
 ]
@@ -1,13 +1,27 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from bson import ObjectId
 from datetime import datetime, timezone
+from typing import Optional
+import asyncio
+import csv
+import io
+import json
+import logging
+import time
 import uuid
 import os
 
 from models.lawyer_application import AdminLogin
 from services.database import db
+from services.pagination import PageParams, page_params, paginate
 from services.auth import create_admin_token, verify_admin_token
+from services.user_cache import invalidate_user, invalidate_user_email
+from services.lawyer_search import fee_bounds
+from services.profile_facets import adjust_profile_facets
+from services.suggest_index import update_suggest_index
+from services.geo import location_fields
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 security = HTTPBearer()
@@ -16,12 +30,71 @@ security = HTTPBearer()
 ADMIN_EMAIL = os.environ.get('ADMIN_EMAIL', 'admin@lxwyerup.com')
 ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD', 'admin123')
 
+# Dashboard summary cache: (expires_at, summary)
+SUMMARY_CACHE_SECONDS = float(os.environ.get('ADMIN_SUMMARY_CACHE_SECONDS', 5))
+_summary_cache = None
+_summary_lock = asyncio.Lock()
+
 
 def get_admin(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Dependency to verify admin token"""
     return verify_admin_token(credentials.credentials)
 
 
+# Fields never shipped in application lists; photos come from GET /admin/lawyer-applications/{app_id}
+APPLICATION_LIST_PROJECTION = {'password_hash': 0, 'password': 0, 'photo': 0}
+APPLICATION_STATUSES = ('pending', 'approved', 'rejected')
+
+
+async def application_stats(collection) -> dict:
+    """Count applications by status with a single $group"""
+    stats = {status: 0 for status in APPLICATION_STATUSES}
+    async for row in collection.aggregate([{'$group': {'_id': '$status', 'count': {'$sum': 1}}}]):
+        if row['_id'] in stats:
+            stats[row['_id']] = row['count']
+    return stats
+
+
+async def list_applications(collection, status: Optional[str], page: PageParams):
+    """Get one page of applications, optionally filtered by status"""
+    query = {'status': status} if status else {}
+    applications, next_cursor = await paginate(
+        collection, query, page, APPLICATION_LIST_PROJECTION, tie_field='_id'
+    )
+    
+    # Convert ObjectId to string
+    for app in applications:
+        app['_id'] = str(app['_id'])
+    return applications, next_cursor
+
+
+async def index_profile(profile: dict, delta: int):
+    """
+    Add (delta=1) or remove (delta=-1) a profile from the facet counts and
+    suggest index. Runs after the profile write has succeeded, so failures are
+    logged rather than raised; the next facet rebuild corrects the counts.
+    """
+    try:
+        await adjust_profile_facets(profile, delta)
+    except Exception as e:
+        logging.error(f"Failed to adjust profile facets for {profile.get('id')}: {str(e)}")
+    try:
+        update_suggest_index(profile, delta)
+    except Exception as e:
+        logging.error(f"Failed to update suggest index for {profile.get('id')}: {str(e)}")
+
+
+async def get_application(collection, app_id: str) -> dict:
+    """Get one application by its ObjectId, without the password hash"""
+    if not ObjectId.is_valid(app_id):
+        raise HTTPException(status_code=404, detail='Application not found')
+    application = await collection.find_one({'_id': ObjectId(app_id)}, {'password_hash': 0, 'password': 0})
+    if not application:
+        raise HTTPException(status_code=404, detail='Application not found')
+    application['_id'] = str(application['_id'])
+    return application
+
+
 @router.post("/login")
 async def admin_login(login: AdminLogin):
     """Admin login"""
@@ -32,23 +105,84 @@ async def admin_login(login: AdminLogin):
     return {'token': token, 'message': 'Login successful'}
 
 
-@router.get("/lawyer-applications")
-async def get_lawyer_applications(admin: dict = Depends(get_admin)):
-    """Get all lawyer applications"""
-    applications = await db.lawyer_applications.find({}).to_list(1000)
+async def _timed_count(name: str, collection, field: str, timings: dict) -> dict:
+    """Count documents by field with one $facet, recording how long it took"""
+    started = time.perf_counter()
+    result = await collection.aggregate([
+        {'$facet': {
+            'by': [{'$group': {'_id': f'${field}', 'count': {'$sum': 1}}}],
+            'total': [{'$count': 'count'}]
+        }}
+    ]).to_list(1)
+    timings[name] = round((time.perf_counter() - started) * 1000, 2)
     
-    # Convert ObjectId to string
-    for app in applications:
-        app['_id'] = str(app['_id'])
+    facets = result[0] if result else {'by': [], 'total': []}
+    counts = {str(row['_id']): row['count'] for row in facets['by']}
+    counts['total'] = facets['total'][0]['count'] if facets['total'] else 0
+    return counts
+
+
+async def _build_summary() -> dict:
+    """Run every dashboard count concurrently"""
+    timings = {}
+    started = time.perf_counter()
+    (lawyer_apps, lawfirm_apps, firm_lawyer_apps, firm_client_apps, firm_clients, users) = await asyncio.gather(
+        _timed_count('lawyer_applications', db.lawyer_applications, 'status', timings),
+        _timed_count('lawfirm_applications', db.lawfirm_applications, 'status', timings),
+        _timed_count('firm_lawyer_applications', db.firm_lawyer_applications, 'status', timings),
+        _timed_count('firm_client_applications', db.firm_client_applications, 'status', timings),
+        _timed_count('firm_clients', db.firm_clients, 'status', timings),
+        _timed_count('users', db.users, 'user_type', timings),
+    )
+    timings['total'] = round((time.perf_counter() - started) * 1000, 2)
     
-    # Calculate stats
-    stats = {
-        'pending': len([a for a in applications if a.get('status') == 'pending']),
-        'approved': len([a for a in applications if a.get('status') == 'approved']),
-        'rejected': len([a for a in applications if a.get('status') == 'rejected'])
+    return {
+        'lawyer_applications': lawyer_apps,
+        'lawfirm_applications': lawfirm_apps,
+        'firm_lawyer_applications': firm_lawyer_apps,
+        'firm_client_applications': firm_client_apps,
+        'firm_clients': firm_clients,
+        'pending_firm_clients': firm_clients.get('pending_approval', 0),
+        'users': users,
+        'generated_at': datetime.now(timezone.utc),
+        'debug': {'timings_ms': timings}
     }
-    
-    return {'applications': applications, 'stats': stats}
+
+
+@router.get("/summary")
+async def get_admin_summary(admin: dict = Depends(get_admin)):
+    """Get every admin dashboard count in one response, cached for a few seconds"""
+    global _summary_cache
+    async with _summary_lock:
+        if _summary_cache and _summary_cache[0] > time.monotonic():
+            return {**_summary_cache[1], 'cached': True}
+        summary = await _build_summary()
+        _summary_cache = (time.monotonic() + SUMMARY_CACHE_SECONDS, summary)
+    return {**summary, 'cached': False}
+
+
+@router.get("/lawyer-applications/stats")
+async def get_lawyer_application_stats(admin: dict = Depends(get_admin)):
+    """Get lawyer application counts by status"""
+    return await application_stats(db.lawyer_applications)
+
+
+@router.get("/lawyer-applications")
+async def get_lawyer_applications(
+    status: Optional[str] = None,
+    page: PageParams = Depends(page_params(1000)),
+    admin: dict = Depends(get_admin)
+):
+    """Get lawyer applications, newest first, without password hashes or photos"""
+    applications, next_cursor = await list_applications(db.lawyer_applications, status, page)
+    stats = await application_stats(db.lawyer_applications)
+    return {'applications': applications, 'stats': stats, 'next_cursor': next_cursor}
+
+
+@router.get("/lawyer-applications/{app_id}")
+async def get_lawyer_application(app_id: str, admin: dict = Depends(get_admin)):
+    """Get a single lawyer application, including its photo"""
+    return await get_application(db.lawyer_applications, app_id)
 
 
 @router.put("/lawyer-applications/{app_id}/approve")
@@ -77,7 +211,7 @@ async def approve_lawyer_application(app_id: str, admin: dict = Depends(get_admi
             'full_name': application.get('full_name') or application.get('name'),
             'user_type': 'lawyer',
             'phone': application['phone'],
-            'created_at': datetime.now(timezone.utc).isoformat(),
+            'created_at': datetime.now(timezone.utc),
             'is_approved': True,
             # Lawyer specific fields
             'photo': application.get('photo'),
@@ -87,16 +221,20 @@ async def approve_lawyer_application(app_id: str, admin: dict = Depends(get_admi
             'cases_won': application.get('cases_won', 0),
             'state': application.get('state'),
             'city': application.get('city'),
+            **location_fields(application.get('city'), application.get('state')),
             'court': application.get('court', ''),
             'education': application.get('education'),
             'languages': application.get('languages', []),
             'fee_range': application.get('fee_range', '₹5,000 - ₹15,000'),
+            **fee_bounds(application.get('fee_range', '₹5,000 - ₹15,000')),
             'bio': application.get('bio', 'Experienced lawyer'),
             'rating': 4.5,
             'is_verified': True
         }
         
         await db.users.insert_one(user_data)
+        invalidate_user_email(user_data['email'])
+        await index_profile(user_data, 1)
         
         return {'message': 'Application approved successfully'}
     except Exception as e:
@@ -129,23 +267,28 @@ async def reject_lawyer_application(app_id: str, admin: dict = Depends(get_admin
 
 
 # Law Firm Application endpoints
+@router.get("/lawfirm-applications/stats")
+async def get_lawfirm_application_stats(admin: dict = Depends(get_admin)):
+    """Get law firm application counts by status"""
+    return await application_stats(db.lawfirm_applications)
+
+
 @router.get("/lawfirm-applications")
-async def get_lawfirm_applications(admin: dict = Depends(get_admin)):
-    """Get all law firm applications"""
-    applications = await db.lawfirm_applications.find({}).to_list(1000)
-    
-    # Convert ObjectId to string
-    for app in applications:
-        app['_id'] = str(app['_id'])
-    
-    # Calculate stats
-    stats = {
-        'pending': len([a for a in applications if a.get('status') == 'pending']),
-        'approved': len([a for a in applications if a.get('status') == 'approved']),
-        'rejected': len([a for a in applications if a.get('status') == 'rejected'])
-    }
-    
-    return {'applications': applications, 'stats': stats}
+async def get_lawfirm_applications(
+    status: Optional[str] = None,
+    page: PageParams = Depends(page_params(1000)),
+    admin: dict = Depends(get_admin)
+):
+    """Get law firm applications, newest first, without password hashes"""
+    applications, next_cursor = await list_applications(db.lawfirm_applications, status, page)
+    stats = await application_stats(db.lawfirm_applications)
+    return {'applications': applications, 'stats': stats, 'next_cursor': next_cursor}
+
+
+@router.get("/lawfirm-applications/{app_id}")
+async def get_lawfirm_application(app_id: str, admin: dict = Depends(get_admin)):
+    """Get a single law firm application"""
+    return await get_application(db.lawfirm_applications, app_id)
 
 
 @router.put("/lawfirm-applications/{app_id}/approve")
@@ -184,6 +327,7 @@ async def approve_lawfirm_application(app_id: str, admin: dict = Depends(get_adm
         'city': application['city'],
         'state': application['state'],
         'pincode': application.get('pincode'),
+        **location_fields(application['city'], application['state'], application.get('pincode')),
         'practice_areas': application['practice_areas'],
         'total_lawyers': application['total_lawyers'],
         'total_staff': application.get('total_staff', 0),
@@ -193,6 +337,8 @@ async def approve_lawfirm_application(app_id: str, admin: dict = Depends(get_adm
     }
     
     await db.users.insert_one(user_data)
+    invalidate_user_email(user_data['email'])
+    await index_profile(user_data, 1)
     
     return {'message': 'Law firm application approved successfully'}
 
@@ -215,3 +361,166 @@ async def reject_lawfirm_application(app_id: str, admin: dict = Depends(get_admi
     )
     
     return {'message': 'Law firm application rejected'}
+
+
+@router.put("/profiles/{user_id}/status")
+async def update_profile_status(user_id: str, is_active: bool, admin: dict = Depends(get_admin)):
+    """Activate or deactivate a lawyer or law firm profile"""
+    profile = await db.users.find_one(
+        {'id': user_id, 'user_type': {'$in': ['lawyer', 'law_firm']}},
+        {'_id': 0, 'password': 0, 'password_hash': 0}
+    )
+    if not profile:
+        raise HTTPException(status_code=404, detail='Profile not found')
+    
+    # Only the request that actually flips the flag adjusts the facet counts
+    current = {'is_active': False} if is_active else {'is_active': {'$ne': False}}
+    result = await db.users.update_one({'id': user_id, **current}, {'$set': {'is_active': is_active}})
+    if result.modified_count:
+        invalidate_user(user_id)
+        await index_profile(profile, 1 if is_active else -1)
+    
+    return {'message': f'Profile {"activated" if is_active else "deactivated"} successfully'}
+
+
+@router.get("/chat/card-stats")
+async def get_chat_card_stats(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    admin: dict = Depends(get_admin)
+):
+    """Count stored chat cards by type and responses by parse outcome"""
+    match = {'cards': {'$exists': True}}
+    if since or until:
+        match['timestamp'] = {}
+        if since:
+            match['timestamp']['$gte'] = since
+        if until:
+            match['timestamp']['$lt'] = until
+    
+    pipeline = [
+        {'$match': match},
+        {'$facet': {
+            'by_status': [{'$group': {'_id': '$cards_status', 'count': {'$sum': 1}}}],
+            'by_type': [
+                {'$unwind': '$cards'},
+                {'$group': {'_id': '$cards.type', 'count': {'$sum': 1}}},
+                {'$sort': {'count': -1}}
+            ],
+            'cards_per_response': [
+                {'$group': {'_id': None, 'avg': {'$avg': {'$size': '$cards'}}, 'responses': {'$sum': 1}}}
+            ]
+        }}
+    ]
+    result = (await db.chat_history.aggregate(pipeline).to_list(1))[0]
+    per_response = result['cards_per_response'][0] if result['cards_per_response'] else {'avg': 0, 'responses': 0}
+    return {
+        'responses': per_response['responses'],
+        'avg_cards_per_response': round(per_response['avg'] or 0, 2),
+        'by_status': {row['_id']: row['count'] for row in result['by_status']},
+        'by_type': {row['_id']: row['count'] for row in result['by_type']}
+    }
+
+
+# Export endpoints
+EXPORT_BATCH_SIZE = int(os.environ.get('ADMIN_EXPORT_BATCH_SIZE', 500))
+
+# Never exported, even if asked for by name
+EXPORT_SECRET_FIELDS = {'password', 'password_hash'}
+
+# dataset -> (collection, default fields)
+EXPORT_DATASETS = {
+    'lawyer-applications': ('lawyer_applications', [
+        '_id', 'id', 'name', 'email', 'phone', 'bar_council_number', 'specialization', 'experience',
+        'state', 'city', 'court', 'languages', 'fee_range', 'status', 'created_at'
+    ]),
+    'lawfirm-applications': ('lawfirm_applications', [
+        '_id', 'id', 'firm_name', 'registration_number', 'contact_name', 'contact_email', 'contact_phone',
+        'city', 'state', 'practice_areas', 'total_lawyers', 'status', 'created_at'
+    ]),
+    'firm-lawyer-applications': ('firm_lawyer_applications', [
+        'id', 'full_name', 'email', 'phone', 'firm_id', 'firm_name', 'specialization',
+        'experience_years', 'status', 'created_at', 'updated_at'
+    ]),
+    'firm-client-applications': ('firm_client_applications', [
+        'id', 'full_name', 'email', 'phone', 'company_name', 'case_type', 'law_firm_id',
+        'law_firm_name', 'status', 'created_at', 'reviewed_at'
+    ]),
+    'users': ('users', [
+        'id', 'email', 'full_name', 'user_type', 'phone', 'firm_id', 'firm_name', 'specialization',
+        'city', 'state', 'is_active', 'created_at'
+    ]),
+}
+
+
+def _export_value(value):
+    """Convert a BSON value to something JSON and CSV can carry"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    return value
+
+
+async def _export_rows(collection, query: dict, fields: list, export_format: str):
+    """Stream documents as NDJSON or CSV, one batch of rows per chunk"""
+    cursor = collection.find(query, {field: 1 for field in fields}).sort('_id', 1).batch_size(EXPORT_BATCH_SIZE)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == 'csv':
+        writer.writerow(fields)
+    
+    rows = 0
+    async for doc in cursor:
+        if export_format == 'csv':
+            writer.writerow([
+                '; '.join(map(str, value)) if isinstance(value, list) else _export_value(value)
+                for value in (doc.get(field) for field in fields)
+            ])
+        else:
+            row = {field: doc[field] for field in fields if field in doc}
+            buffer.write(json.dumps(row, default=_export_value, ensure_ascii=False))
+            buffer.write('\n')
+        
+        rows += 1
+        if rows % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get("/export/{dataset}")
+async def export_dataset(
+    dataset: str,
+    format: str = Query('ndjson', pattern='^(ndjson|csv)$'),
+    fields: Optional[str] = Query(None, description='Comma-separated fields to include'),
+    updated_since: Optional[datetime] = Query(None, description='Only documents created or updated since'),
+    admin: dict = Depends(get_admin)
+):
+    """Stream every application or user as NDJSON or CSV with constant memory"""
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(status_code=404, detail='Unknown dataset')
+    collection_name, default_fields = EXPORT_DATASETS[dataset]
+    
+    selected = [f.strip() for f in fields.split(',') if f.strip()] if fields else default_fields
+    selected = [f for f in selected if f not in EXPORT_SECRET_FIELDS]
+    if not selected:
+        raise HTTPException(status_code=400, detail='No exportable fields selected')
+    
+    query = {}
+    if updated_since:
+        query = {'$or': [
+            {'updated_at': {'$gte': updated_since}},
+            {'created_at': {'$gte': updated_since}}
+        ]}
+    
+    media_type = 'text/csv' if format == 'csv' else 'application/x-ndjson'
+    filename = f"{dataset}.{'csv' if format == 'csv' else 'ndjson'}"
+    return StreamingResponse(
+        _export_rows(db[collection_name], query, selected, format),
+        media_type=media_type,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
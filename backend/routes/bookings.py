@@ -1,9 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from typing import List
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
 from models.booking import Booking, BookingCreate
 from services.database import db
+from services.pagination import PageParams, paginate, set_next_cursor
 from routes.auth import get_current_user
 
 router = APIRouter(prefix="/bookings", tags=["Bookings"])
@@ -28,7 +29,7 @@ async def create_guest_booking(booking_data: dict):
         'payment_status': booking_data.get('payment_status', 'paid'),
         'payment_method': booking_data.get('payment_method', 'card'),
         'card_last_four': booking_data.get('card_last_four', ''),
-        'created_at': datetime.utcnow().isoformat(),
+        'created_at': datetime.now(timezone.utc),
         'client_id': None  # Will be linked when user signs up
     }
     
@@ -47,24 +48,24 @@ async def create_booking(booking_data: BookingCreate, current_user: dict = Depen
     booking_obj = Booking(**booking_dict)
     
     doc = booking_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    
     await db.bookings.insert_one(doc)
     return booking_obj
 
 
 @router.get("", response_model=List[Booking])
-async def get_bookings(current_user: dict = Depends(get_current_user)):
-    """Get bookings for current user"""
+async def get_bookings(
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: dict = Depends(get_current_user)
+):
+    """Get bookings for current user, newest first"""
     if current_user['user_type'] == 'client':
-        bookings = await db.bookings.find({'client_id': current_user['id']}, {'_id': 0}).to_list(100)
+        query = {'client_id': current_user['id']}
     else:
-        bookings = await db.bookings.find({'lawyer_id': current_user['id']}, {'_id': 0}).to_list(100)
-    
-    for booking in bookings:
-        if isinstance(booking['created_at'], str):
-            booking['created_at'] = datetime.fromisoformat(booking['created_at'])
+        query = {'lawyer_id': current_user['id']}
     
+    bookings, next_cursor = await paginate(db.bookings, query, page, {'_id': 0})
+    set_next_cursor(response, next_cursor)
     return bookings
 
 
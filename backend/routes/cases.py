@@ -1,8 +1,8 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from typing import List
-from datetime import datetime
 from models.case import Case, CaseCreate
 from services.database import db
+from services.pagination import PageParams, paginate, set_next_cursor
 from routes.auth import get_current_user
 
 router = APIRouter(prefix="/cases", tags=["Cases"])
@@ -16,27 +16,20 @@ async def create_case(case_data: CaseCreate, current_user: dict = Depends(get_cu
     case_obj = Case(**case_dict)
     
     doc = case_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
-    
     await db.cases.insert_one(doc)
     return case_obj
 
 
 @router.get("", response_model=List[Case])
-async def get_cases(current_user: dict = Depends(get_current_user)):
-    """Get cases for current user"""
-    if current_user['user_type'] == 'client':
-        cases = await db.cases.find({'user_id': current_user['id']}, {'_id': 0}).to_list(100)
-    else:
-        cases = await db.cases.find({}, {'_id': 0}).to_list(100)
-    
-    for case in cases:
-        if isinstance(case['created_at'], str):
-            case['created_at'] = datetime.fromisoformat(case['created_at'])
-        if isinstance(case['updated_at'], str):
-            case['updated_at'] = datetime.fromisoformat(case['updated_at'])
-    
+async def get_cases(
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: dict = Depends(get_current_user)
+):
+    """Get cases for current user, newest first"""
+    query = {'user_id': current_user['id']} if current_user['user_type'] == 'client' else {}
+    cases, next_cursor = await paginate(db.cases, query, page, {'_id': 0})
+    set_next_cursor(response, next_cursor)
     return cases
 
 
@@ -47,9 +40,4 @@ async def get_case(case_id: str, current_user: dict = Depends(get_current_user))
     if not case:
         raise HTTPException(status_code=404, detail='Case not found')
     
-    if isinstance(case['created_at'], str):
-        case['created_at'] = datetime.fromisoformat(case['created_at'])
-    if isinstance(case['updated_at'], str):
-        case['updated_at'] = datetime.fromisoformat(case['updated_at'])
-    
     return case
@@ -1,58 +1,181 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+import json
+import logging
 import uuid
+from contextlib import aclosing
+from typing import Optional
 from datetime import datetime, timezone
 from models.chat import ChatMessage, ChatResponse
 from services.database import db
-from services.chat_service import send_chat_message, generate_guest_session_id
+from services.pagination import PageParams, paginate, set_next_cursor
+from services.llm_limiter import llm_slot
+from services.chat_service import send_chat_message, stream_chat_message, generate_guest_session_id, has_chat_client, DEFAULT_SYSTEM_PROMPT
+from services.response_cache import get_or_fetch_response
+from services.chat_context import build_context, schedule_summary_refresh, seed_guest_session, has_guest_seed, guest_context
+from services.chat_history_writer import record_chat_turn
+from services.chat_archive import ARCHIVE_COLLECTION
+from services.card_stream import CardStreamParser
+from services.chat_cards import parse_cards, with_cards
 from routes.auth import get_current_user
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
 
+async def save_chat_history(user_id: str, session_id: str, message: str, response: str, cards: list, cards_status: str):
+    """Persist one chat turn (batched in the background, see services.chat_history_writer)"""
+    chat_history = {
+        'id': str(uuid.uuid4()),
+        'user_id': user_id,
+        'session_id': session_id,
+        'message': message,
+        'response': response,
+        'cards': cards,
+        'cards_status': cards_status,
+        'timestamp': datetime.now(timezone.utc)
+    }
+    await record_chat_turn(chat_history)
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _chat_events(chat_msg: ChatMessage, session_id: str, user_id: str = None):
+    """Stream tokens and completed cards, then persist the full response"""
+    parser = CardStreamParser()
+    chunks = []
+    try:
+        message = await build_context(user_id, chat_msg.message) if user_id else guest_context(session_id, chat_msg.message)
+        async for chunk in stream_chat_message(
+            message=message,
+            session_id=session_id,
+            system_prompt=chat_msg.system_prompt,
+            stateless=bool(user_id)
+        ):
+            chunks.append(chunk)
+            yield _sse('token', {'text': chunk})
+            for card in parser.feed(chunk):
+                yield _sse('card', card)
+    except HTTPException as e:
+        yield _sse('error', {'status': e.status_code, 'detail': e.detail})
+        return
+    except Exception as e:
+        logging.error(f'Chat stream error: {str(e)}')
+        yield _sse('error', {'status': 500, 'detail': f'Chat service error: {str(e)}'})
+        return
+    
+    response = ''.join(chunks)
+    cards, cards_status = parse_cards(response)
+    if user_id:
+        await save_chat_history(user_id, session_id, chat_msg.message, response, cards, cards_status)
+        schedule_summary_refresh(user_id)
+    yield _sse('done', {'response': response, 'session_id': session_id, 'cards': cards})
+
+
+async def _holding_slot(session_id: str, events):
+    """Hold the session's LLM slot until the stream ends; yields None once it is acquired"""
+    async with llm_slot(session_id), aclosing(events):
+        yield None
+        async for event in events:
+            yield event
+
+
+async def _event_stream(session_id: str, events) -> StreamingResponse:
+    stream = _holding_slot(session_id, events)
+    # Admission happens here, so a 429 is a real response with Retry-After rather than an error event
+    await anext(stream)
+    return StreamingResponse(
+        stream,
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 @router.post("", response_model=ChatResponse)
 async def chat(chat_msg: ChatMessage, current_user: dict = Depends(get_current_user)):
     """Send a message to AI assistant (authenticated)"""
     session_id = current_user['id']
     
+    # Send the bounded context (summary + recent turns) rather than an ever-growing session
     response = await send_chat_message(
-        message=chat_msg.message,
+        message=await build_context(current_user['id'], chat_msg.message),
         session_id=session_id,
-        system_prompt=chat_msg.system_prompt
+        system_prompt=chat_msg.system_prompt,
+        stateless=True
     )
     
+    cards, cards_status = parse_cards(response)
+    
     # Save to chat history
-    chat_history = {
-        'id': str(uuid.uuid4()),
-        'user_id': current_user['id'],
-        'session_id': session_id,
-        'message': chat_msg.message,
-        'response': response,
-        'timestamp': datetime.now(timezone.utc).isoformat()
-    }
-    await db.chat_history.insert_one(chat_history)
+    await save_chat_history(current_user['id'], session_id, chat_msg.message, response, cards, cards_status)
+    schedule_summary_refresh(current_user['id'])
     
-    return {'response': response, 'session_id': session_id}
+    return {'response': response, 'session_id': session_id, 'cards': cards}
 
 
 @router.post("/guest", response_model=ChatResponse)
 async def guest_chat(chat_msg: ChatMessage):
     """Send a message to AI assistant (no authentication required)"""
+    prompt = chat_msg.system_prompt or DEFAULT_SYSTEM_PROMPT
     session_id = chat_msg.session_id if chat_msg.session_id else generate_guest_session_id()
+    # Clients pick a guest session id before the first message, so look for a conversation instead
+    is_first_turn = not has_chat_client(session_id, prompt) and not has_guest_seed(session_id)
+    message = chat_msg.message if is_first_turn else guest_context(session_id, chat_msg.message)
+    fetched = False
     
-    response = await send_chat_message(
-        message=chat_msg.message,
-        session_id=session_id,
-        system_prompt=chat_msg.system_prompt
-    )
+    async def fetch():
+        nonlocal fetched
+        fetched = True
+        return await send_chat_message(
+            message=message,
+            session_id=session_id,
+            system_prompt=chat_msg.system_prompt
+        )
     
-    return {'response': response, 'session_id': session_id}
+    if is_first_turn:
+        # First questions carry no conversation context, so identical ones share an answer
+        response = await get_or_fetch_response(chat_msg.message, prompt, fetch)
+        if not fetched:
+            # Cached or coalesced: this session's pooled client never saw the exchange
+            seed_guest_session(session_id, chat_msg.message, response)
+    else:
+        response = await fetch()
+    
+    cards, _ = parse_cards(response)
+    return {'response': response, 'session_id': session_id, 'cards': cards}
+
+
+@router.post("/stream")
+async def chat_stream(chat_msg: ChatMessage, current_user: dict = Depends(get_current_user)):
+    """Stream the AI assistant's answer as Server-Sent Events (authenticated)"""
+    session_id = current_user['id']
+    return await _event_stream(session_id, _chat_events(chat_msg, session_id, user_id=current_user['id']))
+
+
+@router.post("/guest/stream")
+async def guest_chat_stream(chat_msg: ChatMessage):
+    """Stream the AI assistant's answer as Server-Sent Events (no authentication required)"""
+    session_id = chat_msg.session_id if chat_msg.session_id else generate_guest_session_id()
+    return await _event_stream(session_id, _chat_events(chat_msg, session_id))
 
 
 @router.get("/history")
-async def get_chat_history(current_user: dict = Depends(get_current_user)):
-    """Get chat history for current user"""
-    history = await db.chat_history.find(
+async def get_chat_history(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    tier: str = Query('hot', pattern='^(hot|archive)$', description='archive holds turns past the retention window'),
+    current_user: dict = Depends(get_current_user)
+):
+    """Get chat history for current user, newest first"""
+    history, next_cursor = await paginate(
+        db.chat_history if tier == 'hot' else db[ARCHIVE_COLLECTION],
         {'user_id': current_user['id']},
-        {'_id': 0}
-    ).sort('timestamp', -1).limit(50).to_list(50)
-    return history
+        PageParams(limit=limit, cursor=cursor),
+        {'_id': 0},
+        sort_field='timestamp'
+    )
+    set_next_cursor(response, next_cursor)
+    return [with_cards(turn) for turn in history]
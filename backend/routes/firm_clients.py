@@ -1,16 +1,16 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Depends, Response, status
 from typing import List
 from models.firm_client import (
     FirmClientApplication, FirmClient, FirmClientLogin, ClientCaseUpdate
 )
 from services.database import db
-from passlib.context import CryptContext
-from datetime import datetime
+from services.pagination import PageParams, page_params, paginate, set_next_cursor
+from services.password_service import hash_password_async, verify_password_async
+from datetime import datetime, timezone
 import os
 from jose import jwt
 
 router = APIRouter(prefix="/firm-clients", tags=["Firm Clients"])
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # Submit client application to join a law firm
 @router.post("/applications")
@@ -30,7 +30,7 @@ async def submit_firm_client_application(application: FirmClientApplication):
         app_dict = application.model_dump()
         
         # Hash the password before storing
-        app_dict["password"] = pwd_context.hash(application.password)
+        app_dict["password"] = await hash_password_async(application.password)
         
         await collection.insert_one(app_dict)
         
@@ -73,11 +73,12 @@ async def get_firm_client_applications(law_firm_id: str, status: str = None):
 
 # Get ALL client applications (for admin)
 @router.get("/applications/all")
-async def get_all_client_applications():
+async def get_all_client_applications(response: Response, page: PageParams = Depends(page_params(1000))):
     """Get all client applications across all law firms (Admin only)"""
     try:
         collection = db.firm_client_applications
-        applications = await collection.find({}).to_list(length=1000)
+        applications, next_cursor = await paginate(collection, {}, page)
+        set_next_cursor(response, next_cursor)
         
         # Convert ObjectId to string if present
         for app in applications:
@@ -85,6 +86,8 @@ async def get_all_client_applications():
                 app["_id"] = str(app["_id"])
         
         return applications
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -120,7 +123,7 @@ async def update_client_application_status(
             {
                 "$set": {
                     "status": new_status,
-                    "reviewed_at": datetime.utcnow(),
+                    "reviewed_at": datetime.now(timezone.utc),
                     "reviewed_by": reviewer_email,
                     "rejection_reason": status_update.get("rejection_reason")
                 }
@@ -135,7 +138,7 @@ async def update_client_application_status(
             # If password doesn't exist (old applications), generate a temp password
             if not hashed_password:
                 temp_password = f"Client@{application['email'].split('@')[0][:4]}{application_id[:4]}"
-                hashed_password = pwd_context.hash(temp_password)
+                hashed_password = await hash_password_async(temp_password)
             
             client = FirmClient(
                 id=application_id,
@@ -190,7 +193,7 @@ async def register_paid_firm_client(client_data: dict):
             )
         
         # Hash password
-        hashed_password = pwd_context.hash(client_data.get("password"))
+        hashed_password = await hash_password_async(client_data.get("password"))
         
         # Create client ID
         import uuid
@@ -213,7 +216,7 @@ async def register_paid_firm_client(client_data: dict):
             "status": "pending_approval",  # Requires admin approval
             "payment_status": "paid",
             "payment_amount": client_data.get("payment_amount"),
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at": datetime.now(timezone.utc),
             "last_login": None
         }
         
@@ -286,7 +289,7 @@ async def approve_firm_client(client_id: str, approval_data: dict):
             {
                 "$set": {
                     "status": new_status,
-                    "approved_at": datetime.utcnow().isoformat() if action == "approve" else None,
+                    "approved_at": datetime.now(timezone.utc) if action == "approve" else None,
                     "approved_by": approval_data.get("approved_by"),
                     "rejection_reason": approval_data.get("rejection_reason") if action == "reject" else None
                 }
@@ -324,7 +327,7 @@ async def firm_client_login(credentials: FirmClientLogin):
             if application:
                 # Check if password exists in application (from old flow)
                 if "password" in application and application.get("password"):
-                    if not pwd_context.verify(credentials.password, application["password"]):
+                    if not await verify_password_async(credentials.password, application["password"]):
                         raise HTTPException(
                             status_code=status.HTTP_401_UNAUTHORIZED,
                             detail="Invalid credentials"
@@ -355,7 +358,7 @@ async def firm_client_login(credentials: FirmClientLogin):
                 )
             
             # Verify password
-            if not pwd_context.verify(credentials.password, client["password"]):
+            if not await verify_password_async(credentials.password, client["password"]):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid credentials"
@@ -365,7 +368,7 @@ async def firm_client_login(credentials: FirmClientLogin):
         if client.get("_id"):
             await collection.update_one(
                 {"email": credentials.email},
-                {"$set": {"last_login": datetime.utcnow()}}
+                {"$set": {"last_login": datetime.now(timezone.utc)}}
             )
         
         # Generate token
@@ -442,11 +445,12 @@ async def get_client_details(client_id: str):
 
 # Get all clients for a law firm
 @router.get("/firm/{law_firm_id}/list")
-async def get_firm_clients(law_firm_id: str):
+async def get_firm_clients(law_firm_id: str, response: Response, page: PageParams = Depends()):
     """Get all clients for a law firm"""
     try:
         collection = db.firm_clients
-        clients = await collection.find({"law_firm_id": law_firm_id}).to_list(length=100)
+        clients, next_cursor = await paginate(collection, {"law_firm_id": law_firm_id}, page, {"password": 0})
+        set_next_cursor(response, next_cursor)
         
         for client in clients:
             client.pop("password", None)
@@ -454,6 +458,8 @@ async def get_firm_clients(law_firm_id: str):
                 client["_id"] = str(client["_id"])
         
         return clients
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from typing import List, Optional
 from datetime import datetime, timezone
 from services.database import db
-from services.auth import hash_password, verify_password, create_token
+from services.pagination import PageParams, page_params, paginate, set_next_cursor
+from services.auth import create_token
+from services.password_service import hash_password_async, verify_password_async
+from services.user_cache import invalidate_user, invalidate_user_email
 from models.firm_lawyer import FirmLawyerCreate, FirmLawyerLogin, TaskCreate
 from pydantic import BaseModel, EmailStr
+from pymongo.errors import DuplicateKeyError
 import uuid
 
 router = APIRouter(prefix="/firm-lawyers", tags=["Firm Lawyers"])
@@ -38,7 +42,7 @@ async def firm_lawyer_login(login_data: FirmLawyerLogin):
         raise HTTPException(status_code=401, detail='Invalid credentials')
     
     password_field = user.get('password_hash') or user.get('password')
-    if not password_field or not verify_password(login_data.password, password_field):
+    if not password_field or not await verify_password_async(login_data.password, password_field):
         raise HTTPException(status_code=401, detail='Invalid credentials')
     
     if not user.get('is_active', True):
@@ -71,7 +75,7 @@ async def submit_firm_lawyer_application(application: FirmLawyerApplicationCreat
         'full_name': application.full_name,
         'email': application.email,
         'phone': application.phone,
-        'password_hash': hash_password(application.password),
+        'password_hash': await hash_password_async(application.password),
         'firm_id': application.firm_id,
         'firm_name': application.firm_name,
         'specialization': application.specialization,
@@ -81,20 +85,26 @@ async def submit_firm_lawyer_application(application: FirmLawyerApplicationCreat
         'languages': application.languages,
         'bio': application.bio,
         'status': 'pending',
-        'created_at': datetime.now(timezone.utc).isoformat()
+        'created_at': datetime.now(timezone.utc)
     }
     
-    await db.firm_lawyer_applications.insert_one(app_data)
+    try:
+        await db.firm_lawyer_applications.insert_one(app_data)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail='An application with this email already exists')
     return {'message': 'Application submitted successfully', 'id': app_id}
 
 
 @router.get("/applications")
-async def get_firm_lawyer_applications():
+async def get_firm_lawyer_applications(response: Response, page: PageParams = Depends()):
     """Get all firm lawyer applications (for admin)"""
-    applications = await db.firm_lawyer_applications.find(
+    applications, next_cursor = await paginate(
+        db.firm_lawyer_applications,
         {},
+        page,
         {'_id': 0, 'password_hash': 0}
-    ).sort('created_at', -1).to_list(100)
+    )
+    set_next_cursor(response, next_cursor)
     return applications
 
 
@@ -111,7 +121,7 @@ async def update_firm_lawyer_application_status(app_id: str, status: str):
     # Update application status
     await db.firm_lawyer_applications.update_one(
         {'id': app_id},
-        {'$set': {'status': status, 'updated_at': datetime.now(timezone.utc).isoformat()}}
+        {'$set': {'status': status, 'updated_at': datetime.now(timezone.utc)}}
     )
     
     # If approved, create the user account
@@ -133,12 +143,13 @@ async def update_firm_lawyer_application_status(app_id: str, status: str):
             'bio': application.get('bio'),
             'user_type': 'firm_lawyer',
             'is_active': True,
-            'created_at': datetime.now(timezone.utc).isoformat(),
+            'created_at': datetime.now(timezone.utc),
             'tasks_completed': 0,
             'cases_assigned': 0,
             'rating': 4.5
         }
         await db.users.insert_one(lawyer_doc)
+        invalidate_user_email(application['email'])
         return {'message': 'Application approved and lawyer account created', 'lawyer_id': lawyer_id}
     
     return {'message': f'Application {status}'}
@@ -157,7 +168,7 @@ async def create_firm_lawyer(lawyer_data: FirmLawyerCreate, firm_id: str, firm_n
         'id': lawyer_id,
         'full_name': lawyer_data.full_name,
         'email': lawyer_data.email,
-        'password_hash': hash_password(lawyer_data.password),
+        'password_hash': await hash_password_async(lawyer_data.password),
         'phone': lawyer_data.phone,
         'specialization': lawyer_data.specialization,
         'experience_years': lawyer_data.experience_years,
@@ -167,13 +178,16 @@ async def create_firm_lawyer(lawyer_data: FirmLawyerCreate, firm_id: str, firm_n
         'firm_name': firm_name,
         'user_type': 'firm_lawyer',
         'is_active': True,
-        'created_at': datetime.now(timezone.utc).isoformat(),
+        'created_at': datetime.now(timezone.utc),
         'tasks_completed': 0,
         'cases_assigned': 0,
         'rating': 4.5
     }
     
-    await db.users.insert_one(lawyer_doc)
+    try:
+        await db.users.insert_one(lawyer_doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail='A user with this email already exists')
     
     # Don't return password
     del lawyer_doc['password_hash']
@@ -209,6 +223,7 @@ async def update_lawyer_status(lawyer_id: str, is_active: bool):
         {'id': lawyer_id, 'user_type': 'firm_lawyer'},
         {'$set': {'is_active': is_active}}
     )
+    invalidate_user(lawyer_id)
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail='Lawyer not found')
     return {'message': f'Lawyer {"activated" if is_active else "deactivated"} successfully'}
@@ -218,6 +233,7 @@ async def update_lawyer_status(lawyer_id: str, is_active: bool):
 async def delete_firm_lawyer(lawyer_id: str):
     """Delete a firm lawyer"""
     result = await db.users.delete_one({'id': lawyer_id, 'user_type': 'firm_lawyer'})
+    invalidate_user(lawyer_id)
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail='Lawyer not found')
     return {'message': 'Lawyer deleted successfully'}
@@ -239,7 +255,7 @@ async def create_task(task_data: TaskCreate, assigned_by: str):
         'due_date': task_data.due_date,
         'case_id': task_data.case_id,
         'case_name': task_data.case_name,
-        'created_at': datetime.now(timezone.utc).isoformat(),
+        'created_at': datetime.now(timezone.utc),
         'completed_at': None
     }
     
@@ -248,30 +264,31 @@ async def create_task(task_data: TaskCreate, assigned_by: str):
 
 
 @router.get("/tasks/by-lawyer/{lawyer_id}")
-async def get_lawyer_tasks(lawyer_id: str):
+async def get_lawyer_tasks(lawyer_id: str, response: Response, page: PageParams = Depends()):
     """Get all tasks for a firm lawyer"""
-    tasks = await db.firm_tasks.find(
-        {'assigned_to': lawyer_id},
-        {'_id': 0}
-    ).sort('created_at', -1).to_list(100)
+    tasks, next_cursor = await paginate(db.firm_tasks, {'assigned_to': lawyer_id}, page, {'_id': 0})
+    set_next_cursor(response, next_cursor)
     return tasks
 
 
 @router.get("/tasks/by-firm/{firm_id}")
-async def get_firm_tasks(firm_id: str):
+async def get_firm_tasks(firm_id: str, response: Response, page: PageParams = Depends(page_params(500))):
     """Get all tasks for a firm (all lawyers)"""
     # First get all lawyers in the firm
     lawyers = await db.users.find(
         {'firm_id': firm_id, 'user_type': 'firm_lawyer'},
         {'id': 1, '_id': 0}
-    ).to_list(100)
+    ).to_list(None)
     
     lawyer_ids = [lawyer['id'] for lawyer in lawyers]
     
-    tasks = await db.firm_tasks.find(
+    tasks, next_cursor = await paginate(
+        db.firm_tasks,
         {'assigned_to': {'$in': lawyer_ids}},
+        page,
         {'_id': 0}
-    ).sort('created_at', -1).to_list(500)
+    )
+    set_next_cursor(response, next_cursor)
     return tasks
 
 
@@ -280,7 +297,7 @@ async def update_task_status(task_id: str, status: str):
     """Update task status"""
     update_data = {'status': status}
     if status == 'completed':
-        update_data['completed_at'] = datetime.now(timezone.utc).isoformat()
+        update_data['completed_at'] = datetime.now(timezone.utc)
     
     result = await db.firm_tasks.update_one(
         {'id': task_id},
@@ -293,40 +310,62 @@ async def update_task_status(task_id: str, status: str):
 
 # Reporting endpoints
 @router.get("/reports/firm/{firm_id}")
-async def get_firm_report(firm_id: str):
-    """Get comprehensive report for a firm manager"""
+async def get_firm_report(
+    firm_id: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+):
+    """Get comprehensive report for a firm manager, optionally limited to tasks created in a date range"""
     # Get all lawyers
     lawyers = await db.users.find(
         {'firm_id': firm_id, 'user_type': 'firm_lawyer'},
         {'_id': 0, 'password_hash': 0, 'password': 0}
-    ).to_list(100)
+    ).to_list(None)
     
     lawyer_ids = [lawyer['id'] for lawyer in lawyers]
     
-    # Get all tasks
-    tasks = await db.firm_tasks.find(
-        {'assigned_to': {'$in': lawyer_ids}},
-        {'_id': 0}
-    ).to_list(500)
+    match = {'assigned_to': {'$in': lawyer_ids}}
+    if start_date or end_date:
+        match['created_at'] = {}
+        if start_date:
+            match['created_at']['$gte'] = start_date
+        if end_date:
+            match['created_at']['$lte'] = end_date
+    
+    # Count tasks by status, overall and per lawyer, in one pass on the server
+    is_completed = {'$cond': [{'$eq': ['$status', 'completed']}, 1, 0]}
+    pipeline = [
+        {'$match': match},
+        {'$facet': {
+            'by_status': [
+                {'$group': {'_id': '$status', 'count': {'$sum': 1}}}
+            ],
+            'by_lawyer': [
+                {'$group': {'_id': '$assigned_to', 'total': {'$sum': 1}, 'completed': {'$sum': is_completed}}}
+            ]
+        }}
+    ]
+    result = await db.firm_tasks.aggregate(pipeline).to_list(1)
+    facets = result[0] if result else {'by_status': [], 'by_lawyer': []}
     
-    # Calculate stats
-    total_tasks = len(tasks)
-    completed_tasks = len([t for t in tasks if t.get('status') == 'completed'])
-    pending_tasks = len([t for t in tasks if t.get('status') == 'pending'])
-    in_progress_tasks = len([t for t in tasks if t.get('status') == 'in_progress'])
+    status_counts = {row['_id']: row['count'] for row in facets['by_status']}
+    total_tasks = sum(status_counts.values())
+    completed_tasks = status_counts.get('completed', 0)
+    pending_tasks = status_counts.get('pending', 0)
+    in_progress_tasks = status_counts.get('in_progress', 0)
     
     # Lawyer performance
+    task_counts = {row['_id']: row for row in facets['by_lawyer']}
     lawyer_stats = []
     for lawyer in lawyers:
-        lawyer_tasks = [t for t in tasks if t.get('assigned_to') == lawyer['id']]
-        lawyer_completed = len([t for t in lawyer_tasks if t.get('status') == 'completed'])
+        counts = task_counts.get(lawyer['id'], {'total': 0, 'completed': 0})
         lawyer_stats.append({
             'id': lawyer['id'],
             'name': lawyer['full_name'],
             'specialization': lawyer.get('specialization', 'General'),
-            'total_tasks': len(lawyer_tasks),
-            'completed_tasks': lawyer_completed,
-            'completion_rate': round((lawyer_completed / len(lawyer_tasks) * 100) if lawyer_tasks else 0, 1),
+            'total_tasks': counts['total'],
+            'completed_tasks': counts['completed'],
+            'completion_rate': round((counts['completed'] / counts['total'] * 100) if counts['total'] else 0, 1),
             'rating': lawyer.get('rating', 4.5)
         })
     
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from pymongo.errors import DuplicateKeyError
 from typing import List
-from datetime import datetime
+from datetime import datetime, timezone
 from services.database import db
-from services.auth import hash_password
+from services.pagination import PageParams, paginate, set_next_cursor
+from services.password_service import hash_password_async
+from services.profile_facets import get_profile_facets
+from services.geo import DEFAULT_RADIUS_KM, MAX_RADIUS_KM, near_origin, search_near
 
 from pydantic import BaseModel, EmailStr
 from typing import Optional
@@ -34,15 +38,47 @@ class LawFirmApplicationCreate(BaseModel):
 
 
 @router.get("")
-async def get_lawfirms():
-    """Get all approved law firms"""
-    lawfirms = await db.users.find(
-        {'user_type': 'law_firm'},
+async def get_lawfirms(response: Response, page: PageParams = Depends()):
+    """Get all approved, active law firms, newest first"""
+    lawfirms, next_cursor = await paginate(
+        db.users,
+        {'user_type': 'law_firm', 'is_active': {'$ne': False}},
+        page,
         {'_id': 0, 'password': 0, 'password_hash': 0}
-    ).to_list(100)
+    )
+    set_next_cursor(response, next_cursor)
     return lawfirms
 
 
+@router.get("/near")
+async def get_lawfirms_near(
+    near: Optional[str] = Query(None, description='Pincode or city (optionally "city, state")'),
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    practice_area: Optional[str] = None,
+    radius_km: float = Query(DEFAULT_RADIUS_KM, gt=0, le=MAX_RADIUS_KM),
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Get law firms within radius_km of a place or coordinates, nearest first, with distance_km"""
+    if not near and lat is None and lng is None:
+        raise HTTPException(status_code=400, detail='Give near, or lat and lng')
+    query = {'user_type': 'law_firm', 'is_active': {'$ne': False}}
+    if practice_area:
+        query['practice_areas'] = practice_area
+    lawfirms, total = await search_near(
+        query, near_origin(near, lat, lng), radius_km, page, limit,
+        {'_id': 0, 'password': 0, 'password_hash': 0}
+    )
+    return {'lawfirms': lawfirms, 'total': total, 'page': page, 'limit': limit}
+
+
+@router.get("/facets")
+async def get_lawfirm_facets():
+    """Get law firm counts by practice area, city and state"""
+    return await get_profile_facets('law_firm')
+
+
 @router.post("/applications")
 async def submit_lawfirm_application(application: LawFirmApplicationCreate):
     """Submit a law firm application"""
@@ -66,7 +102,7 @@ async def submit_lawfirm_application(application: LawFirmApplicationCreate):
         'contact_email': application.contact_email,
         'contact_phone': application.contact_phone,
         'contact_designation': application.contact_designation,
-        'password_hash': hash_password(application.password),
+        'password_hash': await hash_password_async(application.password),
         'address': application.address,
         'city': application.city,
         'state': application.state,
@@ -77,8 +113,11 @@ async def submit_lawfirm_application(application: LawFirmApplicationCreate):
         'description': application.description,
         'achievements': application.achievements,
         'status': 'pending',
-        'created_at': datetime.utcnow()
+        'created_at': datetime.now(timezone.utc)
     }
     
-    await db.lawfirm_applications.insert_one(app_data)
+    try:
+        await db.lawfirm_applications.insert_one(app_data)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail='An application with this email already exists')
     return {'message': 'Application submitted successfully', 'id': app_data['id']}
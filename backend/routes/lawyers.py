@@ -1,29 +1,81 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from pymongo.errors import DuplicateKeyError
+from typing import List, Optional
 from models.user import User
 from models.lawyer_application import LawyerApplication, LawyerApplicationCreate
 from services.database import db
-from services.auth import hash_password
+from services.pagination import PageParams, paginate, set_next_cursor
+from services.password_service import hash_password_async
+from services.lawyer_search import SORT_KEYS, DEFAULT_SORT, SEARCH_PROJECTION, build_search_query, search_lawyers
+from services.geo import DEFAULT_RADIUS_KM, MAX_RADIUS_KM, near_origin, search_near
+from services.profile_facets import get_profile_facets
 
 router = APIRouter(prefix="/lawyers", tags=["Lawyers"])
 
 
 @router.get("", response_model=List[User])
-async def get_lawyers():
-    """Get all lawyers"""
-    lawyers = await db.users.find(
-        {'user_type': 'lawyer'}, 
+async def get_lawyers(response: Response, page: PageParams = Depends()):
+    """Get all active lawyers, newest first"""
+    lawyers, next_cursor = await paginate(
+        db.users,
+        {'user_type': 'lawyer', 'is_active': {'$ne': False}},
+        page,
         {'_id': 0, 'password': 0}
-    ).to_list(100)
-    
-    for lawyer in lawyers:
-        if isinstance(lawyer.get('created_at'), str):
-            lawyer['created_at'] = datetime.fromisoformat(lawyer['created_at'])
-    
+    )
+    set_next_cursor(response, next_cursor)
     return lawyers
 
 
+@router.get("/search")
+async def search_lawyer_profiles(
+    specialization: Optional[str] = None,
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+    court: Optional[str] = None,
+    languages: Optional[List[str]] = Query(None, description='Lawyer must speak all of these'),
+    min_experience: Optional[int] = Query(None, ge=0),
+    max_experience: Optional[int] = Query(None, ge=0),
+    fee_min: Optional[int] = Query(None, ge=0, description='Rupees; matches fee ranges overlapping [fee_min, fee_max]'),
+    fee_max: Optional[int] = Query(None, ge=0),
+    sort: str = Query(DEFAULT_SORT, pattern=f"^({'|'.join(SORT_KEYS)})$"),
+    near: Optional[str] = Query(None, description='Pincode or city (optionally "city, state"); results are sorted by distance'),
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    radius_km: float = Query(DEFAULT_RADIUS_KM, gt=0, le=MAX_RADIUS_KM),
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """
+    Search lawyers by practice, location, language, experience and fee; returns a page and the total count.
+
+    With near (or lat and lng) only lawyers within radius_km are returned, nearest first, with distance_km.
+    """
+    query = build_search_query(
+        specialization=specialization,
+        city=city,
+        state=state,
+        court=court,
+        languages=languages,
+        min_experience=min_experience,
+        max_experience=max_experience,
+        fee_min=fee_min,
+        fee_max=fee_max
+    )
+    if near or lat is not None or lng is not None:
+        origin = near_origin(near, lat, lng)
+        lawyers, total = await search_near(query, origin, radius_km, page, limit, SEARCH_PROJECTION)
+        sort = 'distance'
+    else:
+        lawyers, total = await search_lawyers(query, sort, page, limit)
+    return {'lawyers': lawyers, 'total': total, 'page': page, 'limit': limit, 'sort': sort}
+
+
+@router.get("/facets")
+async def get_lawyer_facets():
+    """Get lawyer counts by specialization, city, state, court and language"""
+    return await get_profile_facets('lawyer')
+
+
 @router.post("/applications")
 async def submit_lawyer_application(application: LawyerApplicationCreate):
     """Submit a lawyer application"""
@@ -41,7 +93,7 @@ async def submit_lawyer_application(application: LawyerApplicationCreate):
         name=application.name,
         email=application.email,
         phone=application.phone,
-        password_hash=hash_password(application.password),
+        password_hash=await hash_password_async(application.password),
         photo=application.photo,
         bar_council_number=application.bar_council_number,
         specialization=application.specialization,
@@ -56,5 +108,8 @@ async def submit_lawyer_application(application: LawyerApplicationCreate):
         bio=application.bio
     )
     
-    await db.lawyer_applications.insert_one(app_data.model_dump())
+    try:
+        await db.lawyer_applications.insert_one(app_data.model_dump())
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail='An application with this email already exists')
     return {'message': 'Application submitted successfully', 'id': app_data.id}
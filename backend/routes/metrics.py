@@ -0,0 +1,33 @@
+from fastapi import APIRouter
+from services.password_service import get_password_pool_stats
+from services.user_cache import get_user_cache_stats
+from services.db_metrics import get_mongo_stats
+from services.chat_service import get_chat_client_stats, get_llm_call_stats
+from services.response_cache import get_response_cache_stats
+from services.llm_limiter import get_llm_limiter_stats
+from services.chat_context import get_chat_context_stats
+from services.chat_history_writer import get_chat_history_writer_stats
+from services.chat_archive import get_chat_archive_stats
+from services.suggest_index import get_suggest_stats
+from services.lawyer_search import get_lawyer_search_stats
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("")
+async def get_metrics():
+    """Get runtime metrics for in-process pools and caches"""
+    return {
+        'password_pool': get_password_pool_stats(),
+        'user_cache': get_user_cache_stats(),
+        'mongo': get_mongo_stats(),
+        'llm_clients': get_chat_client_stats(),
+        'llm_calls': get_llm_call_stats(),
+        'response_cache': get_response_cache_stats(),
+        'llm_limiter': get_llm_limiter_stats(),
+        'chat_context': get_chat_context_stats(),
+        'chat_history_writer': get_chat_history_writer_stats(),
+        'chat_archive': get_chat_archive_stats(),
+        'suggest': get_suggest_stats(),
+        'lawyer_search': get_lawyer_search_stats()
+    }
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Query
+from typing import Optional
+from services.profile_search import SEARCHABLE_USER_TYPES, search_profiles
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("/profiles")
+async def search_profile_text(
+    q: str = Query(..., min_length=2, max_length=200),
+    user_type: Optional[str] = Query(None, pattern=f"^({'|'.join(SEARCHABLE_USER_TYPES)})$"),
+    limit: int = Query(20, ge=1, le=50)
+):
+    """Free-text search over lawyer, firm lawyer and law firm profiles, best matches first"""
+    results = await search_profiles(q, user_type, limit)
+    return {'results': results, 'count': len(results)}
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Query
+from typing import Optional
+from services.suggest_index import SUGGEST_MAX_RESULTS, SUGGEST_TYPES, suggest
+
+router = APIRouter(prefix="/suggest", tags=["Search"])
+
+
+@router.get("")
+async def get_suggestions(
+    q: str = Query(..., min_length=1, max_length=100),
+    type: Optional[str] = Query(None, pattern=f"^({'|'.join(SUGGEST_TYPES)})$"),
+    limit: int = Query(8, ge=1, le=SUGGEST_MAX_RESULTS)
+):
+    """Typeahead suggestions: lawyer and firm names, cities and specializations starting with q"""
+    return {'suggestions': suggest(q, limit, type)}
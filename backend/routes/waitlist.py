@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException
+from pymongo.errors import DuplicateKeyError
 from models.waitlist import Waitlist, WaitlistCreate
 from services.database import db
 
@@ -15,7 +16,8 @@ async def join_waitlist(waitlist_data: WaitlistCreate):
     waitlist_obj = Waitlist(**waitlist_data.model_dump())
     
     doc = waitlist_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    
-    await db.waitlist.insert_one(doc)
+    try:
+        await db.waitlist.insert_one(doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail='Email already registered')
     return waitlist_obj
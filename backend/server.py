@@ -24,9 +24,19 @@ from routes import (
     waitlist_router,
     admin_router,
     firm_lawyers_router,
-    firm_clients_router
+    firm_clients_router,
+    metrics_router,
+    search_router,
+    suggest_router
 )
 from services.database import close_db
+from services.indexes import ensure_indexes
+from services.pagination import NEXT_CURSOR_HEADER
+from services.password_service import shutdown_password_pool
+from services.chat_service import close_chat_clients
+from services.chat_history_writer import start_chat_history_writer, drain_chat_history_writer
+from services.chat_archive import start_chat_archiver, stop_chat_archiver
+from services.suggest_index import start_suggest_index, stop_suggest_index
 
 # Create the main app
 app = FastAPI(title="Lxwyer Up API")
@@ -58,6 +68,9 @@ api_router.include_router(waitlist_router)
 api_router.include_router(admin_router)
 api_router.include_router(firm_lawyers_router)
 api_router.include_router(firm_clients_router)
+api_router.include_router(metrics_router)
+api_router.include_router(search_router)
+api_router.include_router(suggest_router)
 
 # Legacy endpoint for lawyer applications (for backward compatibility)
 from routes.lawyers import submit_lawyer_application
@@ -81,6 +94,7 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Configure logging
@@ -91,6 +105,23 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@app.on_event("startup")
+async def startup_db_client():
+    try:
+        await ensure_indexes()
+    except Exception as e:
+        logger.error(f'Index bootstrap failed: {str(e)}')
+    start_chat_history_writer()
+    start_chat_archiver()
+    start_suggest_index()
+
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await stop_chat_archiver()
+    await stop_suggest_index()
+    # Write buffered chat turns before the client goes away
+    await drain_chat_history_writer()
     await close_db()
+    shutdown_password_pool()
+    await close_chat_clients()
@@ -1,8 +1,10 @@
 # Services Package
 from .auth import hash_password, verify_password, create_token, decode_token
 from .database import get_db, db
+from .password_service import hash_password_async, verify_password_async
 
 __all__ = [
     'hash_password', 'verify_password', 'create_token', 'decode_token',
-    'get_db', 'db'
+    'get_db', 'db',
+    'hash_password_async', 'verify_password_async'
 ]
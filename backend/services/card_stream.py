@@ -0,0 +1,79 @@
+import json
+import logging
+
+
+class CardStreamParser:
+    """
+    Incremental parser for the {"cards": [...]} responses in DEFAULT_SYSTEM_PROMPT.
+
+    Feed it text as it streams in; each call returns the cards whose JSON
+    object closed within that chunk. Text outside the top-level object
+    (e.g. a ```json fence) is ignored.
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self._pos = 0
+        # Open containers, e.g. ['{', '['] while inside the cards array
+        self._stack = []
+        self._in_string = False
+        self._escaped = False
+        self._string_start = None
+        self._last_key = None
+        self._in_cards = False
+        self._card_start = None
+
+    def feed(self, text: str) -> list:
+        """Consume a chunk and return any cards completed by it"""
+        self.buffer += text
+        cards = []
+        while self._pos < len(self.buffer):
+            char = self.buffer[self._pos]
+            if self._in_string:
+                self._scan_string(char)
+            elif char == '"':
+                self._in_string = True
+                self._string_start = self._pos
+            elif char in '{[':
+                self._open(char)
+            elif char in '}]':
+                card = self._close(char)
+                if card is not None:
+                    cards.append(card)
+            self._pos += 1
+        return cards
+
+    def _scan_string(self, char: str):
+        if self._escaped:
+            self._escaped = False
+        elif char == '\\':
+            self._escaped = True
+        elif char == '"':
+            self._in_string = False
+            if self._stack == ['{']:
+                # A string directly inside the top-level object; remember it as the latest key
+                self._last_key = self.buffer[self._string_start + 1:self._pos]
+
+    def _open(self, char: str):
+        if char == '[' and self._stack == ['{'] and self._last_key == 'cards':
+            self._in_cards = True
+        elif char == '{' and self._in_cards and self._stack == ['{', '[']:
+            self._card_start = self._pos
+        self._stack.append(char)
+
+    def _close(self, char: str):
+        if not self._stack:
+            return None
+        self._stack.pop()
+        if char == ']' and self._in_cards and self._stack == ['{']:
+            self._in_cards = False
+        if char == '}' and self._card_start is not None and self._stack == ['{', '[']:
+            raw = self.buffer[self._card_start:self._pos + 1]
+            self._card_start = None
+            try:
+                card = json.loads(raw)
+            except ValueError:
+                logging.warning('Skipping malformed streamed card')
+                return None
+            return card if isinstance(card, dict) else None
+        return None
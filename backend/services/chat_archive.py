@@ -0,0 +1,151 @@
+"""
+Retention for chat_history: turns older than CHAT_HISTORY_RETENTION_DAYS move
+to chat_history_archive in batches, keeping the hot collection and its
+indexes small.
+
+Runs periodically in the app (started from server.py), and as a CLI:
+
+    python -m services.chat_archive [--dry-run] [--days 180] [--batch-size 1000]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from pymongo.errors import BulkWriteError
+
+from services.database import db
+
+# Retention configuration from environment
+CHAT_HISTORY_RETENTION_DAYS = float(os.environ.get('CHAT_HISTORY_RETENTION_DAYS', 180))  # 0 disables archiving
+CHAT_ARCHIVE_BATCH_SIZE = int(os.environ.get('CHAT_ARCHIVE_BATCH_SIZE', 1000))
+CHAT_ARCHIVE_INTERVAL_SECONDS = float(os.environ.get('CHAT_ARCHIVE_INTERVAL_SECONDS', 6 * 3600))
+# Pause between batches so a large backlog doesn't monopolise the primary
+CHAT_ARCHIVE_PAUSE_MS = float(os.environ.get('CHAT_ARCHIVE_PAUSE_MS', 50))
+
+ARCHIVE_COLLECTION = 'chat_history_archive'
+DUPLICATE_KEY = 11000
+
+_archiver: Optional[asyncio.Task] = None
+
+_stats = {
+    'runs': 0,
+    'moved': 0,
+    'batches': 0,
+    'failures': 0,
+    'last_run_at': None,
+    'last_cutoff': None,
+}
+
+
+async def archive_chat_history(database=None, retention_days: float = None, batch_size: int = None,
+                               dry_run: bool = False) -> dict:
+    """Move turns older than the retention window to the archive collection"""
+    database = database if database is not None else db
+    retention_days = CHAT_HISTORY_RETENTION_DAYS if retention_days is None else retention_days
+    if retention_days <= 0:
+        raise ValueError('Chat history retention is disabled (CHAT_HISTORY_RETENTION_DAYS <= 0)')
+    batch_size = batch_size or CHAT_ARCHIVE_BATCH_SIZE
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    query = {'timestamp': {'$lt': cutoff}}
+
+    if dry_run:
+        return {'cutoff': cutoff, 'would_move': await database.chat_history.count_documents(query), 'moved': 0}
+
+    moved = batches = 0
+    while True:
+        batch = await database.chat_history.find(query).sort('timestamp', 1).limit(batch_size).to_list(batch_size)
+        if not batch:
+            break
+
+        archived_at = datetime.now(timezone.utc)
+        try:
+            # _id is kept, so a batch interrupted before its delete is skipped on the next run
+            await database[ARCHIVE_COLLECTION].insert_many(
+                [{**doc, 'archived_at': archived_at} for doc in batch], ordered=False
+            )
+        except BulkWriteError as e:
+            if any(error.get('code') != DUPLICATE_KEY for error in e.details.get('writeErrors', [])):
+                raise
+        await database.chat_history.delete_many({'_id': {'$in': [doc['_id'] for doc in batch]}})
+
+        moved += len(batch)
+        batches += 1
+        _stats['moved'] += len(batch)
+        _stats['batches'] += 1
+        if len(batch) < batch_size:
+            break
+        await asyncio.sleep(CHAT_ARCHIVE_PAUSE_MS / 1000)
+
+    _stats['runs'] += 1
+    _stats['last_run_at'] = datetime.now(timezone.utc)
+    _stats['last_cutoff'] = cutoff
+    return {'cutoff': cutoff, 'moved': moved, 'batches': batches}
+
+
+async def _archive_loop():
+    while True:
+        try:
+            result = await archive_chat_history()
+            if result['moved']:
+                logging.info(f"Archived {result['moved']} chat turns older than {result['cutoff']:%Y-%m-%d}")
+        except Exception as e:
+            _stats['failures'] += 1
+            logging.error(f'Chat history archiving failed: {str(e)}')
+        await asyncio.sleep(CHAT_ARCHIVE_INTERVAL_SECONDS)
+
+
+def start_chat_archiver():
+    """Start periodic archiving; safe to run on several workers at once"""
+    global _archiver
+    if CHAT_HISTORY_RETENTION_DAYS <= 0 or _archiver is not None:
+        return
+    _archiver = asyncio.create_task(_archive_loop())
+
+
+async def stop_chat_archiver():
+    """Stop periodic archiving"""
+    global _archiver
+    if _archiver is None:
+        return
+    _archiver.cancel()
+    try:
+        await _archiver
+    except asyncio.CancelledError:
+        pass
+    _archiver = None
+
+
+def get_chat_archive_stats() -> dict:
+    """Get archiving counters"""
+    return {
+        **_stats,
+        'running': _archiver is not None,
+        'retention_days': CHAT_HISTORY_RETENTION_DAYS,
+        'batch_size': CHAT_ARCHIVE_BATCH_SIZE,
+        'interval_seconds': CHAT_ARCHIVE_INTERVAL_SECONDS,
+    }
+
+
+async def _main(args) -> int:
+    try:
+        result = await archive_chat_history(retention_days=args.days, batch_size=args.batch_size, dry_run=args.dry_run)
+    except ValueError as e:
+        print(str(e))
+        return 1
+    if args.dry_run:
+        print(f"{result['would_move']} turns older than {result['cutoff']:%Y-%m-%d} would be archived")
+    else:
+        print(f"Archived {result['moved']} turns older than {result['cutoff']:%Y-%m-%d} in {result['batches']} batches")
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Move old chat history to the archive collection')
+    parser.add_argument('--days', type=float, default=None, help='retention window (default CHAT_HISTORY_RETENTION_DAYS)')
+    parser.add_argument('--batch-size', type=int, default=None)
+    parser.add_argument('--dry-run', action='store_true')
+    sys.exit(asyncio.run(_main(parser.parse_args())))
@@ -0,0 +1,115 @@
+import json
+import re
+
+from services.card_stream import CardStreamParser
+
+# Card types the frontend knows how to render (see DEFAULT_SYSTEM_PROMPT and QuickChat's prompt)
+CARD_TYPES = ('greeting', 'question', 'info', 'advice', 'action', 'warning', 'definition')
+DEFAULT_CARD_TYPE = 'info'
+DEFAULT_CARD_TITLE = 'Information'
+MAX_FALLBACK_CARDS = 4
+
+# Parse outcomes stored as cards_status
+CARDS_VALID = 'valid'
+CARDS_REPAIRED = 'repaired'
+CARDS_FALLBACK = 'fallback'
+
+_FENCE = re.compile(r'```(?:json)?\s*([\s\S]*?)```', re.IGNORECASE)
+_TRAILING_COMMA = re.compile(r',\s*([}\]])')
+_SMART_QUOTES = str.maketrans({'“': '"', '”': '"'})
+_HEADING = re.compile(r'^(?:#{1,3}\s*|\*\*)(.+?)(?:\*\*:?)?\s*$')
+
+
+def _normalize_card(card) -> tuple:
+    """Return (card, changed) with type/title/content coerced, or (None, True) if unusable"""
+    if not isinstance(card, dict):
+        return None, True
+    content = card.get('content')
+    if not isinstance(content, str) or not content.strip():
+        return None, True
+
+    card_type = str(card.get('type') or '').strip().lower()
+    title = card.get('title')
+    normalized = {
+        'type': card_type if card_type in CARD_TYPES else DEFAULT_CARD_TYPE,
+        'title': title.strip() if isinstance(title, str) and title.strip() else DEFAULT_CARD_TITLE,
+        'content': content.strip(),
+    }
+    return normalized, normalized != card
+
+
+def _normalize_cards(cards) -> tuple:
+    if not isinstance(cards, list):
+        return [], True
+    normalized, changed = [], False
+    for card in cards:
+        card, card_changed = _normalize_card(card)
+        changed = changed or card_changed
+        if card is not None:
+            normalized.append(card)
+    return normalized, changed
+
+
+def _json_candidate(response: str) -> str:
+    """Pull the JSON object out of a fenced block or surrounding prose"""
+    fenced = _FENCE.search(response)
+    text = fenced.group(1) if fenced else response
+    start, end = text.find('{'), text.rfind('}')
+    return text[start:end + 1] if start != -1 and end > start else text
+
+
+def _fallback_cards(response: str) -> list:
+    """Turn plain text or markdown into info cards, one per section"""
+    cards = []
+    for section in re.split(r'\n\s*\n', response.strip()):
+        lines = section.strip().splitlines()
+        if not lines:
+            continue
+        heading = _HEADING.match(lines[0])
+        if heading and len(lines) > 1:
+            title, content = heading.group(1).strip(' #*:'), '\n'.join(lines[1:]).strip()
+        else:
+            title, content = DEFAULT_CARD_TITLE, section.strip()
+        cards.append({'type': DEFAULT_CARD_TYPE, 'title': title or DEFAULT_CARD_TITLE, 'content': content})
+    if len(cards) > MAX_FALLBACK_CARDS:
+        rest = '\n\n'.join(card['content'] for card in cards[MAX_FALLBACK_CARDS - 1:])
+        cards = cards[:MAX_FALLBACK_CARDS - 1] + [{**cards[MAX_FALLBACK_CARDS - 1], 'content': rest}]
+    return cards
+
+
+def parse_cards(response: str) -> tuple:
+    """
+    Parse an assistant response into render-ready cards.
+
+    Returns (cards, status): valid when the JSON matched the card schema,
+    repaired when it needed fixing (fences, trailing commas, truncation,
+    unknown types), fallback when the text was not card JSON at all.
+    """
+    if not response or not response.strip():
+        return [], CARDS_FALLBACK
+
+    candidate = _json_candidate(response)
+    repaired = candidate.strip() != response.strip()
+    for attempt in (candidate, _TRAILING_COMMA.sub(r'\1', candidate.translate(_SMART_QUOTES))):
+        try:
+            data = json.loads(attempt)
+        except ValueError:
+            repaired = True
+            continue
+        cards, changed = _normalize_cards(data.get('cards') if isinstance(data, dict) else None)
+        if cards:
+            return cards, CARDS_REPAIRED if repaired or changed else CARDS_VALID
+        break
+
+    # Truncated or otherwise broken JSON: keep every card object that did close
+    cards, _ = _normalize_cards(CardStreamParser().feed(candidate))
+    if cards:
+        return cards, CARDS_REPAIRED
+    return _fallback_cards(response), CARDS_FALLBACK
+
+
+def with_cards(turn: dict) -> dict:
+    """Fill in cards for chat history stored before they were parsed on write"""
+    if 'cards' not in turn and 'response' in turn:
+        turn['cards'], turn['cards_status'] = parse_cards(turn['response'])
+    return turn
@@ -0,0 +1,236 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from services.database import db
+from services.chat_service import send_chat_message, LLM_CLIENT_IDLE_TTL_SECONDS, LLM_CLIENT_POOL_MAX_SESSIONS
+from services.chat_history_writer import pending_chat_turns
+from services.chat_cards import parse_cards
+
+# Context configuration from environment
+CHAT_CONTEXT_RECENT_TURNS = int(os.environ.get('CHAT_CONTEXT_RECENT_TURNS', 6))
+CHAT_CONTEXT_TOKEN_BUDGET = int(os.environ.get('CHAT_CONTEXT_TOKEN_BUDGET', 3000))
+CHAT_SUMMARY_MAX_TOKENS = int(os.environ.get('CHAT_SUMMARY_MAX_TOKENS', 400))
+# Refresh the summary once this many turns have aged out of the recent window;
+# until then build_context still sends them, so context may hold up to RECENT + EVERY turns
+CHAT_SUMMARY_EVERY_TURNS = int(os.environ.get('CHAT_SUMMARY_EVERY_TURNS', 6))
+CHAT_SUMMARY_BATCH_TURNS = int(os.environ.get('CHAT_SUMMARY_BATCH_TURNS', 50))
+
+SUMMARY_SYSTEM_PROMPT = """You maintain a running summary of a conversation between a user and a legal assistant for an Indian legal tech platform.
+Keep the facts of the user's situation, their goals, advice already given and open questions.
+Reply with the updated summary only, as plain text, no JSON or markdown."""
+
+TURN_FIELDS = {'_id': 0, 'id': 1, 'message': 1, 'response': 1, 'cards': 1, 'timestamp': 1}
+
+# user ids with a summary refresh in progress, and the tasks doing it
+_refreshing = set()
+_tasks = set()
+
+# guest session_id -> (stored_at, first turn) for first answers served from the response cache;
+# the session's pooled client never saw that exchange, so it goes out with the next message
+_guest_seeds: "OrderedDict[str, tuple]" = OrderedDict()
+
+_stats = {
+    'contexts_built': 0,
+    'turns_dropped_for_budget': 0,
+    'summaries_truncated': 0,
+    'summary_refreshes': 0,
+    'summary_refresh_failures': 0,
+    'total_context_tokens': 0,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)"""
+    return (len(text) + 3) // 4
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    return text[:max(0, max_tokens * 4 - 3)].rstrip() + '...'
+
+
+def cards_text(cards: list) -> str:
+    """Flatten cards to 'Title: content' lines for use as context"""
+    return '\n'.join(f"{card['title']}: {card['content']}" for card in cards)
+
+
+def _format_turn(turn: dict) -> str:
+    cards = turn['cards'] if 'cards' in turn else parse_cards(turn['response'])[0]
+    return f"User: {turn['message']}\nAssistant: {cards_text(cards)}"
+
+
+def compose_message(message: str, summary: str, turns: list) -> str:
+    """
+    Fit the summary, then as many of the most recent turns as the token budget
+    allows, around the current message.
+    """
+    if not summary and not turns:
+        return message
+
+    budget = CHAT_CONTEXT_TOKEN_BUDGET - estimate_tokens(message) - 20
+    sections = []
+    if summary and budget > 0:
+        summary_budget = min(CHAT_SUMMARY_MAX_TOKENS, budget)
+        if estimate_tokens(summary) > summary_budget:
+            _stats['summaries_truncated'] += 1
+        summary = _truncate(summary, summary_budget)
+        sections.append(f"Conversation so far (summary):\n{summary}")
+        budget -= estimate_tokens(summary) + 8
+
+    kept = []
+    for turn in reversed(turns):
+        formatted = _format_turn(turn)
+        cost = estimate_tokens(formatted) + 1
+        if cost > budget:
+            break
+        kept.append(formatted)
+        budget -= cost
+    _stats['turns_dropped_for_budget'] += len(turns) - len(kept)
+    if kept:
+        sections.append("Recent messages:\n" + '\n'.join(reversed(kept)))
+
+    if not sections:
+        return message
+    sections.append(f"Current message:\n{message}")
+    return '\n\n'.join(sections)
+
+
+async def recent_turns(user_id: str, limit: int, after=None) -> list:
+    """Get a user's latest chat turns (newer than after, if given), oldest first, including ones not yet flushed"""
+    query = {'user_id': user_id}
+    if after:
+        query['timestamp'] = {'$gt': after}
+    turns = await db.chat_history.find(query, TURN_FIELDS).sort(
+        [('timestamp', -1), ('id', -1)]
+    ).limit(limit).to_list(limit)
+    turns.reverse()
+    # Unflushed turns are newer than anything already stored
+    stored = {turn['id'] for turn in turns}
+    turns.extend(turn for turn in pending_chat_turns(user_id) if turn['id'] not in stored)
+    return turns[-limit:]
+
+
+async def build_context(user_id: str, message: str) -> str:
+    """Compose the message to send for a user's next turn from their summary and every turn it does not cover"""
+    summary_doc = await db.chat_summaries.find_one({'user_id': user_id}, {'_id': 0, 'summary': 1, 'covered_until': 1})
+    # Turns that left the recent window wait for the next refresh; send them until then
+    turns = await recent_turns(
+        user_id,
+        CHAT_CONTEXT_RECENT_TURNS + CHAT_SUMMARY_EVERY_TURNS,
+        after=summary_doc['covered_until'] if summary_doc else None
+    )
+    composed = compose_message(message, summary_doc['summary'] if summary_doc else '', turns)
+    _stats['contexts_built'] += 1
+    _stats['total_context_tokens'] += estimate_tokens(composed)
+    return composed
+
+
+def seed_guest_session(session_id: str, message: str, response: str):
+    """Remember a guest's cached first exchange for their next turn"""
+    _guest_seeds[session_id] = (time.monotonic(), {'message': message, 'response': response})
+    _guest_seeds.move_to_end(session_id)
+    while len(_guest_seeds) > LLM_CLIENT_POOL_MAX_SESSIONS:
+        _guest_seeds.popitem(last=False)
+
+
+def has_guest_seed(session_id: str) -> bool:
+    """Whether a guest's cached first exchange is still waiting for their next turn"""
+    return session_id in _guest_seeds
+
+
+def guest_context(session_id: str, message: str) -> str:
+    """Prepend a guest's cached first exchange to their next message, once"""
+    entry = _guest_seeds.pop(session_id, None)
+    if entry is None or time.monotonic() - entry[0] > LLM_CLIENT_IDLE_TTL_SECONDS:
+        return message
+    return compose_message(message, '', [entry[1]])
+
+
+async def refresh_summary(user_id: str) -> bool:
+    """Fold turns that have left the recent window into the stored summary"""
+    summary_doc = await db.chat_summaries.find_one({'user_id': user_id}, {'_id': 0})
+    covered_until = summary_doc['covered_until'] if summary_doc else None
+
+    query = {'user_id': user_id}
+    if covered_until:
+        query['timestamp'] = {'$gt': covered_until}
+    unsummarized = await db.chat_history.count_documents(
+        query, limit=CHAT_CONTEXT_RECENT_TURNS + CHAT_SUMMARY_EVERY_TURNS
+    )
+    if unsummarized < CHAT_CONTEXT_RECENT_TURNS + CHAT_SUMMARY_EVERY_TURNS:
+        return False
+
+    # Everything older than the recent window and not yet summarized, oldest first
+    window = await recent_turns(user_id, CHAT_CONTEXT_RECENT_TURNS)
+    query['timestamp'] = {**query.get('timestamp', {}), '$lt': window[0]['timestamp']}
+    turns = await db.chat_history.find(query, TURN_FIELDS).sort(
+        [('timestamp', 1), ('id', 1)]
+    ).limit(CHAT_SUMMARY_BATCH_TURNS).to_list(CHAT_SUMMARY_BATCH_TURNS)
+    if not turns:
+        return False
+
+    previous = summary_doc['summary'] if summary_doc else '(none yet)'
+    request = (
+        f"Current summary:\n{previous}\n\n"
+        "New messages:\n" + '\n'.join(_format_turn(turn) for turn in turns) +
+        f"\n\nWrite the updated summary in at most {CHAT_SUMMARY_MAX_TOKENS * 3 // 4} words."
+    )
+    summary = await send_chat_message(
+        message=request,
+        session_id=f'summary_{user_id}',
+        system_prompt=SUMMARY_SYSTEM_PROMPT,
+        stateless=True
+    )
+
+    await db.chat_summaries.update_one(
+        {'user_id': user_id},
+        {
+            '$set': {
+                'summary': summary.strip(),
+                'covered_until': turns[-1]['timestamp'],
+                'updated_at': datetime.now(timezone.utc)
+            },
+            '$inc': {'turns_covered': len(turns)}
+        },
+        upsert=True
+    )
+    _stats['summary_refreshes'] += 1
+    return True
+
+
+async def _refresh_in_background(user_id: str):
+    try:
+        await refresh_summary(user_id)
+    except Exception as e:
+        _stats['summary_refresh_failures'] += 1
+        logging.warning(f'Chat summary refresh failed for {user_id}: {str(e)}')
+    finally:
+        _refreshing.discard(user_id)
+
+
+def schedule_summary_refresh(user_id: str):
+    """Check in the background whether the user's summary is due, without delaying the reply"""
+    if user_id in _refreshing:
+        return
+    _refreshing.add(user_id)
+    task = asyncio.create_task(_refresh_in_background(user_id))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+def get_chat_context_stats() -> dict:
+    """Get context size and summary refresh counters"""
+    built = _stats['contexts_built']
+    return {
+        **_stats,
+        'avg_context_tokens': round(_stats['total_context_tokens'] / built, 1) if built else 0,
+        'refreshes_in_progress': len(_refreshing),
+        'guest_seeds': len(_guest_seeds),
+        'recent_turns': CHAT_CONTEXT_RECENT_TURNS,
+        'token_budget': CHAT_CONTEXT_TOKEN_BUDGET,
+    }
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from services.database import db
+
+# Write-behind configuration from environment
+CHAT_HISTORY_WRITE_BEHIND = os.environ.get('CHAT_HISTORY_WRITE_BEHIND', 'true').lower() == 'true'
+CHAT_HISTORY_BATCH_SIZE = int(os.environ.get('CHAT_HISTORY_BATCH_SIZE', 100))
+CHAT_HISTORY_FLUSH_INTERVAL_MS = float(os.environ.get('CHAT_HISTORY_FLUSH_INTERVAL_MS', 200))
+# Unwritten turns allowed before callers wait for Mongo to catch up
+CHAT_HISTORY_MAX_PENDING = int(os.environ.get('CHAT_HISTORY_MAX_PENDING', 5000))
+CHAT_HISTORY_DRAIN_TIMEOUT_SECONDS = float(os.environ.get('CHAT_HISTORY_DRAIN_TIMEOUT_SECONDS', 10))
+CHAT_HISTORY_RETRY_MAX_SECONDS = float(os.environ.get('CHAT_HISTORY_RETRY_MAX_SECONDS', 5))
+
+DUPLICATE_KEY = 11000
+
+# Turns waiting for the next flush, and the batch currently being written
+_buffer = []
+_in_flight = []
+_flusher: Optional[asyncio.Task] = None
+_wakeup: Optional[asyncio.Event] = None
+_space: Optional[asyncio.Event] = None
+_flush_lock: Optional[asyncio.Lock] = None
+_stopping = False
+
+_stats = {
+    'enqueued': 0,
+    'written': 0,
+    'direct_writes': 0,
+    'batches': 0,
+    'write_failures': 0,
+    'backpressure_waits': 0,
+    'peak_pending': 0,
+    'total_flush_ms': 0.0,
+}
+
+
+def _pending_count() -> int:
+    return len(_buffer) + len(_in_flight)
+
+
+async def _write_batch(batch: list):
+    """
+    Insert a batch, retrying until it lands so no turn is dropped.
+
+    Documents carry their _id from the moment they are queued, so a retry after
+    a partly applied insert only hits duplicate key errors for what already landed.
+    """
+    delay = 0.1
+    while True:
+        started = time.perf_counter()
+        try:
+            await db.chat_history.insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            # A retried batch may be partly written already; duplicates mean it landed
+            if any(error.get('code') != DUPLICATE_KEY for error in e.details.get('writeErrors', [])) \
+                    or e.details.get('writeConcernErrors'):
+                _stats['write_failures'] += 1
+                logging.warning(f'chat_history batch write failed, retrying: {str(e)}')
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, CHAT_HISTORY_RETRY_MAX_SECONDS)
+                continue
+        except Exception as e:
+            _stats['write_failures'] += 1
+            logging.warning(f'chat_history batch write failed, retrying: {str(e)}')
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, CHAT_HISTORY_RETRY_MAX_SECONDS)
+            continue
+        _stats['batches'] += 1
+        _stats['written'] += len(batch)
+        _stats['total_flush_ms'] += (time.perf_counter() - started) * 1000
+        return
+
+
+async def flush_chat_history():
+    """Write every buffered turn"""
+    async with _flush_lock:
+        while _buffer:
+            _in_flight.extend(_buffer[:CHAT_HISTORY_BATCH_SIZE])
+            del _buffer[:CHAT_HISTORY_BATCH_SIZE]
+            try:
+                await _write_batch(list(_in_flight))
+            finally:
+                _in_flight.clear()
+                _space.set()
+
+
+async def _flush_loop():
+    while not _stopping:
+        try:
+            await asyncio.wait_for(_wakeup.wait(), CHAT_HISTORY_FLUSH_INTERVAL_MS / 1000)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
+        await flush_chat_history()
+    await flush_chat_history()
+
+
+def start_chat_history_writer():
+    """Start the background flusher"""
+    global _flusher, _wakeup, _space, _flush_lock, _stopping
+    if not CHAT_HISTORY_WRITE_BEHIND or _flusher is not None:
+        return
+    _stopping = False
+    _wakeup = asyncio.Event()
+    _space = asyncio.Event()
+    _flush_lock = asyncio.Lock()
+    _flusher = asyncio.create_task(_flush_loop())
+
+
+async def drain_chat_history_writer():
+    """Stop the flusher and write whatever is still buffered"""
+    global _flusher, _stopping
+    if _flusher is None:
+        return
+    # The loop finishes its current write, flushes the rest and exits
+    _stopping = True
+    _wakeup.set()
+    try:
+        await asyncio.wait_for(_flusher, CHAT_HISTORY_DRAIN_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logging.error(f'chat_history drain timed out with {_pending_count()} turns unwritten')
+    except asyncio.CancelledError:
+        pass
+    _flusher = None
+
+
+async def record_chat_turn(doc: dict):
+    """Queue a chat turn for a batched insert, waiting while too many are unwritten"""
+    if _flusher is None:
+        # Writer not running (disabled, or outside the app lifecycle): write straight away
+        _stats['direct_writes'] += 1
+        await db.chat_history.insert_one(dict(doc))
+        return
+
+    while _pending_count() >= CHAT_HISTORY_MAX_PENDING:
+        _stats['backpressure_waits'] += 1
+        _space.clear()
+        _wakeup.set()
+        await _space.wait()
+
+    _buffer.append({**doc, '_id': ObjectId()})
+    _stats['enqueued'] += 1
+    _stats['peak_pending'] = max(_stats['peak_pending'], _pending_count())
+    if len(_buffer) >= CHAT_HISTORY_BATCH_SIZE:
+        _wakeup.set()
+
+
+def pending_chat_turns(user_id: str) -> list:
+    """Get a user's turns that are accepted but not yet written"""
+    return [
+        {key: value for key, value in doc.items() if key != '_id'}
+        for doc in _in_flight + _buffer if doc.get('user_id') == user_id
+    ]
+
+
+def get_chat_history_writer_stats() -> dict:
+    """Get buffer depth and flush counters for the chat_history writer"""
+    return {
+        **_stats,
+        'pending': _pending_count(),
+        'running': _flusher is not None,
+        'avg_flush_ms': round(_stats['total_flush_ms'] / _stats['batches'], 2) if _stats['batches'] else 0,
+        'batch_size': CHAT_HISTORY_BATCH_SIZE,
+        'flush_interval_ms': CHAT_HISTORY_FLUSH_INTERVAL_MS,
+        'max_pending': CHAT_HISTORY_MAX_PENDING,
+    }
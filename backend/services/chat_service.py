@@ -1,10 +1,36 @@
+import asyncio
 import os
 import logging
+import hashlib
+import random
+import time
 import uuid
+from collections import OrderedDict, deque
 from datetime import datetime, timezone
-from emergentintegrations.llm.chat import LlmChat, UserMessage
+import httpx
 from fastapi import HTTPException
 
+from services.llm_limiter import llm_slot
+from services.llm_providers import get_provider
+
+# Client pool configuration from environment
+LLM_CLIENT_POOL_MAX_SESSIONS = int(os.environ.get('LLM_CLIENT_POOL_MAX_SESSIONS', 1000))
+LLM_CLIENT_IDLE_TTL_SECONDS = float(os.environ.get('LLM_CLIENT_IDLE_TTL_SECONDS', 900))
+LLM_HTTP_MAX_CONNECTIONS = int(os.environ.get('LLM_HTTP_MAX_CONNECTIONS', 100))
+
+# Deadline, retry and hedging configuration from environment
+LLM_ATTEMPT_TIMEOUT_SECONDS = float(os.environ.get('LLM_ATTEMPT_TIMEOUT_SECONDS', 30))
+LLM_TOTAL_TIMEOUT_SECONDS = float(os.environ.get('LLM_TOTAL_TIMEOUT_SECONDS', 60))
+LLM_MAX_RETRIES = int(os.environ.get('LLM_MAX_RETRIES', 2))
+LLM_RETRY_BASE_SECONDS = float(os.environ.get('LLM_RETRY_BASE_SECONDS', 0.5))
+LLM_RETRY_MAX_SECONDS = float(os.environ.get('LLM_RETRY_MAX_SECONDS', 4))
+LLM_HEDGE_ENABLED = os.environ.get('LLM_HEDGE_ENABLED', 'false').lower() == 'true'
+# Hedge delay used until enough latency samples exist for a p95
+LLM_HEDGE_MIN_DELAY_SECONDS = float(os.environ.get('LLM_HEDGE_MIN_DELAY_SECONDS', 2))
+LLM_HEDGE_MIN_SAMPLES = int(os.environ.get('LLM_HEDGE_MIN_SAMPLES', 20))
+
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
 # Default system prompt for legal assistant
 DEFAULT_SYSTEM_PROMPT = """You are a helpful legal assistant for Lxwyer Up, an Indian legal tech platform.
 
@@ -32,26 +58,292 @@ RULES:
 - ONLY output valid JSON, no markdown or extra text"""
 
 
-async def send_chat_message(message: str, session_id: str, system_prompt: str = None) -> str:
-    """Send a message to the LLM chat and get response"""
-    prompt = system_prompt if system_prompt else DEFAULT_SYSTEM_PROMPT
+# (session_id, prompt hash) -> (last_used, client), least recently used first
+_clients: "OrderedDict[tuple, tuple]" = OrderedDict()
+_client_stats = {'hits': 0, 'misses': 0, 'idle_evictions': 0, 'capacity_evictions': 0}
+_shared_http_client = None
+
+
+def _configure_shared_http():
+    """Route provider HTTP calls through one keep-alive connection pool"""
+    global _shared_http_client
+    if _shared_http_client is not None:
+        return
+    _shared_http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_HTTP_MAX_CONNECTIONS
+        ),
+        timeout=httpx.Timeout(120.0, connect=10.0)
+    )
+    try:
+        # Provider clients call litellm, which reuses this client if set
+        import litellm
+        if getattr(litellm, 'aclient_session', None) is None:
+            litellm.aclient_session = _shared_http_client
+    except ImportError:
+        pass
+
+
+def _evict_idle_clients(now: float):
+    """Drop clients that have not been used within the idle TTL"""
+    while _clients:
+        key, (last_used, _) = next(iter(_clients.items()))
+        if now - last_used < LLM_CLIENT_IDLE_TTL_SECONDS:
+            break
+        del _clients[key]
+        _client_stats['idle_evictions'] += 1
+
+
+def _build_chat_client(session_id: str, prompt: str):
+    """Create a chat client from the configured provider"""
+    return get_provider().build_client(session_id, prompt)
+
+
+def _client_key(session_id: str, prompt: str) -> tuple:
+    return (session_id, hashlib.sha256(prompt.encode('utf-8')).hexdigest())
+
+
+def has_chat_client(session_id: str, prompt: str) -> bool:
+    """Whether the session has a live pooled client, i.e. a conversation already under way"""
+    entry = _clients.get(_client_key(session_id, prompt))
+    return entry is not None and time.monotonic() - entry[0] < LLM_CLIENT_IDLE_TTL_SECONDS
+
+
+def get_chat_client(session_id: str, prompt: str):
+    """Get the pooled chat client for a session, creating it on first use"""
+    _configure_shared_http()
+    if LLM_CLIENT_POOL_MAX_SESSIONS <= 0:
+        return _build_chat_client(session_id, prompt)
+    
+    now = time.monotonic()
+    _evict_idle_clients(now)
+    
+    key = _client_key(session_id, prompt)
+    entry = _clients.get(key)
+    if entry is not None:
+        _client_stats['hits'] += 1
+        chat_client = entry[1]
+    else:
+        _client_stats['misses'] += 1
+        chat_client = _build_chat_client(session_id, prompt)
+    
+    _clients[key] = (now, chat_client)
+    _clients.move_to_end(key)
+    while len(_clients) > LLM_CLIENT_POOL_MAX_SESSIONS:
+        _clients.popitem(last=False)
+        _client_stats['capacity_evictions'] += 1
+    return chat_client
+
+
+def _session_client(session_id: str, prompt: str, stateless: bool = False):
+    """The session's pooled client; stateless turns start it from an empty history"""
+    chat_client = get_chat_client(session_id, prompt)
+    if stateless:
+        if not hasattr(chat_client, 'reset_history'):
+            return _build_chat_client(session_id, prompt)
+        chat_client.reset_history()
+    return chat_client
+
+
+def get_chat_client_stats() -> dict:
+    """Get hit/miss and eviction counters for the chat client pool"""
+    return {
+        **_client_stats,
+        'live_sessions': len(_clients),
+        'max_sessions': LLM_CLIENT_POOL_MAX_SESSIONS,
+        'idle_ttl_seconds': LLM_CLIENT_IDLE_TTL_SECONDS,
+    }
+
+
+async def close_chat_clients():
+    """Drop pooled clients and close the shared HTTP connection pool"""
+    global _shared_http_client
+    _clients.clear()
+    if _shared_http_client is not None:
+        try:
+            import litellm
+            # Unhook the closed client so the next _configure_shared_http installs its replacement
+            if getattr(litellm, 'aclient_session', None) is _shared_http_client:
+                litellm.aclient_session = None
+        except ImportError:
+            pass
+        await _shared_http_client.aclose()
+        _shared_http_client = None
+
+
+# Per-attempt outcomes and recent successful attempt latencies (seconds)
+_call_stats = {
+    'attempts': 0,
+    'success': 0,
+    'timeout': 0,
+    'retryable_error': 0,
+    'error': 0,
+    'cancelled': 0,
+    'retries': 0,
+    'hedges_fired': 0,
+    'hedge_wins': 0,
+    'deadline_exceeded': 0,
+}
+_latencies = deque(maxlen=500)
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Timeouts, connection failures and throttling/5xx responses are worth retrying"""
+    if isinstance(error, (TimeoutError, ConnectionError, httpx.TransportError)):
+        return True
+    status_code = getattr(error, 'status_code', None)
+    if status_code is None:
+        status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status_code in RETRYABLE_STATUS_CODES
+
+
+def _latency_p95():
+    if len(_latencies) < LLM_HEDGE_MIN_SAMPLES:
+        return None
+    ordered = sorted(_latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+def _hedge_delay() -> float:
+    p95 = _latency_p95()
+    return p95 if p95 is not None else LLM_HEDGE_MIN_DELAY_SECONDS
+
+
+async def _attempt(chat_client, user_message, kind: str) -> str:
+    """Run one provider call under the per-attempt deadline and record its outcome"""
+    _call_stats['attempts'] += 1
+    started = time.perf_counter()
+    try:
+        async with asyncio.timeout(LLM_ATTEMPT_TIMEOUT_SECONDS):
+            response = await chat_client.send_message(user_message)
+    except TimeoutError:
+        outcome = 'timeout'
+        raise
+    except asyncio.CancelledError:
+        outcome = 'cancelled'
+        raise
+    except Exception as e:
+        outcome = 'retryable_error' if _is_retryable(e) else 'error'
+        raise
+    else:
+        outcome = 'success'
+        _latencies.append(time.perf_counter() - started)
+        return response
+    finally:
+        _call_stats[outcome] += 1
+        logging.debug('LLM %s attempt: %s in %.0f ms', kind, outcome, (time.perf_counter() - started) * 1000)
+
+
+async def _send_hedged(session_id: str, prompt: str, user_message, stateless: bool = False) -> str:
+    """Send once, firing a second request if the first outlives the recent p95"""
+    chat_client = _session_client(session_id, prompt, stateless)
+    primary = asyncio.create_task(_attempt(chat_client, user_message, 'primary'))
+    if not LLM_HEDGE_ENABLED:
+        return await primary
     
+    pending = {primary}
     try:
-        chat_client = LlmChat(
-            api_key=os.environ.get('EMERGENT_LLM_KEY'),
-            session_id=session_id,
-            system_message=prompt
-        ).with_model('gemini', 'gemini-3-flash-preview')
+        done, _ = await asyncio.wait(pending, timeout=_hedge_delay())
+        if not done:
+            # A fresh client so the two in-flight turns don't share one conversation buffer
+            hedge = asyncio.create_task(_attempt(_build_chat_client(session_id, prompt), user_message, 'hedge'))
+            pending.add(hedge)
+            _call_stats['hedges_fired'] += 1
         
-        user_message = UserMessage(text=message)
-        response = await chat_client.send_message(user_message)
-        
-        return response
+        errors = []
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is not primary:
+                        _call_stats['hedge_wins'] += 1
+                    return task.result()
+                errors.append(task.exception())
+        raise errors[0]
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _send_with_retries(session_id: str, prompt: str, message: str, stateless: bool = False) -> str:
+    """Retry retryable failures with capped exponential backoff and full jitter"""
+    user_message = get_provider().user_message(message)
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        try:
+            return await _send_hedged(session_id, prompt, user_message, stateless)
+        except Exception as e:
+            if attempt == LLM_MAX_RETRIES or not _is_retryable(e):
+                raise
+            _call_stats['retries'] += 1
+            backoff = min(LLM_RETRY_MAX_SECONDS, LLM_RETRY_BASE_SECONDS * 2 ** attempt)
+            logging.warning(f'Chat provider call failed ({type(e).__name__}), retrying: {str(e)}')
+            await asyncio.sleep(random.uniform(0, backoff))
+
+
+async def _complete(session_id: str, prompt: str, message: str, stateless: bool = False) -> str:
+    """Get a full response within the overall deadline"""
+    try:
+        async with asyncio.timeout(LLM_TOTAL_TIMEOUT_SECONDS) as deadline:
+            return await _send_with_retries(session_id, prompt, message, stateless)
+    except TimeoutError:
+        if deadline.expired():
+            _call_stats['deadline_exceeded'] += 1
+        logging.error('Chat service timed out')
+        raise HTTPException(status_code=504, detail='Chat service timed out')
     except Exception as e:
         logging.error(f'Chat service error: {str(e)}')
         raise HTTPException(status_code=500, detail=f'Chat service error: {str(e)}')
 
 
+def get_llm_call_stats() -> dict:
+    """Get per-attempt outcome counters and latency for provider calls"""
+    p95 = _latency_p95()
+    return {
+        **_call_stats,
+        'p95_ms': round(p95 * 1000, 2) if p95 is not None else None,
+        'hedge_enabled': LLM_HEDGE_ENABLED,
+        'hedge_delay_ms': round(_hedge_delay() * 1000, 2),
+        'attempt_timeout_seconds': LLM_ATTEMPT_TIMEOUT_SECONDS,
+        'total_timeout_seconds': LLM_TOTAL_TIMEOUT_SECONDS,
+        'max_retries': LLM_MAX_RETRIES,
+    }
+
+
+async def send_chat_message(message: str, session_id: str, system_prompt: str = None, stateless: bool = False) -> str:
+    """
+    Send a message to the LLM chat and get response.
+
+    With stateless=True the message already carries its conversation context
+    (see services.chat_context), so the session's pooled client is reused
+    with its history cleared rather than left to keep growing.
+    """
+    prompt = system_prompt if system_prompt else DEFAULT_SYSTEM_PROMPT
+    
+    async with llm_slot(session_id):
+        return await _complete(session_id, prompt, message, stateless)
+
+
+async def stream_chat_message(message: str, session_id: str, system_prompt: str = None, stateless: bool = False):
+    """
+    Send a message to the LLM chat and yield the response text as it arrives.
+
+    The caller holds the llm_slot for session_id, taken before its response
+    starts so an admission 429 keeps its status and Retry-After.
+    """
+    prompt = system_prompt if system_prompt else DEFAULT_SYSTEM_PROMPT
+    chat_client = _session_client(session_id, prompt, stateless)
+    
+    if hasattr(chat_client, 'stream_message'):
+        # Tokens may already have reached the caller, so only the overall deadline applies
+        async with asyncio.timeout(LLM_TOTAL_TIMEOUT_SECONDS):
+            async for chunk in chat_client.stream_message(get_provider().user_message(message)):
+                yield chunk
+    else:
+        # Client without token streaming: deliver the whole response as one chunk
+        yield await _complete(session_id, prompt, message, stateless)
+
+
 def generate_guest_session_id() -> str:
     """Generate a unique session ID for guest users"""
     return f"guest_{uuid.uuid4()}"
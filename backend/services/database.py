@@ -1,14 +1,39 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from pathlib import Path
 from dotenv import load_dotenv
+from datetime import timezone
 import os
 
+from services.db_metrics import pool_listener, command_listener
+
 ROOT_DIR = Path(__file__).parent.parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Connection pool configuration from environment
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', 100))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', 0))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', 0)) or None
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', 30000))
+# e.g. "zstd,snappy"; needs the zstandard / python-snappy packages, otherwise the driver skips them
+MONGO_COMPRESSORS = os.environ.get('MONGO_COMPRESSORS', '')
+MONGO_MONITORING = os.environ.get('MONGO_MONITORING', 'true').lower() == 'true'
+
+client_options = {
+    'maxPoolSize': MONGO_MAX_POOL_SIZE,
+    'minPoolSize': MONGO_MIN_POOL_SIZE,
+    'waitQueueTimeoutMS': MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    'serverSelectionTimeoutMS': MONGO_SERVER_SELECTION_TIMEOUT_MS,
+}
+if MONGO_COMPRESSORS:
+    client_options['compressors'] = MONGO_COMPRESSORS
+if MONGO_MONITORING:
+    client_options['event_listeners'] = [pool_listener, command_listener]
+
 # MongoDB connection
+# Timestamps are stored as native BSON dates and decoded as UTC-aware datetimes,
+# so documents can go straight into the Pydantic models without conversion.
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, tz_aware=True, tzinfo=timezone.utc, **client_options)
 db = client[os.environ['DB_NAME']]
 
 
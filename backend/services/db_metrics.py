@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import deque
+from pymongo import monitoring
+
+# Number of recent samples kept for percentiles
+SAMPLE_SIZE = 1000
+
+
+def _summary(samples) -> dict:
+    """Summarize a window of millisecond samples"""
+    if not samples:
+        return {'avg_ms': 0, 'p95_ms': 0, 'max_ms': 0}
+    ordered = sorted(samples)
+    return {
+        'avg_ms': round(sum(ordered) / len(ordered), 2),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        'max_ms': round(ordered[-1], 2),
+    }
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Track connection counts and checkout wait time for the Motor pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Checkouts run synchronously on Motor's worker threads, so the start
+        # time of the checkout in progress is kept per thread
+        self._local = threading.local()
+        self.open = 0
+        self.in_use = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.pools_cleared = 0
+        self.waits = deque(maxlen=SAMPLE_SIZE)
+
+    def _finish_wait(self):
+        started = getattr(self._local, 'checkout_started', None)
+        self._local.checkout_started = None
+        return (time.perf_counter() - started) * 1000 if started is not None else None
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pools_cleared += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open -= 1
+
+    def connection_check_out_started(self, event):
+        self._local.checkout_started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        self._finish_wait()
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        wait = self._finish_wait()
+        with self._lock:
+            self.in_use += 1
+            self.checkouts += 1
+            if wait is not None:
+                self.waits.append(wait)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'open_connections': self.open,
+                'in_use': self.in_use,
+                'checkouts': self.checkouts,
+                'checkout_failures': self.checkout_failures,
+                'pools_cleared': self.pools_cleared,
+                'checkout_wait': _summary(list(self.waits)),
+            }
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Track per-command latency as measured by the driver"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.commands = {}
+
+    def _record(self, event, failed: bool):
+        with self._lock:
+            entry = self.commands.get(event.command_name)
+            if entry is None:
+                entry = self.commands[event.command_name] = {
+                    'count': 0, 'failures': 0, 'samples': deque(maxlen=SAMPLE_SIZE)
+                }
+            entry['count'] += 1
+            entry['failures'] += int(failed)
+            entry['samples'].append(event.duration_micros / 1000)
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event, failed=False)
+
+    def failed(self, event):
+        self._record(event, failed=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                name: {'count': entry['count'], 'failures': entry['failures'], **_summary(list(entry['samples']))}
+                for name, entry in self.commands.items()
+            }
+
+
+pool_listener = PoolMetricsListener()
+command_listener = CommandMetricsListener()
+
+
+def get_mongo_stats() -> dict:
+    """Get pool and command metrics for the Motor client"""
+    return {
+        'pool': pool_listener.stats(),
+        'commands': command_listener.stats(),
+    }
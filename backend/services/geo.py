@@ -0,0 +1,184 @@
+"""
+Coordinates for lawyer and law firm profiles, from the offline gazetteer in
+data/gazetteer_in.csv (Indian cities with pincode prefixes, plus one fallback
+row per state). No geocoding service is involved.
+
+Profiles store a GeoJSON point in `location` (2dsphere index, see
+services.indexes) and how it was resolved in `location_precision`.
+Approvals set it; existing profiles get it with:
+
+    python -m services.geo backfill
+"""
+import argparse
+import asyncio
+import csv
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+from pymongo import UpdateOne
+
+from services.database import db
+from services.suggest_index import ALIASES, normalize
+
+GAZETTEER_PATH = Path(__file__).parent.parent / 'data' / 'gazetteer_in.csv'
+
+GEO_USER_TYPES = ['lawyer', 'law_firm']
+DEFAULT_RADIUS_KM = 50
+MAX_RADIUS_KM = 500
+
+# location_precision values, most to least precise
+PRECISION_CITY = 'city'
+PRECISION_PINCODE = 'pincode'
+PRECISION_STATE = 'state'
+# A state-level point says nothing about distance; those profiles stay out of near searches
+NEAR_PRECISIONS = [PRECISION_CITY, PRECISION_PINCODE]
+
+_PINCODE = re.compile(r'^\s*([1-9]\d{2})\s?\d{3}\s*$')
+
+
+@lru_cache(maxsize=1)
+def _gazetteer() -> dict:
+    """Load the gazetteer into lookup tables keyed by normalized names and pincode prefix"""
+    cities, pincodes, states = {}, {}, {}
+    city_states = {}
+    with open(GAZETTEER_PATH, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            point = (float(row['longitude']), float(row['latitude']))
+            state = normalize(row['state'])
+            if not row['city']:
+                states[state] = point
+                continue
+            place = (point, row['city'], row['state'])
+            names = [row['city']] + ALIASES['city'].get(row['city'], [])
+            for name in names:
+                cities[(normalize(name), state)] = place
+                cities[(normalize(name), None)] = place
+                city_states.setdefault(normalize(name), set()).add(state)
+            for prefix in row['pincode_prefixes'].split():
+                pincodes[prefix] = place
+    # A city name without a state only resolves when no two states share it
+    for name, names_states in city_states.items():
+        if len(names_states) > 1:
+            del cities[(name, None)]
+    return {'cities': cities, 'pincodes': pincodes, 'states': states}
+
+
+def point(longitude: float, latitude: float) -> dict:
+    """GeoJSON point; Mongo expects [longitude, latitude]"""
+    return {'type': 'Point', 'coordinates': [longitude, latitude]}
+
+
+def geocode(city: Optional[str] = None, state: Optional[str] = None,
+            pincode: Optional[str] = None) -> Optional[Tuple[dict, str]]:
+    """Resolve a profile's city/state/pincode to (GeoJSON point, precision), or None"""
+    gazetteer = _gazetteer()
+    state_key = normalize(state) if isinstance(state, str) and state.strip() else None
+    if isinstance(city, str) and city.strip():
+        place = gazetteer['cities'].get((normalize(city), state_key))
+        if place is None and state_key not in gazetteer['states']:
+            # No state, or one we don't recognise: fall back to the city name alone
+            place = gazetteer['cities'].get((normalize(city), None))
+        if place:
+            return point(*place[0]), PRECISION_CITY
+    match = _PINCODE.match(pincode) if isinstance(pincode, str) else None
+    if match and match.group(1) in gazetteer['pincodes']:
+        return point(*gazetteer['pincodes'][match.group(1)][0]), PRECISION_PINCODE
+    if state_key in gazetteer['states']:
+        return point(*gazetteer['states'][state_key]), PRECISION_STATE
+    return None
+
+
+def resolve_place(place: str) -> Optional[dict]:
+    """Resolve a 'near' search term (pincode, or city with optional ', state') to a GeoJSON point"""
+    if _PINCODE.match(place):
+        result = geocode(pincode=place)
+    else:
+        city, _, state = place.partition(',')
+        result = geocode(city=city, state=state or None)
+    return result[0] if result and result[1] != PRECISION_STATE else None
+
+
+def near_origin(near: Optional[str], lat: Optional[float], lng: Optional[float]) -> dict:
+    """Origin point for a near search, from explicit coordinates or a place name"""
+    if lat is not None and lng is not None:
+        return point(lng, lat)
+    if lat is not None or lng is not None:
+        raise HTTPException(status_code=400, detail='lat and lng must be given together')
+    origin = resolve_place(near)
+    if origin is None:
+        raise HTTPException(status_code=400, detail=f'Unknown place: {near}')
+    return origin
+
+
+def location_fields(city: Optional[str], state: Optional[str], pincode: Optional[str] = None) -> dict:
+    """Fields to store on a profile so near searches can find it"""
+    result = geocode(city, state, pincode)
+    if result is None:
+        return {}
+    location, precision = result
+    return {'location': location, 'location_precision': precision}
+
+
+def near_stage(origin: dict, query: dict, radius_km: float) -> dict:
+    """$geoNear stage (must open the pipeline); adds distance_m to each match"""
+    return {'$geoNear': {
+        'near': origin,
+        'key': 'location',
+        'distanceField': 'distance_m',
+        'maxDistance': radius_km * 1000,
+        'query': {**query, 'location_precision': {'$in': NEAR_PRECISIONS}},
+        'spherical': True,
+    }}
+
+
+async def search_near(query: dict, origin: dict, radius_km: float, page: int, limit: int,
+                      projection: dict) -> Tuple[List[dict], int]:
+    """Get one page of profiles matching query within radius_km, nearest first, and the total"""
+    pipeline = [
+        near_stage(origin, query, radius_km),
+        {'$facet': {
+            'results': [
+                {'$skip': (page - 1) * limit},
+                {'$limit': limit},
+                {'$set': {'distance_km': {'$round': [{'$divide': ['$distance_m', 1000]}, 1]}}},
+                {'$project': {**projection, 'distance_m': 0}},
+            ],
+            'total': [{'$count': 'count'}],
+        }},
+    ]
+    result = (await db.users.aggregate(pipeline).to_list(1))[0]
+    total = result['total'][0]['count'] if result['total'] else 0
+    return result['results'], total
+
+
+async def backfill_locations(database=None, batch_size: int = 500) -> dict:
+    """Set location on lawyer and law firm profiles that do not have one yet"""
+    database = database if database is not None else db
+    query = {'user_type': {'$in': GEO_USER_TYPES}, 'location': {'$exists': False}}
+    counts = {'updated': 0, 'unresolved': 0}
+    batch = []
+    async for user in database.users.find(query, {'_id': 1, 'city': 1, 'state': 1, 'pincode': 1}):
+        fields = location_fields(user.get('city'), user.get('state'), user.get('pincode'))
+        if not fields:
+            counts['unresolved'] += 1
+            continue
+        batch.append(UpdateOne({'_id': user['_id']}, {'$set': fields}))
+        if len(batch) >= batch_size:
+            counts['updated'] += (await database.users.bulk_write(batch, ordered=False)).modified_count
+            batch = []
+    if batch:
+        counts['updated'] += (await database.users.bulk_write(batch, ordered=False)).modified_count
+    return counts
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Profile coordinates from the offline gazetteer')
+    parser.add_argument('command', choices=['backfill'])
+    parser.parse_args()
+    result = asyncio.run(backfill_locations())
+    print(f"Set location on {result['updated']} profiles; {result['unresolved']} had no gazetteer match")
+    sys.exit(0)
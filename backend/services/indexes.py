@@ -0,0 +1,235 @@
+"""
+Index manifest for every collection the routes query.
+
+Applied idempotently at startup from server.py, and runnable as a CLI:
+
+    python -m services.indexes apply
+    python -m services.indexes verify
+"""
+import argparse
+import asyncio
+import logging
+import sys
+
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+from services.database import db
+from services.profile_search import SEARCHABLE_USER_TYPES, TEXT_WEIGHTS
+
+# collection -> indexes. Unique indexes back the find-then-insert duplicate checks.
+INDEXES = {
+    'users': [
+        IndexModel([('id', ASCENDING)], name='id_unique', unique=True),
+        IndexModel([('email', ASCENDING), ('user_type', ASCENDING)], name='email_user_type_unique', unique=True),
+        IndexModel([('user_type', ASCENDING), ('created_at', DESCENDING), ('id', DESCENDING)], name='user_type_page'),
+        IndexModel([('firm_id', ASCENDING), ('user_type', ASCENDING)], name='firm_id_user_type'),
+        # GET /lawyers/search: user_type (and specialization) equality, then the sort key with the id tiebreak.
+        # Other filters are residual on these; a filter-first index would force an in-memory sort of every match.
+        IndexModel([('user_type', ASCENDING), ('specialization', ASCENDING), ('experience_years', DESCENDING), ('id', ASCENDING)], name='lawyer_specialization_experience'),
+        IndexModel([('user_type', ASCENDING), ('specialization', ASCENDING), ('rating', DESCENDING), ('id', ASCENDING)], name='lawyer_specialization_rating'),
+        IndexModel([('user_type', ASCENDING), ('experience_years', DESCENDING), ('id', ASCENDING)], name='lawyer_experience'),
+        IndexModel([('user_type', ASCENDING), ('rating', DESCENDING), ('id', ASCENDING)], name='lawyer_rating'),
+        IndexModel([('user_type', ASCENDING), ('cases_won', DESCENDING), ('id', ASCENDING)], name='lawyer_cases_won'),
+        # Near searches; $geoNear needs the geo field first and user_type narrows the scan
+        IndexModel([('location', GEOSPHERE), ('user_type', ASCENDING)], name='location_2dsphere'),
+        # GET /search/profiles; Mongo allows a single text index per collection
+        IndexModel(
+            [(field, TEXT) for field in TEXT_WEIGHTS],
+            name='profile_text',
+            weights=TEXT_WEIGHTS,
+            default_language='english',
+            # users have a 'languages' list; keep Mongo from reading any field as the document language
+            language_override='text_language'
+        ),
+    ],
+    'cases': [
+        IndexModel([('id', ASCENDING)], name='id_unique', unique=True),
+        IndexModel([('user_id', ASCENDING), ('created_at', DESCENDING), ('id', DESCENDING)], name='user_id_page'),
+        IndexModel([('created_at', DESCENDING), ('id', DESCENDING)], name='page'),
+    ],
+    'documents': [
+        IndexModel([('user_id', ASCENDING), ('uploaded_at', DESCENDING), ('id', DESCENDING)], name='user_id_page'),
+        IndexModel(
+            [('user_id', ASCENDING), ('case_id', ASCENDING), ('uploaded_at', DESCENDING), ('id', DESCENDING)],
+            name='user_id_case_id_page'
+        ),
+    ],
+    'bookings': [
+        IndexModel([('id', ASCENDING)], name='id_unique', unique=True),
+        IndexModel([('client_id', ASCENDING), ('created_at', DESCENDING), ('id', DESCENDING)], name='client_id_page'),
+        IndexModel([('lawyer_id', ASCENDING), ('created_at', DESCENDING), ('id', DESCENDING)], name='lawyer_id_page'),
+    ],
+    'chat_history': [
+        IndexModel([('user_id', ASCENDING), ('timestamp', DESCENDING), ('id', DESCENDING)], name='user_id_page'),
+        # Retention scan for services.chat_archive
+        IndexModel([('timestamp', ASCENDING)], name='timestamp'),
+    ],
+    'chat_history_archive': [
+        IndexModel([('user_id', ASCENDING), ('timestamp', DESCENDING), ('id', DESCENDING)], name='user_id_page'),
+    ],
+    'profile_facets': [
+        IndexModel([('kind', ASCENDING), ('dimension', ASCENDING), ('count', DESCENDING), ('value', ASCENDING)], name='kind_dimension_count'),
+    ],
+    'chat_summaries': [
+        IndexModel([('user_id', ASCENDING)], name='user_id_unique', unique=True),
+    ],
+    'waitlist': [
+        IndexModel([('email', ASCENDING)], name='email_unique', unique=True),
+    ],
+    'lawyer_applications': [
+        IndexModel([('email', ASCENDING)], name='email_unique', unique=True),
+        IndexModel([('created_at', DESCENDING), ('_id', DESCENDING)], name='page'),
+        IndexModel([('status', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)], name='status_page'),
+    ],
+    'lawfirm_applications': [
+        IndexModel([('contact_email', ASCENDING)], name='contact_email_unique', unique=True),
+        IndexModel([('created_at', DESCENDING), ('_id', DESCENDING)], name='page'),
+        IndexModel([('status', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)], name='status_page'),
+    ],
+    'firm_lawyer_applications': [
+        IndexModel([('id', ASCENDING)], name='id_unique', unique=True),
+        IndexModel([('email', ASCENDING)], name='email_unique', unique=True),
+        IndexModel([('created_at', DESCENDING), ('id', DESCENDING)], name='page'),
+    ],
+    'firm_tasks': [
+        IndexModel([('id', ASCENDING)], name='id_unique', unique=True),
+        IndexModel([('assigned_to', ASCENDING), ('created_at', DESCENDING), ('id', DESCENDING)], name='assigned_to_page'),
+    ],
+    'firm_clients': [
+        IndexModel([('id', ASCENDING)], name='id_unique', unique=True),
+        IndexModel([('email', ASCENDING)], name='email'),
+        IndexModel([('law_firm_id', ASCENDING), ('created_at', DESCENDING), ('id', DESCENDING)], name='law_firm_id_page'),
+        IndexModel([('status', ASCENDING)], name='status'),
+    ],
+    'firm_client_applications': [
+        IndexModel([('id', ASCENDING)], name='id_unique', unique=True),
+        IndexModel([('email', ASCENDING), ('law_firm_id', ASCENDING)], name='email_law_firm_id'),
+        IndexModel([('law_firm_id', ASCENDING), ('status', ASCENDING)], name='law_firm_id_status'),
+        IndexModel([('created_at', DESCENDING), ('id', DESCENDING)], name='page'),
+    ],
+    'client_case_updates': [
+        IndexModel([('client_id', ASCENDING), ('created_at', DESCENDING)], name='client_id_created_at'),
+    ],
+}
+
+# Default keyset pagination order (services/pagination.py)
+PAGE = [('created_at', DESCENDING), ('id', DESCENDING)]
+
+# GET /lawyers/search base filter and default sort (services/lawyer_search.py)
+LAWYER_SEARCH = {'user_type': 'lawyer', 'is_active': {'$ne': False}}
+LAWYER_SEARCH_SORT = [('experience_years', DESCENDING), ('id', ASCENDING)]
+
+# (route, collection, filter, sort) for every indexed query the routes issue
+VERIFY_QUERIES = [
+    ('POST /auth/login', 'users', {'email': 'x@example.com', 'user_type': 'client'}, None),
+    ('GET /auth/me', 'users', {'id': 'x'}, None),
+    # is_active is a residual filter on user_type_page; deactivated profiles are few
+    ('GET /lawyers', 'users', {'user_type': 'lawyer', 'is_active': {'$ne': False}}, PAGE),
+    ('GET /lawfirms', 'users', {'user_type': 'law_firm', 'is_active': {'$ne': False}}, PAGE),
+    ('GET /lawyers/facets', 'profile_facets', {'kind': 'lawyer', 'count': {'$gt': 0}}, [('dimension', ASCENDING), ('count', DESCENDING), ('value', ASCENDING)]),
+    # Lawyer search filters as built by services.lawyer_search.build_search_query, with its sort
+    ('GET /lawyers/search', 'users', LAWYER_SEARCH, LAWYER_SEARCH_SORT),
+    ('GET /lawyers/search?sort=rating', 'users', LAWYER_SEARCH, [('rating', DESCENDING), ('id', ASCENDING)]),
+    ('GET /lawyers/search?sort=cases_won', 'users', LAWYER_SEARCH, [('cases_won', DESCENDING), ('id', ASCENDING)]),
+    ('GET /lawyers/search?specialization', 'users', {**LAWYER_SEARCH, 'specialization': 'x'}, LAWYER_SEARCH_SORT),
+    ('GET /lawyers/search?specialization&sort=rating', 'users', {**LAWYER_SEARCH, 'specialization': 'x'}, [('rating', DESCENDING), ('id', ASCENDING)]),
+    ('GET /lawyers/search?state&city', 'users', {**LAWYER_SEARCH, 'state': 'x', 'city': 'x'}, LAWYER_SEARCH_SORT),
+    ('GET /lawyers/search?court', 'users', {**LAWYER_SEARCH, 'court': 'x'}, LAWYER_SEARCH_SORT),
+    ('GET /lawyers/search?languages', 'users', {**LAWYER_SEARCH, 'languages': {'$all': ['x']}}, LAWYER_SEARCH_SORT),
+    ('GET /lawyers/search?fee', 'users', {**LAWYER_SEARCH, 'fee_min': {'$lte': 1}, 'fee_max': {'$gte': 1}}, LAWYER_SEARCH_SORT),
+    ('GET /lawyers/search?near', 'users', {
+        'location': {'$nearSphere': {'$geometry': {'type': 'Point', 'coordinates': [77.2, 28.6]}, '$maxDistance': 50000}},
+        'user_type': 'lawyer'
+    }, None),
+    ('GET /search/profiles', 'users', {'$text': {'$search': 'x'}, 'user_type': {'$in': SEARCHABLE_USER_TYPES}}, None),
+    ('GET /firm-lawyers/by-firm/{firm_id}', 'users', {'firm_id': 'x', 'user_type': 'firm_lawyer'}, None),
+    ('GET /cases (client)', 'cases', {'user_id': 'x'}, PAGE),
+    ('GET /cases (lawyer)', 'cases', {}, PAGE),
+    ('GET /cases/{case_id}', 'cases', {'id': 'x'}, None),
+    ('GET /documents', 'documents', {'user_id': 'x'}, [('uploaded_at', DESCENDING), ('id', DESCENDING)]),
+    ('GET /documents?case_id', 'documents', {'user_id': 'x', 'case_id': 'x'}, [('uploaded_at', DESCENDING), ('id', DESCENDING)]),
+    ('GET /bookings (client)', 'bookings', {'client_id': 'x'}, PAGE),
+    ('GET /bookings (lawyer)', 'bookings', {'lawyer_id': 'x'}, PAGE),
+    ('GET /chat/history', 'chat_history', {'user_id': 'x'}, [('timestamp', DESCENDING), ('id', DESCENDING)]),
+    ('GET /chat/history?tier=archive', 'chat_history_archive', {'user_id': 'x'}, [('timestamp', DESCENDING), ('id', DESCENDING)]),
+    ('chat archiving', 'chat_history', {'timestamp': {'$lt': 'x'}}, [('timestamp', ASCENDING)]),
+    ('POST /waitlist', 'waitlist', {'email': 'x@example.com'}, None),
+    ('POST /lawyers/applications', 'lawyer_applications', {'email': 'x@example.com'}, None),
+    ('GET /admin/lawyer-applications', 'lawyer_applications', {}, [('created_at', DESCENDING), ('_id', DESCENDING)]),
+    ('GET /admin/lawyer-applications?status', 'lawyer_applications', {'status': 'pending'}, [('created_at', DESCENDING), ('_id', DESCENDING)]),
+    ('POST /lawfirms/applications', 'lawfirm_applications', {'contact_email': 'x@example.com'}, None),
+    ('GET /admin/lawfirm-applications', 'lawfirm_applications', {}, [('created_at', DESCENDING), ('_id', DESCENDING)]),
+    ('GET /admin/lawfirm-applications?status', 'lawfirm_applications', {'status': 'pending'}, [('created_at', DESCENDING), ('_id', DESCENDING)]),
+    ('GET /firm-lawyers/applications', 'firm_lawyer_applications', {}, PAGE),
+    ('GET /firm-lawyers/tasks/by-lawyer/{id}', 'firm_tasks', {'assigned_to': 'x'}, PAGE),
+    ('GET /firm-lawyers/tasks/by-firm/{id}', 'firm_tasks', {'assigned_to': {'$in': ['x', 'y']}}, PAGE),
+    ('PUT /firm-lawyers/tasks/{id}/status', 'firm_tasks', {'id': 'x'}, None),
+    ('POST /firm-clients/login', 'firm_clients', {'email': 'x@example.com'}, None),
+    ('GET /firm-clients/{client_id}', 'firm_clients', {'id': 'x'}, None),
+    ('GET /firm-clients/firm/{id}/list', 'firm_clients', {'law_firm_id': 'x'}, PAGE),
+    ('GET /firm-clients/pending-approvals', 'firm_clients', {'status': 'pending_approval'}, None),
+    ('POST /firm-clients/applications', 'firm_client_applications', {'email': 'x@example.com', 'law_firm_id': 'x'}, None),
+    ('GET /firm-clients/applications/all', 'firm_client_applications', {}, PAGE),
+    ('GET /firm-clients/applications/firm/{id}', 'firm_client_applications', {'law_firm_id': 'x'}, None),
+    ('GET /firm-clients/{id}/case-updates', 'client_case_updates', {'client_id': 'x'}, [('created_at', DESCENDING)]),
+]
+
+
+async def ensure_indexes(database=None) -> dict:
+    """Create every index in the manifest; existing identical indexes are left alone"""
+    database = database if database is not None else db
+    results = {}
+    for collection, indexes in INDEXES.items():
+        try:
+            results[collection] = await database[collection].create_indexes(indexes)
+        except OperationFailure as e:
+            # e.g. duplicate data blocking a unique index - keep going with the rest
+            logging.error(f'Failed to create indexes on {collection}: {str(e)}')
+            results[collection] = []
+    return results
+
+
+def _plan_stages(plan: dict):
+    """Yield every stage name in an explain plan tree"""
+    yield plan.get('stage')
+    for key in ('inputStage', 'queryPlan'):
+        if key in plan:
+            yield from _plan_stages(plan[key])
+    for child in plan.get('inputStages', []):
+        yield from _plan_stages(child)
+
+
+async def verify_indexes(database=None) -> list:
+    """Explain every route query and return the ones that fall back to a COLLSCAN"""
+    database = database if database is not None else db
+    failures = []
+    for route, collection, query, sort in VERIFY_QUERIES:
+        find = {'find': collection, 'filter': query}
+        if sort:
+            find['sort'] = dict(sort)
+        explain = await database.command({'explain': find, 'verbosity': 'queryPlanner'})
+        stages = list(_plan_stages(explain['queryPlanner']['winningPlan']))
+        if 'COLLSCAN' in stages:
+            failures.append((route, collection, query))
+    return failures
+
+
+async def _main(command: str) -> int:
+    if command == 'apply':
+        results = await ensure_indexes()
+        for collection, names in results.items():
+            print(f"{collection}: {', '.join(names) if names else 'FAILED'}")
+        return 0 if all(results.values()) else 1
+
+    failures = await verify_indexes()
+    for route, collection, query in failures:
+        print(f"COLLSCAN: {route} -> {collection}.find({query})")
+    print(f"{len(VERIFY_QUERIES) - len(failures)}/{len(VERIFY_QUERIES)} route queries use an index")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Apply or verify MongoDB indexes')
+    parser.add_argument('command', choices=['apply', 'verify'])
+    sys.exit(asyncio.run(_main(parser.parse_args().command)))
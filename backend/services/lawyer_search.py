@@ -0,0 +1,183 @@
+"""
+Structured lawyer search: filters, sort keys and the fee bounds they rely on.
+
+Existing lawyers get numeric fee bounds with:
+
+    python -m services.lawyer_search backfill
+"""
+import argparse
+import asyncio
+import os
+import re
+import sys
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from bson import json_util
+from pymongo import UpdateOne
+
+from services.database import db
+
+# sort key -> (field, direction); id breaks ties so pages are stable
+SORT_KEYS = {
+    'experience': ('experience_years', -1),
+    'rating': ('rating', -1),
+    'cases_won': ('cases_won', -1),
+}
+DEFAULT_SORT = 'experience'
+
+SEARCH_PROJECTION = {'_id': 0, 'password': 0, 'password_hash': 0}
+
+# Total-count cache configuration from environment; a cached total may lag approvals by up to the TTL
+LAWYER_SEARCH_TOTAL_TTL_SECONDS = float(os.environ.get('LAWYER_SEARCH_TOTAL_TTL_SECONDS', 60))
+LAWYER_SEARCH_TOTAL_MAX_ENTRIES = int(os.environ.get('LAWYER_SEARCH_TOTAL_MAX_ENTRIES', 1000))
+
+# query key -> (expires_at, total), least recently used first
+_totals: "OrderedDict[str, tuple]" = OrderedDict()
+
+_stats = {
+    'total_cache_hits': 0,
+    'totals_from_page': 0,
+    'totals_counted': 0,
+}
+
+_AMOUNT = re.compile(r'\d[\d,]*(?:\.\d+)?\s*[kK]?')
+
+
+def _amount(text: str) -> int:
+    text = text.replace(',', '').strip()
+    if text[-1] in 'kK':
+        return int(float(text[:-1]) * 1000)
+    return int(float(text))
+
+
+def parse_fee_range(fee_range: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """Parse '₹5,000 - ₹15,000' style fee text into (fee_min, fee_max) rupees"""
+    if not fee_range:
+        return None, None
+    amounts = [_amount(match) for match in _AMOUNT.findall(fee_range)]
+    if not amounts:
+        return None, None
+    return min(amounts), max(amounts)
+
+
+def fee_bounds(fee_range: Optional[str]) -> dict:
+    """Fields to store next to fee_range so fee filters can use an index"""
+    fee_min, fee_max = parse_fee_range(fee_range)
+    return {'fee_min': fee_min, 'fee_max': fee_max}
+
+
+def build_search_query(
+    specialization: Optional[str] = None,
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+    court: Optional[str] = None,
+    languages: Optional[List[str]] = None,
+    min_experience: Optional[int] = None,
+    max_experience: Optional[int] = None,
+    fee_min: Optional[int] = None,
+    fee_max: Optional[int] = None,
+) -> dict:
+    """Build the users filter for a lawyer search"""
+    query = {'user_type': 'lawyer', 'is_active': {'$ne': False}}
+    for field, value in (('specialization', specialization), ('state', state), ('city', city), ('court', court)):
+        if value:
+            query[field] = value
+    if languages:
+        query['languages'] = {'$all': languages}
+    if min_experience is not None or max_experience is not None:
+        query['experience_years'] = {}
+        if min_experience is not None:
+            query['experience_years']['$gte'] = min_experience
+        if max_experience is not None:
+            query['experience_years']['$lte'] = max_experience
+    # Fee filters match lawyers whose range overlaps the requested one
+    if fee_max is not None:
+        query['fee_min'] = {'$lte': fee_max}
+    if fee_min is not None:
+        query['fee_max'] = {'$gte': fee_min}
+    return query
+
+
+def _cached_total(key: str) -> Optional[int]:
+    entry = _totals.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    _totals.move_to_end(key)
+    return entry[1]
+
+
+def _cache_total(key: str, total: int):
+    if LAWYER_SEARCH_TOTAL_TTL_SECONDS <= 0 or LAWYER_SEARCH_TOTAL_MAX_ENTRIES <= 0:
+        return
+    _totals[key] = (time.monotonic() + LAWYER_SEARCH_TOTAL_TTL_SECONDS, total)
+    _totals.move_to_end(key)
+    while len(_totals) > LAWYER_SEARCH_TOTAL_MAX_ENTRIES:
+        _totals.popitem(last=False)
+
+
+async def search_lawyers(query: dict, sort: str, page: int, limit: int) -> Tuple[List[dict], int]:
+    """
+    Get one page of matching lawyers and the total match count.
+
+    Filters other than specialization are residual on the lawyer_* indexes,
+    so counting them scans every lawyer; the total is taken from a short
+    page when possible and otherwise counted once per query and cached.
+    """
+    field, direction = SORT_KEYS[sort]
+    skip = (page - 1) * limit
+    # A plain find lets the sort walk a lawyer_* index instead of sorting every match in memory
+    lawyers = await (db.users.find(query, SEARCH_PROJECTION)
+                     .sort([(field, direction), ('id', 1)])
+                     .skip(skip)
+                     .limit(limit)
+                     .to_list(limit))
+
+    key = json_util.dumps(query, sort_keys=True)
+    if len(lawyers) < limit and (lawyers or page == 1):
+        # The last page: everything before it plus what it holds
+        total = skip + len(lawyers)
+        _stats['totals_from_page'] += 1
+    else:
+        total = _cached_total(key)
+        if total is not None:
+            _stats['total_cache_hits'] += 1
+            return lawyers, total
+        total = await db.users.count_documents(query)
+        _stats['totals_counted'] += 1
+    _cache_total(key, total)
+    return lawyers, total
+
+
+def get_lawyer_search_stats() -> dict:
+    """Get how lawyer search totals were served"""
+    return {
+        **_stats,
+        'cached_totals': len(_totals),
+        'total_ttl_seconds': LAWYER_SEARCH_TOTAL_TTL_SECONDS,
+    }
+
+
+async def backfill_fee_bounds(database=None, batch_size: int = 500) -> int:
+    """Store fee_min/fee_max on lawyers that have a fee_range but no bounds yet"""
+    database = database if database is not None else db
+    query = {'user_type': 'lawyer', 'fee_range': {'$type': 'string'}, 'fee_min': {'$exists': False}}
+    updated = 0
+    batch = []
+    async for user in database.users.find(query, {'_id': 1, 'fee_range': 1}):
+        batch.append(UpdateOne({'_id': user['_id']}, {'$set': fee_bounds(user['fee_range'])}))
+        if len(batch) >= batch_size:
+            updated += (await database.users.bulk_write(batch, ordered=False)).modified_count
+            batch = []
+    if batch:
+        updated += (await database.users.bulk_write(batch, ordered=False)).modified_count
+    return updated
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Lawyer search maintenance')
+    parser.add_argument('command', choices=['backfill'])
+    parser.parse_args()
+    print(f"Set fee bounds on {asyncio.run(backfill_fee_bounds())} lawyers")
+    sys.exit(0)
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException
+
+# Admission control configuration from environment
+LLM_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', 32))
+LLM_PER_USER_CONCURRENCY = int(os.environ.get('LLM_PER_USER_CONCURRENCY', 2))
+LLM_MAX_QUEUE = int(os.environ.get('LLM_MAX_QUEUE', 100))
+LLM_QUEUE_TIMEOUT_SECONDS = float(os.environ.get('LLM_QUEUE_TIMEOUT_SECONDS', 10))
+LLM_RETRY_AFTER = int(os.environ.get('LLM_RETRY_AFTER', 2))
+
+_global_slots = None
+# user key -> [semaphore, holders and waiters]; dropped once nobody references it
+_user_slots = {}
+
+# Limiter metrics
+_stats = {
+    'in_flight': 0,
+    'peak_in_flight': 0,
+    'queued': 0,
+    'peak_queued': 0,
+    'admitted': 0,
+    'rejected_queue_full': 0,
+    'rejected_timeout': 0,
+    'total_wait_ms': 0.0,
+    'max_wait_ms': 0.0,
+}
+
+
+def _get_global_slots() -> asyncio.Semaphore:
+    global _global_slots
+    if _global_slots is None:
+        _global_slots = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return _global_slots
+
+
+def _reject(reason: str, detail: str):
+    _stats[reason] += 1
+    logging.warning('LLM admission rejected (%s): %d queued, %d in flight', reason, _stats['queued'], _stats['in_flight'])
+    raise HTTPException(
+        status_code=429,
+        detail=detail,
+        headers={'Retry-After': str(LLM_RETRY_AFTER)}
+    )
+
+
+@asynccontextmanager
+async def llm_slot(user_key: str):
+    """
+    Hold one per-user and one global LLM slot for the duration of the block.
+
+    Callers that cannot start immediately wait in a bounded queue; a full
+    queue or a wait past the deadline is rejected with 429 and Retry-After.
+    """
+    global_slots = _get_global_slots()
+    user_entry = _user_slots.get(user_key)
+    if user_entry is None:
+        user_entry = _user_slots[user_key] = [asyncio.Semaphore(LLM_PER_USER_CONCURRENCY), 0]
+    user_entry[1] += 1
+
+    try:
+        must_wait = user_entry[0].locked() or global_slots.locked()
+        if must_wait and _stats['queued'] >= LLM_MAX_QUEUE:
+            _reject('rejected_queue_full', 'Assistant is busy, please try again shortly')
+
+        started = time.perf_counter()
+        _stats['queued'] += 1
+        _stats['peak_queued'] = max(_stats['peak_queued'], _stats['queued'])
+        acquired_user = False
+        try:
+            async with asyncio.timeout(LLM_QUEUE_TIMEOUT_SECONDS):
+                await user_entry[0].acquire()
+                acquired_user = True
+                await global_slots.acquire()
+        except TimeoutError:
+            if acquired_user:
+                user_entry[0].release()
+            _reject('rejected_timeout', 'Assistant is busy, please try again shortly')
+        except BaseException:
+            if acquired_user:
+                user_entry[0].release()
+            raise
+        finally:
+            _stats['queued'] -= 1
+
+        wait_ms = (time.perf_counter() - started) * 1000
+        _stats['admitted'] += 1
+        _stats['total_wait_ms'] += wait_ms
+        _stats['max_wait_ms'] = max(_stats['max_wait_ms'], wait_ms)
+        _stats['in_flight'] += 1
+        _stats['peak_in_flight'] = max(_stats['peak_in_flight'], _stats['in_flight'])
+        try:
+            yield
+        finally:
+            _stats['in_flight'] -= 1
+            global_slots.release()
+            user_entry[0].release()
+    finally:
+        user_entry[1] -= 1
+        if user_entry[1] == 0 and _user_slots.get(user_key) is user_entry:
+            del _user_slots[user_key]
+
+
+def get_llm_limiter_stats() -> dict:
+    """Get queue depth, wait time and rejection counters for LLM admission"""
+    return {
+        **_stats,
+        'avg_wait_ms': round(_stats['total_wait_ms'] / _stats['admitted'], 2) if _stats['admitted'] else 0,
+        'active_users': len(_user_slots),
+        'max_concurrency': LLM_MAX_CONCURRENCY,
+        'per_user_concurrency': LLM_PER_USER_CONCURRENCY,
+        'max_queue': LLM_MAX_QUEUE,
+        'queue_timeout_seconds': LLM_QUEUE_TIMEOUT_SECONDS,
+    }
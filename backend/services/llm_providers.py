@@ -0,0 +1,177 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+
+# Provider selection from environment: "emergent" (default) or "stub"
+LLM_PROVIDER = os.environ.get('LLM_PROVIDER', 'emergent')
+
+# Stub provider configuration from environment
+LLM_STUB_LATENCY_MS = float(os.environ.get('LLM_STUB_LATENCY_MS', 400))  # median per turn
+LLM_STUB_LATENCY_SIGMA = float(os.environ.get('LLM_STUB_LATENCY_SIGMA', 0.5))  # log-normal spread
+LLM_STUB_SETUP_MS = float(os.environ.get('LLM_STUB_SETUP_MS', 0))  # first send on a new client
+LLM_STUB_ERROR_RATE = float(os.environ.get('LLM_STUB_ERROR_RATE', 0))
+LLM_STUB_STREAMING = os.environ.get('LLM_STUB_STREAMING', 'true').lower() == 'true'
+LLM_STUB_CHUNK_CHARS = int(os.environ.get('LLM_STUB_CHUNK_CHARS', 24))
+LLM_STUB_SEED = int(os.environ.get('LLM_STUB_SEED', 42))
+
+# litellm routing for the Emergent universal key, as LlmChat sets it up
+EMERGENT_LLM_MODEL = os.environ.get('EMERGENT_LLM_MODEL', 'gemini/gemini-3-flash-preview')
+EMERGENT_LLM_API_BASE = os.environ.get('EMERGENT_LLM_API_BASE', 'https://integrations.emergentagent.com/llm')
+
+
+class TextMessage:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class LiteLLMChatClient:
+    """One conversation over litellm, with token streaming; history only grows on success"""
+
+    def __init__(self, prompt: str, **params):
+        self._params = params
+        self.messages = [{'role': 'system', 'content': prompt}]
+
+    def reset_history(self):
+        """Forget every turn, keeping the system prompt"""
+        self.messages = self.messages[:1]
+
+    async def send_message(self, message: TextMessage) -> str:
+        import litellm
+        messages = self.messages + [{'role': 'user', 'content': message.text}]
+        response = await litellm.acompletion(messages=messages, **self._params)
+        text = response.choices[0].message.content or ''
+        self.messages = messages + [{'role': 'assistant', 'content': text}]
+        return text
+
+    async def stream_message(self, message: TextMessage):
+        import litellm
+        messages = self.messages + [{'role': 'user', 'content': message.text}]
+        chunks = []
+        async for part in await litellm.acompletion(messages=messages, stream=True, **self._params):
+            text = part.choices[0].delta.content if part.choices else None
+            if text:
+                chunks.append(text)
+                yield text
+        self.messages = messages + [{'role': 'assistant', 'content': ''.join(chunks)}]
+
+
+class EmergentProvider:
+    """
+    Gemini through the Emergent universal key.
+
+    Calls litellm directly rather than through emergentintegrations' LlmChat,
+    which has no token streaming.
+    """
+    name = 'emergent'
+
+    def build_client(self, session_id: str, prompt: str):
+        return LiteLLMChatClient(
+            prompt,
+            model=EMERGENT_LLM_MODEL,
+            api_key=os.environ.get('EMERGENT_LLM_KEY'),
+            api_base=EMERGENT_LLM_API_BASE,
+            custom_llm_provider='openai'
+        )
+
+    def user_message(self, text: str):
+        return TextMessage(text)
+
+
+class StubProviderError(Exception):
+    """Injected upstream failure; looks like a provider 503 so it is retried"""
+    status_code = 503
+
+
+STUB_CARD_TYPES = ['info', 'advice', 'action', 'warning']
+
+
+def stub_response(text: str) -> str:
+    """Deterministic card JSON for a message"""
+    digest = hashlib.sha256(text.encode('utf-8')).digest()
+    cards = [{'type': 'greeting', 'title': 'Namaste', 'content': f'You asked: {text[:80]}'}]
+    for i in range(1 + digest[0] % 3):
+        card_type = STUB_CARD_TYPES[digest[i + 1] % len(STUB_CARD_TYPES)]
+        cards.append({
+            'type': card_type,
+            'title': f'{card_type.title()} {i + 1}',
+            'content': f'Stub {card_type} #{digest[i + 4]} for this question.'
+        })
+    return json.dumps({'cards': cards}, ensure_ascii=False)
+
+
+class StubChatClient:
+    """Offline stand-in for a provider chat client with a seeded latency distribution"""
+
+    def __init__(self, rng: random.Random):
+        self._rng = rng
+        self._connected = False
+
+    async def _wait(self, fraction: float = 1.0):
+        delay = LLM_STUB_LATENCY_MS * self._rng.lognormvariate(0, LLM_STUB_LATENCY_SIGMA) * fraction
+        if not self._connected:
+            delay += LLM_STUB_SETUP_MS
+            self._connected = True
+        await asyncio.sleep(delay / 1000)
+        if LLM_STUB_ERROR_RATE and self._rng.random() < LLM_STUB_ERROR_RATE:
+            raise StubProviderError('Stub provider unavailable')
+
+    def reset_history(self):
+        """Stub turns carry no history"""
+
+    async def send_message(self, message: TextMessage) -> str:
+        await self._wait()
+        return stub_response(message.text)
+
+
+class StubStreamingChatClient(StubChatClient):
+    """Stub client that also streams its answer in fixed-size chunks"""
+
+    async def stream_message(self, message: TextMessage):
+        text = stub_response(message.text)
+        chunks = [text[i:i + LLM_STUB_CHUNK_CHARS] for i in range(0, len(text), LLM_STUB_CHUNK_CHARS)]
+        # Time to first token is a third of the turn latency, the rest is spread over the chunks
+        await self._wait(1 / 3)
+        for chunk in chunks:
+            yield chunk
+            await asyncio.sleep(LLM_STUB_LATENCY_MS * 2 / 3 / len(chunks) / 1000)
+
+
+class StubProvider:
+    """Local provider returning valid card JSON, for load tests and offline development"""
+    name = 'stub'
+
+    def __init__(self, seed: int = LLM_STUB_SEED):
+        self._rng = random.Random(seed)
+
+    def build_client(self, session_id: str, prompt: str):
+        client_class = StubStreamingChatClient if LLM_STUB_STREAMING else StubChatClient
+        return client_class(self._rng)
+
+    def user_message(self, text: str):
+        return TextMessage(text)
+
+
+PROVIDERS = {
+    'emergent': EmergentProvider,
+    'stub': StubProvider,
+}
+
+_provider = None
+
+
+def get_provider():
+    """Get the configured LLM provider"""
+    global _provider
+    if _provider is None:
+        if LLM_PROVIDER not in PROVIDERS:
+            raise ValueError(f"Unknown LLM_PROVIDER '{LLM_PROVIDER}', expected one of {sorted(PROVIDERS)}")
+        _provider = PROVIDERS[LLM_PROVIDER]()
+    return _provider
+
+
+def set_provider(provider):
+    """Replace the active provider (benchmarks and tests)"""
+    global _provider
+    _provider = provider
@@ -0,0 +1,119 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+
+from bson import ObjectId, json_util
+from fastapi import HTTPException, Query, Response
+
+# What most list endpoints returned before pagination; the larger ones keep theirs via page_params
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+# Sort and tie-breaker values a cursor may carry; anything else (e.g. an operator dict) is rejected
+CURSOR_VALUE_TYPES = (str, int, float, datetime, ObjectId)
+
+
+class PageParams:
+    """Query parameters shared by every paginated list endpoint"""
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None, description='Opaque cursor from a previous page')
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+
+def page_params(default_limit: int):
+    """PageParams dependency for a list that used to return up to default_limit items in one response"""
+    def dependency(
+        limit: int = Query(default_limit, ge=1, le=max(MAX_PAGE_SIZE, default_limit)),
+        cursor: Optional[str] = Query(None, description='Opaque cursor from a previous page')
+    ) -> PageParams:
+        return PageParams(limit=limit, cursor=cursor)
+    return dependency
+
+
+def encode_cursor(sort_value, tie_value) -> str:
+    """Encode the last (sort, tie-breaker) pair of a page as an opaque cursor"""
+    raw = json_util.dumps([sort_value, tie_value], json_options=json_util.RELAXED_JSON_OPTIONS)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def _is_cursor_value(value) -> bool:
+    return isinstance(value, CURSOR_VALUE_TYPES) and not isinstance(value, bool)
+
+
+def decode_cursor(cursor: str) -> Tuple:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        values = json_util.loads(
+            base64.urlsafe_b64decode(cursor.encode('ascii')),
+            json_options=json_util.RELAXED_JSON_OPTIONS
+        )
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail='Invalid cursor')
+    if not isinstance(values, list) or len(values) != 2:
+        raise HTTPException(status_code=400, detail='Invalid cursor')
+    sort_value, tie_value = values
+    # Both go straight into the next page's filter; a missing sort field encodes as None
+    if not _is_cursor_value(tie_value) or not (sort_value is None or _is_cursor_value(sort_value)):
+        raise HTTPException(status_code=400, detail='Invalid cursor')
+    return sort_value, tie_value
+
+
+def _after(sort_field: str, tie_field: str, sort_value, tie_value) -> dict:
+    """Filter for documents after the cursor in (sort_field, tie_field) descending order"""
+    if sort_value is None:
+        # Documents missing the sort field come last, ordered by tie_field alone
+        return {sort_field: None, tie_field: {'$lt': tie_value}}
+    return {'$or': [
+        {sort_field: {'$lt': sort_value}},
+        {sort_field: sort_value, tie_field: {'$lt': tie_value}},
+        {sort_field: None},
+    ]}
+
+
+async def paginate(
+    collection,
+    query: dict,
+    page: PageParams,
+    projection: Optional[dict] = None,
+    sort_field: str = 'created_at',
+    tie_field: str = 'id'
+) -> Tuple[list, Optional[str]]:
+    """
+    Fetch one page of a keyset-paginated query, newest first.
+
+    Returns the page and the cursor for the next one (None on the last page).
+    Each query should be backed by a compound index ending in
+    (sort_field, tie_field) so a page costs the same at any depth.
+    """
+    if page.cursor:
+        query = {'$and': [query, _after(sort_field, tie_field, *decode_cursor(page.cursor))]}
+
+    if projection is not None:
+        # The cursor needs both sort keys, so never project them away
+        projection = {k: v for k, v in projection.items() if k not in (sort_field, tie_field)}
+        if any(projection.values()):
+            projection.update({sort_field: 1, tie_field: 1})
+
+    items = await collection.find(query, projection).sort(
+        [(sort_field, -1), (tie_field, -1)]
+    ).limit(page.limit + 1).to_list(page.limit + 1)
+
+    next_cursor = None
+    if len(items) > page.limit:
+        items = items[:page.limit]
+        last = items[-1]
+        next_cursor = encode_cursor(last.get(sort_field), last.get(tie_field))
+    return items, next_cursor
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    """Expose the next-page cursor on list endpoints whose body is a bare list"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException
+
+from services.auth import hash_password, verify_password
+
+# Pool configuration from environment
+PASSWORD_POOL_KIND = os.environ.get('PASSWORD_POOL_KIND', 'thread')  # thread or process
+PASSWORD_POOL_WORKERS = int(os.environ.get('PASSWORD_POOL_WORKERS', min(4, os.cpu_count() or 1)))
+PASSWORD_POOL_MAX_PENDING = int(os.environ.get('PASSWORD_POOL_MAX_PENDING', PASSWORD_POOL_WORKERS * 8))
+PASSWORD_POOL_RETRY_AFTER = int(os.environ.get('PASSWORD_POOL_RETRY_AFTER', 1))
+
+_executor: Optional[Executor] = None
+
+# Pool metrics
+_stats = {
+    'pending': 0,
+    'peak_pending': 0,
+    'completed': 0,
+    'rejected': 0,
+    'total_queue_ms': 0.0,
+    'total_run_ms': 0.0,
+}
+
+
+def _get_executor() -> Executor:
+    """Create the worker pool on first use"""
+    global _executor
+    if _executor is None:
+        if PASSWORD_POOL_KIND == 'process':
+            _executor = ProcessPoolExecutor(max_workers=PASSWORD_POOL_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=PASSWORD_POOL_WORKERS,
+                thread_name_prefix='password'
+            )
+    return _executor
+
+
+def _timed(func, submitted_at: float, *args):
+    """Run func in a worker and report how long it queued and ran"""
+    started_at = time.perf_counter()
+    result = func(*args)
+    return result, started_at - submitted_at, time.perf_counter() - started_at
+
+
+async def _run(func, *args):
+    """Run a bcrypt call on the pool, rejecting with 503 when saturated"""
+    if _stats['pending'] >= PASSWORD_POOL_MAX_PENDING:
+        _stats['rejected'] += 1
+        logging.warning('Password pool saturated: %d pending', _stats['pending'])
+        raise HTTPException(
+            status_code=503,
+            detail='Server is busy, please try again shortly',
+            headers={'Retry-After': str(PASSWORD_POOL_RETRY_AFTER)}
+        )
+
+    _stats['pending'] += 1
+    _stats['peak_pending'] = max(_stats['peak_pending'], _stats['pending'])
+    try:
+        loop = asyncio.get_running_loop()
+        result, queued, ran = await loop.run_in_executor(
+            _get_executor(), _timed, func, time.perf_counter(), *args
+        )
+    finally:
+        _stats['pending'] -= 1
+
+    _stats['completed'] += 1
+    _stats['total_queue_ms'] += queued * 1000
+    _stats['total_run_ms'] += ran * 1000
+    return result
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password without blocking the event loop"""
+    return await _run(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    """Verify a password against its hash without blocking the event loop"""
+    return await _run(verify_password, password, hashed)
+
+
+def get_password_pool_stats() -> dict:
+    """Get queue depth and timing metrics for the password pool"""
+    completed = _stats['completed']
+    return {
+        'kind': PASSWORD_POOL_KIND,
+        'workers': PASSWORD_POOL_WORKERS,
+        'max_pending': PASSWORD_POOL_MAX_PENDING,
+        'pending': _stats['pending'],
+        'peak_pending': _stats['peak_pending'],
+        'completed': completed,
+        'rejected': _stats['rejected'],
+        'avg_queue_ms': round(_stats['total_queue_ms'] / completed, 2) if completed else 0,
+        'avg_run_ms': round(_stats['total_run_ms'] / completed, 2) if completed else 0,
+    }
+
+
+def shutdown_password_pool():
+    """Shut down the worker pool"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
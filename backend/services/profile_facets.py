@@ -0,0 +1,192 @@
+"""
+Facet counts for the lawyer and law firm browse pages.
+
+Counts live in the profile_facets summary collection, one document per
+(kind, dimension, value). Approvals and (de)activations adjust them with
+$inc; a full rebuild is a single $facet aggregation over users, run lazily
+when a kind has no counts yet, or from the CLI:
+
+    python -m services.profile_facets rebuild
+
+A rebuild replaces documents in place, so readers never see an empty kind.
+Values adjusted in this process while a rebuild runs are recounted from users
+once it has written; adjustments made by other processes during a rebuild
+can still be overwritten, and are corrected by the next rebuild.
+"""
+import argparse
+import asyncio
+import re
+import sys
+from datetime import datetime, timezone
+
+from pymongo import DeleteMany, ReplaceOne, UpdateOne
+
+from services.database import db
+
+# kind -> (user_type, facet dimensions); array fields count once per element
+FACET_KINDS = {
+    'lawyer': ('lawyer', ['specialization', 'city', 'state', 'court', 'languages']),
+    'law_firm': ('law_firm', ['practice_areas', 'city', 'state']),
+}
+KIND_BY_USER_TYPE = {user_type: kind for kind, (user_type, _) in FACET_KINDS.items()}
+
+# Profiles counted in the facets: listed and not deactivated
+ACTIVE = {'is_active': {'$ne': False}}
+
+# Written by a rebuild; until it exists a kind's counts are not maintained
+BUILT_DIMENSION = '_built'
+
+
+_rebuild_locks = {kind: asyncio.Lock() for kind in FACET_KINDS}
+# kind -> {(dimension, value)} adjusted while that kind's rebuild runs; None when not rebuilding
+_touched = {kind: None for kind in FACET_KINDS}
+
+
+def _built_marker(kind: str) -> str:
+    return f'{kind}:{BUILT_DIMENSION}'
+
+
+def _facet_values(profile: dict, dimension: str) -> set:
+    value = profile.get(dimension)
+    values = value if isinstance(value, list) else [value]
+    return {v.strip() for v in values if isinstance(v, str) and v.strip()}
+
+
+async def adjust_profile_facets(profile: dict, delta: int):
+    """Add (delta=1) or remove (delta=-1) one profile's values from its facet counts"""
+    kind = KIND_BY_USER_TYPE.get(profile.get('user_type'))
+    if kind is None:
+        return
+    if _touched[kind] is not None:
+        # The running rebuild may or may not have seen this change; it recounts these values when done
+        _touched[kind].update(
+            (dimension, value) for dimension in FACET_KINDS[kind][1] for value in _facet_values(profile, dimension)
+        )
+        return
+    if await db.profile_facets.find_one({'_id': _built_marker(kind)}, {'_id': 1}) is None:
+        # Not built yet: the first read counts this profile anyway
+        return
+    updates = [
+        UpdateOne(
+            {'_id': f'{kind}:{dimension}:{value}'},
+            {
+                '$inc': {'count': delta},
+                '$setOnInsert': {'kind': kind, 'dimension': dimension, 'value': value}
+            },
+            upsert=True
+        )
+        for dimension in FACET_KINDS[kind][1]
+        for value in _facet_values(profile, dimension)
+    ]
+    if updates:
+        await db.profile_facets.bulk_write(updates, ordered=False)
+
+
+def _facet_doc(kind: str, dimension: str, value: str, count: int, rebuilt_at: datetime) -> dict:
+    return {
+        '_id': f'{kind}:{dimension}:{value}', 'kind': kind, 'dimension': dimension, 'value': value,
+        'count': count, 'rebuilt_at': rebuilt_at
+    }
+
+
+async def _count_facets(database, kind: str) -> dict:
+    """Count every (dimension, value) of a kind in one aggregation; returns {(dimension, value): count}"""
+    user_type, dimensions = FACET_KINDS[kind]
+    facets = {}
+    for dimension in dimensions:
+        facets[dimension] = [
+            {'$unwind': f'${dimension}'},
+            {'$match': {dimension: {'$type': 'string'}}},
+            # One row per (profile, value), so a value repeated in one profile counts once, as in $inc updates
+            {'$group': {'_id': {'profile': '$_id', 'value': {'$trim': {'input': f'${dimension}'}}}}},
+            {'$group': {'_id': '$_id.value', 'count': {'$sum': 1}}},
+        ]
+    result = await database.users.aggregate([
+        {'$match': {'user_type': user_type, **ACTIVE}},
+        {'$facet': facets},
+    ]).to_list(1)
+
+    counts = {}
+    for dimension, rows in (result[0] if result else {}).items():
+        for row in rows:
+            if row['_id']:
+                counts[(dimension, row['_id'])] = row['count']
+    return counts
+
+
+async def _recount(database, kind: str, dimension: str, value: str) -> int:
+    """Count one facet value straight from users"""
+    user_type = FACET_KINDS[kind][0]
+    pattern = re.compile(rf'^\s*{re.escape(value)}\s*$')
+    return await database.users.count_documents({'user_type': user_type, **ACTIVE, dimension: pattern})
+
+
+async def rebuild_profile_facets(kind: str, database=None) -> int:
+    """Recount one kind's facets from users with a single aggregation"""
+    async with _rebuild_locks[kind]:
+        return await _rebuild(kind, database if database is not None else db)
+
+
+async def _rebuild(kind: str, database) -> int:
+    """Rebuild one kind's counts; callers hold its rebuild lock"""
+    _touched[kind] = set()
+    try:
+        counts = await _count_facets(database, kind)
+        rebuilt_at = datetime.now(timezone.utc)
+        docs = [_facet_doc(kind, dimension, value, count, rebuilt_at) for (dimension, value), count in counts.items()]
+        docs.append({
+            '_id': _built_marker(kind), 'kind': kind, 'dimension': BUILT_DIMENSION, 'value': None,
+            'count': 0, 'rebuilt_at': rebuilt_at
+        })
+        # Replace in place and drop only values that no longer exist, so readers always see a full set
+        writes = [ReplaceOne({'_id': doc['_id']}, doc, upsert=True) for doc in docs]
+        writes.append(DeleteMany({'kind': kind, '_id': {'$nin': [doc['_id'] for doc in docs]}}))
+        await database.profile_facets.bulk_write(writes, ordered=True)
+
+        # Adjustments made meanwhile were skipped; set those values from users now
+        while _touched[kind]:
+            dimension, value = _touched[kind].pop()
+            count = await _recount(database, kind, dimension, value)
+            await database.profile_facets.replace_one(
+                {'_id': f'{kind}:{dimension}:{value}'},
+                _facet_doc(kind, dimension, value, count, datetime.now(timezone.utc)),
+                upsert=True
+            )
+    finally:
+        _touched[kind] = None
+    return len(counts)
+
+
+async def _facet_rows(kind: str) -> list:
+    return await db.profile_facets.find(
+        {'kind': kind, 'count': {'$gt': 0}}, {'_id': 0, 'dimension': 1, 'value': 1, 'count': 1}
+    ).sort([('dimension', 1), ('count', -1), ('value', 1)]).to_list(None)
+
+
+async def get_profile_facets(kind: str) -> dict:
+    """Get {dimension: [{value, count}]} for a kind, most common first"""
+    rows = await _facet_rows(kind)
+    if not rows and await db.profile_facets.find_one({'_id': _built_marker(kind)}, {'_id': 1}) is None:
+        # Nothing maintained yet for this kind: build it once, however many reads arrive cold
+        async with _rebuild_locks[kind]:
+            if await db.profile_facets.find_one({'_id': _built_marker(kind)}, {'_id': 1}) is None:
+                await _rebuild(kind, db)
+        rows = await _facet_rows(kind)
+
+    facets = {dimension: [] for dimension in FACET_KINDS[kind][1]}
+    for row in rows:
+        facets.setdefault(row['dimension'], []).append({'value': row['value'], 'count': row['count']})
+    return facets
+
+
+async def _main() -> int:
+    for kind in FACET_KINDS:
+        print(f"{kind}: {await rebuild_profile_facets(kind)} facet values")
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Maintain browse page facet counts')
+    parser.add_argument('command', choices=['rebuild'])
+    parser.parse_args()
+    sys.exit(asyncio.run(_main()))
@@ -0,0 +1,103 @@
+import html
+import re
+from typing import List, Optional
+
+from services.database import db
+
+# Profile types covered by free-text search
+SEARCHABLE_USER_TYPES = ['lawyer', 'firm_lawyer', 'law_firm']
+
+# field -> weight in the users text index (services.indexes); names and practice areas outrank long-form text
+TEXT_WEIGHTS = {
+    'full_name': 10,
+    'firm_name': 10,
+    'specialization': 8,
+    'practice_areas': 8,
+    'city': 6,
+    'court': 4,
+    'state': 3,
+    'languages': 3,
+    'bio': 2,
+    'description': 2,
+    'education': 1,
+}
+
+RESULT_PROJECTION = {
+    '_id': 0, 'id': 1, 'full_name': 1, 'firm_name': 1, 'user_type': 1, 'specialization': 1,
+    'practice_areas': 1, 'city': 1, 'state': 1, 'court': 1, 'languages': 1,
+    'experience_years': 1, 'rating': 1, 'fee_range': 1, 'photo': 1,
+}
+
+SNIPPET_CHARS = 60
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def query_terms(q: str) -> List[str]:
+    """Lowercased search terms, as Mongo's text search will see them"""
+    return [term for term in (match.lower() for match in _WORD.findall(q)) if len(term) > 1]
+
+
+def _term_pattern(terms: List[str]) -> Optional[re.Pattern]:
+    if not terms:
+        return None
+    # Match word starts so 'dispute' also highlights 'disputes' (the index stems both)
+    stems = sorted({term[:max(4, len(term) - 2)] for term in terms}, key=len, reverse=True)
+    return re.compile(r'\b(' + '|'.join(re.escape(stem) for stem in stems) + r')\w*', re.IGNORECASE)
+
+
+def _snippet(text: str, pattern: re.Pattern) -> Optional[str]:
+    """Escape text and wrap matches in <mark>, trimmed to a window around the first match"""
+    first = pattern.search(text)
+    if not first:
+        return None
+    start = max(0, first.start() - SNIPPET_CHARS)
+    end = min(len(text), first.end() + SNIPPET_CHARS)
+    window = text[start:end]
+
+    parts, last = [], 0
+    for match in pattern.finditer(window):
+        parts.append(html.escape(window[last:match.start()]))
+        parts.append(f'<mark>{html.escape(match.group(0))}</mark>')
+        last = match.end()
+    parts.append(html.escape(window[last:]))
+    return ('…' if start > 0 else '') + ''.join(parts) + ('…' if end < len(text) else '')
+
+
+def highlight(profile: dict, terms: List[str]) -> dict:
+    """Get {field: snippet} for every text field matching the query terms"""
+    pattern = _term_pattern(terms)
+    if pattern is None:
+        return {}
+    highlights = {}
+    for field in TEXT_WEIGHTS:
+        value = profile.get(field)
+        text = ', '.join(v for v in value if isinstance(v, str)) if isinstance(value, list) else value
+        if isinstance(text, str):
+            snippet = _snippet(text, pattern)
+            if snippet:
+                highlights[field] = snippet
+    return highlights
+
+
+async def search_profiles(q: str, user_type: Optional[str] = None, limit: int = 20) -> List[dict]:
+    """Rank lawyer, firm lawyer and law firm profiles against free text"""
+    query = {
+        '$text': {'$search': q},
+        'user_type': user_type if user_type else {'$in': SEARCHABLE_USER_TYPES},
+        'is_active': {'$ne': False},
+    }
+    # Long-form fields are fetched for highlighting, then dropped from the result
+    projection = {**RESULT_PROJECTION, 'bio': 1, 'description': 1, 'education': 1, 'score': {'$meta': 'textScore'}}
+    profiles = await db.users.find(query, projection).sort(
+        [('score', {'$meta': 'textScore'}), ('rating', -1)]
+    ).limit(limit).to_list(limit)
+
+    terms = query_terms(q)
+    results = []
+    for profile in profiles:
+        highlights = highlight(profile, terms)
+        result = {key: value for key, value in profile.items() if key in RESULT_PROJECTION}
+        result['score'] = round(profile['score'], 4)
+        result['highlights'] = highlights
+        results.append(result)
+    return results
@@ -0,0 +1,149 @@
+import asyncio
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+# Cache configuration from environment
+RESPONSE_CACHE_TTL_SECONDS = float(os.environ.get('RESPONSE_CACHE_TTL_SECONDS', 3600))
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+
+_WHITESPACE = re.compile(r'\s+')
+_TRAILING_PUNCTUATION = re.compile(r'[\s?.!।,;:]+$')
+
+# cache key -> (expires_at, response, size in bytes), least recently used first
+_entries: "OrderedDict[str, tuple]" = OrderedDict()
+# cache key -> future of the upstream call currently in flight
+_in_flight = {}
+_bytes = 0
+
+_stats = {
+    'hits': 0,
+    'misses': 0,
+    'coalesced': 0,
+    'expired': 0,
+    'evictions': 0,
+    'upstream_errors': 0,
+    'upstream_ms_total': 0.0,
+}
+
+
+def normalize_message(message: str) -> str:
+    """Fold case, whitespace and trailing punctuation so near-identical questions share a key"""
+    text = _WHITESPACE.sub(' ', message.casefold()).strip()
+    return _TRAILING_PUNCTUATION.sub('', text)
+
+
+def cache_key(message: str, prompt: str) -> str:
+    """Build the cache key from the normalized message and the system prompt hash"""
+    prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+    return f"{prompt_hash}:{normalize_message(message)}"
+
+
+def _drop(key: str):
+    global _bytes
+    _, _, size = _entries.pop(key)
+    _bytes -= size
+
+
+def _lookup(key: str):
+    entry = _entries.get(key)
+    if entry is None:
+        return None
+    expires_at, response, _ = entry
+    if expires_at <= time.monotonic():
+        _drop(key)
+        _stats['expired'] += 1
+        return None
+    _entries.move_to_end(key)
+    return response
+
+
+def _store(key: str, response: str):
+    """Store a response, evicting least recently used entries past the byte cap"""
+    global _bytes
+    size = len(key.encode('utf-8')) + len(response.encode('utf-8'))
+    if RESPONSE_CACHE_TTL_SECONDS <= 0 or size > RESPONSE_CACHE_MAX_BYTES:
+        return
+    if key in _entries:
+        _drop(key)
+    _entries[key] = (time.monotonic() + RESPONSE_CACHE_TTL_SECONDS, response, size)
+    _bytes += size
+    while _bytes > RESPONSE_CACHE_MAX_BYTES:
+        _drop(next(iter(_entries)))
+        _stats['evictions'] += 1
+
+
+async def get_or_fetch_response(message: str, prompt: str, fetch: Callable[[], Awaitable[str]]) -> str:
+    """
+    Return a cached answer for a first-turn question, or call fetch() once.
+
+    Concurrent callers with the same key wait on the single upstream call
+    instead of issuing their own.
+    """
+    key = cache_key(message, prompt)
+    response = _lookup(key)
+    if response is not None:
+        _stats['hits'] += 1
+        return response
+
+    pending = _in_flight.get(key)
+    if pending is not None:
+        _stats['coalesced'] += 1
+        return await asyncio.shield(pending)
+
+    _stats['misses'] += 1
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = future
+    started = time.perf_counter()
+    try:
+        response = await fetch()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        _stats['upstream_errors'] += 1
+        future.set_exception(e)
+        # Mark the exception as retrieved when nobody else was waiting on it
+        future.exception()
+        raise
+    finally:
+        _in_flight.pop(key, None)
+
+    _stats['upstream_ms_total'] += (time.perf_counter() - started) * 1000
+    _store(key, response)
+    future.set_result(response)
+    return response
+
+
+def clear_response_cache():
+    """Drop every cached response"""
+    global _bytes
+    _entries.clear()
+    _bytes = 0
+
+
+def get_response_cache_stats() -> dict:
+    """Get hit ratio and estimated upstream savings for the response cache"""
+    served = _stats['hits'] + _stats['coalesced']
+    lookups = served + _stats['misses']
+    upstream_calls = _stats['misses'] - _stats['upstream_errors']
+    avg_upstream_ms = _stats['upstream_ms_total'] / upstream_calls if upstream_calls > 0 else 0
+    return {
+        'hits': _stats['hits'],
+        'misses': _stats['misses'],
+        'coalesced': _stats['coalesced'],
+        'expired': _stats['expired'],
+        'evictions': _stats['evictions'],
+        'upstream_errors': _stats['upstream_errors'],
+        'size': len(_entries),
+        'bytes': _bytes,
+        'max_bytes': RESPONSE_CACHE_MAX_BYTES,
+        'ttl_seconds': RESPONSE_CACHE_TTL_SECONDS,
+        'hit_ratio': round(served / lookups, 4) if lookups else 0,
+        'upstream_calls_saved': served,
+        'avg_upstream_ms': round(avg_upstream_ms, 2),
+        'estimated_ms_saved': round(served * avg_upstream_ms, 2),
+    }
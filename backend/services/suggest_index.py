@@ -0,0 +1,448 @@
+"""
+In-memory prefix index behind GET /suggest: lawyer names, firm names, cities
+and specializations of listed (active) lawyers and law firms.
+
+Keys are normalized so Devanagari input and common Hindi/English spelling
+variants meet: text is transliterated to Latin, then folded (sh -> s,
+ee -> i, w -> v, doubled letters collapsed, ...), so 'शर्मा', 'Sharma' and
+'Sarma' share the key 'sarma'. Folding does not preserve prefixes ('Pre' is
+not a prefix of 'priti'), so every entry is also indexed under its plain
+romanized spelling, and a query is looked up in both forms. Each entry is
+indexed under every word start, in a sorted list searched with bisect.
+
+The index is built at startup, updated in place by admin approvals and
+(de)activations on the worker that handles them, and rebuilt every
+SUGGEST_REFRESH_SECONDS so other workers converge.
+"""
+import asyncio
+import bisect
+import heapq
+import logging
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import List, Optional
+
+from services.database import db
+
+# Suggest configuration from environment
+SUGGEST_REFRESH_SECONDS = float(os.environ.get('SUGGEST_REFRESH_SECONDS', 300))
+# Prefixes up to this length are ranked ahead of time; they match the most keys
+SUGGEST_WARM_PREFIX_CHARS = int(os.environ.get('SUGGEST_WARM_PREFIX_CHARS', 3))
+# Rankings kept for longer prefixes (LRU); entries are dropped when a matching profile changes
+SUGGEST_CACHE_SIZE = int(os.environ.get('SUGGEST_CACHE_SIZE', 20000))
+SUGGEST_MAX_RESULTS = 20
+
+# Suggestion types, in the order they are listed for equally good matches
+SUGGEST_TYPES = ('specialization', 'city', 'law_firm', 'lawyer')
+SUGGEST_TYPE_ORDER = {suggestion_type: i for i, suggestion_type in enumerate(SUGGEST_TYPES)}
+SUGGEST_USER_TYPES = ('lawyer', 'law_firm')
+SUGGEST_PROJECTION = {
+    '_id': 0, 'id': 1, 'user_type': 1, 'full_name': 1, 'firm_name': 1, 'city': 1,
+    'specialization': 1, 'practice_areas': 1, 'rating': 1,
+}
+
+# Other names people search for; matched as if they were the canonical value
+ALIASES = {
+    'city': {
+        'Delhi': ['New Delhi', 'Dilli'],
+        'New Delhi': ['Delhi', 'Dilli'],
+        'Mumbai': ['Bombay'],
+        'Bengaluru': ['Bangalore'],
+        'Chennai': ['Madras'],
+        'Kolkata': ['Calcutta'],
+        'Gurugram': ['Gurgaon'],
+        'Prayagraj': ['Allahabad'],
+        'Varanasi': ['Banaras', 'Benares', 'Kashi'],
+        'Puducherry': ['Pondicherry'],
+        'Thiruvananthapuram': ['Trivandrum'],
+        'Kochi': ['Cochin'],
+        'Vadodara': ['Baroda'],
+        'Mysuru': ['Mysore'],
+        'Pune': ['Poona'],
+    },
+    'specialization': {
+        'Criminal Law': ['Fauzdari', 'Apradhik'],
+        'Civil Law': ['Diwani', 'Deewani'],
+        'Family Law': ['Parivarik', 'Talaq'],
+        'Property Law': ['Sampatti', 'Zameen'],
+        'Tax Law': ['Kar'],
+        'Labour Law': ['Shram'],
+        'Consumer Law': ['Upbhokta'],
+    },
+}
+
+# Devanagari -> Latin (ISO 15919-ish, without diacritics)
+_CONSONANTS = {
+    'क': 'k', 'ख': 'kh', 'ग': 'g', 'घ': 'gh', 'ङ': 'n', 'च': 'ch', 'छ': 'chh', 'ज': 'j', 'झ': 'jh', 'ञ': 'n',
+    'ट': 't', 'ठ': 'th', 'ड': 'd', 'ढ': 'dh', 'ण': 'n', 'त': 't', 'थ': 'th', 'द': 'd', 'ध': 'dh', 'न': 'n',
+    'प': 'p', 'फ': 'ph', 'ब': 'b', 'भ': 'bh', 'म': 'm', 'य': 'y', 'र': 'r', 'ल': 'l', 'व': 'v',
+    'श': 'sh', 'ष': 'sh', 'स': 's', 'ह': 'h', 'ळ': 'l',
+}
+# Consonant + nukta (ज़, फ़, ...), as NFC leaves them decomposed
+_NUKTA_CONSONANTS = {'क': 'q', 'ख': 'kh', 'ग': 'g', 'ज': 'z', 'ड': 'r', 'ढ': 'rh', 'फ': 'f'}
+_VOWELS = {
+    'अ': 'a', 'आ': 'aa', 'इ': 'i', 'ई': 'ii', 'उ': 'u', 'ऊ': 'uu', 'ऋ': 'ri', 'ए': 'e', 'ऐ': 'ai',
+    'ओ': 'o', 'औ': 'au', 'ऍ': 'e', 'ऑ': 'o',
+}
+_VOWEL_SIGNS = {
+    'ा': 'aa', 'ि': 'i', 'ी': 'ii', 'ु': 'u', 'ू': 'uu', 'ृ': 'ri', 'े': 'e', 'ै': 'ai', 'ो': 'o', 'ौ': 'au',
+    'ॅ': 'e', 'ॉ': 'o',
+}
+_VIRAMA, _NUKTA, _ANUSVARA, _CHANDRABINDU, _VISARGA = '्', '़', 'ं', 'ँ', 'ः'
+_LABIALS = set('पफबभम')
+
+# Spelling variants folded to one form, applied in order after transliteration
+_FOLDS = [
+    ('chh', 'ch'), ('sh', 's'), ('kh', 'k'), ('gh', 'g'), ('th', 't'), ('dh', 'd'), ('ph', 'f'), ('bh', 'b'),
+    ('jh', 'j'), ('ee', 'i'), ('oo', 'u'), ('w', 'v'), ('z', 'j'), ('q', 'k'),
+]
+_REPEATED = re.compile(r'(.)\1+')
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+_index = {
+    'keys': [],       # sorted (key, entry_id)
+    'entries': {},    # entry_id -> {'type', 'label', 'key', 'plain', 'id', 'rating', 'refs'}
+    'cache': OrderedDict(),  # (prefix, type) -> top SUGGEST_MAX_RESULTS (rank, entry_id, suggestion)
+    'built_at': None,
+}
+_lookup_ms = deque(maxlen=1000)
+_rebuild_lock = asyncio.Lock()
+# Incremental changes made while a rebuild is reading users, replayed onto its result
+_replay: Optional[list] = None
+_refresher: Optional[asyncio.Task] = None
+
+_stats = {
+    'lookups': 0,
+    'cache_hits': 0,
+    'rebuilds': 0,
+    'updates': 0,
+    'failures': 0,
+}
+
+
+def transliterate(text: str) -> str:
+    """Romanize Devanagari, dropping the inherent vowel where Hindi speech does"""
+    if text.isascii():
+        return text
+    out = []
+    chars = unicodedata.normalize('NFC', text)
+    for i, char in enumerate(chars):
+        nxt = chars[i + 1] if i + 1 < len(chars) else ''
+        after = chars[i + 2] if i + 2 < len(chars) else ''
+        if char in _CONSONANTS:
+            if nxt == _NUKTA:
+                out.append(_NUKTA_CONSONANTS.get(char, _CONSONANTS[char]))
+                nxt, after = after, chars[i + 3] if i + 3 < len(chars) else ''
+            else:
+                out.append(_CONSONANTS[char])
+            if nxt in _VOWEL_SIGNS or nxt == _VIRAMA:
+                continue
+            if nxt not in _CONSONANTS and nxt not in _VOWELS and nxt not in (_ANUSVARA, _CHANDRABINDU, _VISARGA):
+                continue  # word-final: no inherent 'a' (राम -> ram)
+            previous = out[-2][-1:] if len(out) > 1 else ''
+            if previous and previous in 'aeiou' and nxt in _CONSONANTS and after in _VOWEL_SIGNS:
+                continue  # medial schwa deletion (कमला -> kamla)
+            out.append('a')
+        elif char in _VOWEL_SIGNS:
+            out.append(_VOWEL_SIGNS[char])
+        elif char in _VOWELS:
+            out.append(_VOWELS[char])
+        elif char in (_ANUSVARA, _CHANDRABINDU):
+            out.append('m' if nxt in _LABIALS else 'ng' if nxt == 'ह' else 'n')
+        elif char == _VISARGA:
+            out.append('h')
+        elif char in (_VIRAMA, _NUKTA):
+            continue
+        elif '०' <= char <= '९':
+            out.append(str(ord(char) - ord('०')))
+        else:
+            out.append(char)
+    return ''.join(out)
+
+
+@lru_cache(maxsize=16384)
+def romanize(text: str) -> str:
+    """Plain search form of text: romanized and lowercased, spelling kept as typed"""
+    text = unicodedata.normalize('NFKD', transliterate(text))
+    text = ''.join(char for char in text if not unicodedata.combining(char)).lower()
+    return ' '.join(_NON_WORD.sub(' ', text).split())
+
+
+@lru_cache(maxsize=16384)
+def normalize(text: str) -> str:
+    """Fold text to its suggest key: romanized, lowercased, variant spellings merged"""
+    text = romanize(text)
+    for variant, folded in _FOLDS:
+        text = text.replace(variant, folded)
+    return _REPEATED.sub(r'\1', text)
+
+
+def query_prefixes(q: str) -> set:
+    """Key prefixes to look up for what the user has typed so far"""
+    folded = normalize(q)
+    prefixes = {folded, romanize(q)}
+    # A fold may be half typed: 'pre' could become 'pree' (-> 'pri'), 'p' could become 'ph' (-> 'f')
+    for partial, completed in (('e', 'i'), ('o', 'u'), ('p', 'f')):
+        if folded.endswith(partial):
+            prefixes.add(folded[:-1] + completed)
+    prefixes.discard('')
+    return prefixes
+
+
+def _word_keys(text: str) -> set:
+    """Folded and plain forms of a name and of each word-start suffix ('priya sarma', 'sarma', 'sharma', ...)"""
+    keys = set()
+    for words in (normalize(text).split(), romanize(text).split()):
+        keys.update(' '.join(words[i:]) for i in range(len(words)))
+    return keys
+
+
+def _entry_sources(profile: dict) -> list:
+    """(entry_id, type, label, profile id or None) for everything a profile contributes"""
+    sources = []
+    user_type = profile.get('user_type')
+    name = profile.get('firm_name') if user_type == 'law_firm' else profile.get('full_name')
+    if isinstance(name, str) and name.strip() and profile.get('id'):
+        sources.append((f"{user_type}:{profile['id']}", user_type, name.strip(), profile['id']))
+    city = profile.get('city')
+    if isinstance(city, str) and city.strip():
+        sources.append((f'city:{normalize(city)}', 'city', city.strip(), None))
+    areas = profile.get('practice_areas') if user_type == 'law_firm' else [profile.get('specialization')]
+    for area in areas if isinstance(areas, list) else []:
+        if isinstance(area, str) and area.strip():
+            sources.append((f'specialization:{normalize(area)}', 'specialization', area.strip(), None))
+    return sources
+
+
+def _new_entry(entry_type: str, label: str, profile_id: Optional[str], profile: dict) -> dict:
+    rating = profile.get('rating')
+    return {
+        'type': entry_type,
+        'label': label,
+        'key': normalize(label),
+        'plain': romanize(label),
+        'id': profile_id,
+        # Profiles rank by rating; cities and specializations by how many profiles share them
+        'rating': rating if profile_id is not None and isinstance(rating, (int, float)) else 0,
+        'refs': 0,
+    }
+
+
+def _entry_keys(entry_type: str, label: str) -> set:
+    keys = _word_keys(label)
+    for alias in ALIASES.get(entry_type, {}).get(label, []):
+        keys |= _word_keys(alias)
+    return keys
+
+
+def _apply(index: dict, profile: dict, delta: int):
+    """
+    Add (delta=1) or remove (delta=-1) one profile's entries; shared entries
+    are reference counted. Returns the keys whose rankings may have changed.
+    """
+    keys, entries = index['keys'], index['entries']
+    changed_keys = set()
+    for entry_id, entry_type, label, profile_id in _entry_sources(profile):
+        entry = entries.get(entry_id)
+        if delta > 0:
+            if entry is None:
+                entry = entries[entry_id] = _new_entry(entry_type, label, profile_id, profile)
+                for key in _entry_keys(entry_type, label):
+                    bisect.insort(keys, (key, entry_id))
+            entry['refs'] += 1
+        elif entry is not None:
+            entry['refs'] -= 1
+            if entry['refs'] <= 0:
+                del entries[entry_id]
+                for key in _entry_keys(entry['type'], entry['label']):
+                    position = bisect.bisect_left(keys, (key, entry_id))
+                    if position < len(keys) and keys[position] == (key, entry_id):
+                        del keys[position]
+        else:
+            continue
+        # Counts and ratings show up in rankings, so every key of the entry is affected
+        changed_keys |= _entry_keys(entry_type, label)
+    return changed_keys
+
+
+def _invalidate(index: dict, cache: OrderedDict, changed_keys: set):
+    """Drop cached rankings for every prefix of the changed keys; re-rank the warm ones"""
+    for key in changed_keys:
+        for length in range(1, len(key) + 1):
+            for suggestion_type in (None,) + SUGGEST_TYPES:
+                cache.pop((key[:length], suggestion_type), None)
+    for prefix in {key[:length] for key in changed_keys for length in range(1, SUGGEST_WARM_PREFIX_CHARS + 1)}:
+        cache[(prefix, None)] = _rank(index, prefix, None)
+
+
+def update_suggest_index(profile: dict, delta: int):
+    """Add (delta=1) or remove (delta=-1) a listed lawyer or law firm"""
+    if profile.get('user_type') not in SUGGEST_USER_TYPES:
+        return
+    changed_keys = _apply(_index, profile, delta)
+    _invalidate(_index, _index['cache'], changed_keys)
+    if _replay is not None:
+        _replay.append((profile, delta))
+    _stats['updates'] += 1
+
+
+async def rebuild_suggest_index():
+    """Rebuild the index from users and swap it in"""
+    global _replay
+    async with _rebuild_lock:
+        _replay = []
+        try:
+            query = {'user_type': {'$in': list(SUGGEST_USER_TYPES)}, 'is_active': {'$ne': False}}
+            profiles = {
+                profile['id']: profile
+                async for profile in db.users.find(query, SUGGEST_PROJECTION) if profile.get('id')
+            }
+
+            entries = {}
+            for profile in profiles.values():
+                for entry_id, entry_type, label, profile_id in _entry_sources(profile):
+                    entry = entries.get(entry_id)
+                    if entry is None:
+                        entry = entries[entry_id] = _new_entry(entry_type, label, profile_id, profile)
+                    entry['refs'] += 1
+            keys = sorted(
+                (key, entry_id)
+                for entry_id, entry in entries.items()
+                for key in _entry_keys(entry['type'], entry['label'])
+            )
+            index = {'keys': keys, 'entries': entries, 'cache': OrderedDict(), 'built_at': None}
+
+            # Short prefixes match the most keys; rank them once here instead of per keystroke
+            prefixes = sorted({key[:length] for key, _ in keys for length in range(1, SUGGEST_WARM_PREFIX_CHARS + 1)})
+            for i, prefix in enumerate(prefixes):
+                index['cache'][(prefix, None)] = _rank(index, prefix, None)
+                if i % 100 == 0:
+                    await asyncio.sleep(0)
+
+            # Changes made while the cursor was open win over whatever it read for those profiles
+            for profile, delta in _replay:
+                current = profiles.get(profile['id'])
+                if current is not None:
+                    _invalidate(index, index['cache'], _apply(index, current, -1))
+                    profiles.pop(profile['id'])
+                if delta > 0:
+                    _invalidate(index, index['cache'], _apply(index, profile, 1))
+                    profiles[profile['id']] = profile
+
+            index['built_at'] = datetime.now(timezone.utc)
+            _index.update(index)
+            _stats['rebuilds'] += 1
+        finally:
+            _replay = None
+
+
+def _rank(index: dict, prefix: str, suggestion_type: Optional[str]) -> List[tuple]:
+    """Rank every entry with a key starting with prefix; keep the best SUGGEST_MAX_RESULTS"""
+    keys, entries = index['keys'], index['entries']
+    start = bisect.bisect_left(keys, (prefix, ''))
+    end = bisect.bisect_left(keys, (prefix + '\uffff', ''), start)
+    best = {}
+    for key, entry_id in keys[start:end]:
+        entry = entries[entry_id]
+        if suggestion_type and entry['type'] != suggestion_type:
+            continue
+        # Matching the start of the name beats matching a later word or an alias
+        rank = (key not in (entry['key'], entry['plain']), SUGGEST_TYPE_ORDER[entry['type']], -entry['rating'], -entry['refs'], entry['label'])
+        if entry_id not in best or rank < best[entry_id]:
+            best[entry_id] = rank
+
+    suggestions = []
+    for entry_id in heapq.nsmallest(SUGGEST_MAX_RESULTS, best, key=best.__getitem__):
+        entry = entries[entry_id]
+        suggestion = {'type': entry['type'], 'label': entry['label']}
+        if entry['id'] is not None:
+            suggestion['id'] = entry['id']
+        else:
+            suggestion['count'] = entry['refs']
+        suggestions.append((best[entry_id], entry_id, suggestion))
+    return suggestions
+
+
+def _ranked(prefix: str, suggestion_type: Optional[str]) -> List[tuple]:
+    """Cached ranking for one prefix"""
+    cache = _index['cache']
+    cache_key = (prefix, suggestion_type)
+    ranked = cache.get(cache_key)
+    if ranked is None:
+        ranked = cache[cache_key] = _rank(_index, prefix, suggestion_type)
+        if len(cache) > SUGGEST_CACHE_SIZE:
+            cache.popitem(last=False)
+    else:
+        _stats['cache_hits'] += 1
+        cache.move_to_end(cache_key)
+    return ranked
+
+
+def suggest(q: str, limit: int = 8, suggestion_type: Optional[str] = None) -> List[dict]:
+    """Get up to limit suggestions whose name, or a word in it, starts with q"""
+    started = time.perf_counter()
+    prefixes = query_prefixes(q)
+    if not prefixes:
+        return []
+    _stats['lookups'] += 1
+    # Each prefix's list is already sorted by rank; an entry found under several keeps its best
+    suggestions, seen = [], set()
+    for _, entry_id, suggestion in heapq.merge(
+        *(_ranked(prefix, suggestion_type) for prefix in sorted(prefixes)), key=lambda item: item[:2]
+    ):
+        if entry_id not in seen:
+            seen.add(entry_id)
+            suggestions.append(suggestion)
+            if len(suggestions) == limit:
+                break
+    _lookup_ms.append((time.perf_counter() - started) * 1000)
+    return suggestions
+
+
+async def _refresh_loop():
+    while True:
+        try:
+            await rebuild_suggest_index()
+        except Exception as e:
+            _stats['failures'] += 1
+            logging.error(f'Suggest index rebuild failed: {str(e)}')
+        await asyncio.sleep(SUGGEST_REFRESH_SECONDS)
+
+
+def start_suggest_index():
+    """Build the index in the background and keep it fresh"""
+    global _refresher
+    if _refresher is None:
+        _refresher = asyncio.create_task(_refresh_loop())
+
+
+async def stop_suggest_index():
+    """Stop periodic rebuilds"""
+    global _refresher
+    if _refresher is None:
+        return
+    _refresher.cancel()
+    try:
+        await _refresher
+    except asyncio.CancelledError:
+        pass
+    _refresher = None
+
+
+def get_suggest_stats() -> dict:
+    """Get index size and lookup latency"""
+    ordered = sorted(_lookup_ms)
+    return {
+        **_stats,
+        'entries': len(_index['entries']),
+        'keys': len(_index['keys']),
+        'built_at': _index['built_at'],
+        'cached_prefixes': len(_index['cache']),
+        'lookup_p50_ms': round(ordered[len(ordered) // 2], 3) if ordered else None,
+        'lookup_p99_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 3) if ordered else None,
+    }
@@ -0,0 +1,79 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
+# Cache configuration from environment
+USER_CACHE_TTL_SECONDS = float(os.environ.get('USER_CACHE_TTL_SECONDS', 60))
+USER_CACHE_MAX_ENTRIES = int(os.environ.get('USER_CACHE_MAX_ENTRIES', 10000))
+
+# user_id -> (expires_at, user document), least recently used first
+_entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+_stats = {
+    'hits': 0,
+    'misses': 0,
+    'expired': 0,
+    'evictions': 0,
+    'invalidations': 0,
+}
+
+
+def get_cached_user(user_id: str) -> Optional[dict]:
+    """Get a cached user document, or None if missing or expired"""
+    entry = _entries.get(user_id)
+    if entry is None:
+        _stats['misses'] += 1
+        return None
+
+    expires_at, user = entry
+    if expires_at <= time.monotonic():
+        del _entries[user_id]
+        _stats['expired'] += 1
+        _stats['misses'] += 1
+        return None
+
+    _entries.move_to_end(user_id)
+    _stats['hits'] += 1
+    return dict(user)
+
+
+def cache_user(user: dict):
+    """Store a user document, evicting the least recently used entries"""
+    if USER_CACHE_TTL_SECONDS <= 0 or USER_CACHE_MAX_ENTRIES <= 0:
+        return
+
+    _entries[user['id']] = (time.monotonic() + USER_CACHE_TTL_SECONDS, dict(user))
+    _entries.move_to_end(user['id'])
+    while len(_entries) > USER_CACHE_MAX_ENTRIES:
+        _entries.popitem(last=False)
+        _stats['evictions'] += 1
+
+
+def invalidate_user(user_id: str):
+    """Drop a user from the cache after their document changes"""
+    if _entries.pop(user_id, None) is not None:
+        _stats['invalidations'] += 1
+
+
+def invalidate_user_email(email: str):
+    """Drop every cached user with the given email"""
+    for user_id in [uid for uid, (_, user) in _entries.items() if user.get('email') == email]:
+        invalidate_user(user_id)
+
+
+def clear_user_cache():
+    """Drop every cached user"""
+    _entries.clear()
+
+
+def get_user_cache_stats() -> dict:
+    """Get hit/miss counters for the user cache"""
+    lookups = _stats['hits'] + _stats['misses']
+    return {
+        **_stats,
+        'size': len(_entries),
+        'max_entries': USER_CACHE_MAX_ENTRIES,
+        'ttl_seconds': USER_CACHE_TTL_SECONDS,
+        'hit_ratio': round(_stats['hits'] / lookups, 4) if lookups else 0,
+    }
@@ -215,6 +215,21 @@ export default function AdminDashboard() {
     }
   };
 
+  // Lists leave out lawyer photos; load the full application when one is opened
+  const openApplication = async (app, type) => {
+    setSelectedApp({ ...app, type });
+    if (type !== 'lawyer' || app.photo) return;
+    try {
+      const token = localStorage.getItem('adminToken');
+      const res = await axios.get(`${API}/admin/lawyer-applications/${app._id}`, {
+        headers: { Authorization: `Bearer ${token}` }
+      });
+      setSelectedApp(prev => (prev && prev._id === app._id ? { ...prev, photo: res.data.photo } : prev));
+    } catch (error) {
+      // Keep showing the application without its photo
+    }
+  };
+
   const handleLawyerAction = async (appId, action) => {
     setActionLoading(appId);
     try {
@@ -336,7 +351,7 @@ export default function AdminDashboard() {
         subtitle: app.specialization,
         detail1: `${app.city}, ${app.state}`,
         detail2: `${app.experience || app.experience_years || 0} yrs exp`,
-        image: app.photo || `https://randomuser.me/api/portraits/men/${parseInt(app._id?.slice(-2) || '10', 16) % 90}.jpg`
+        image: app.photo || null
       },
       lawfirm: {
         color: 'blue',
@@ -382,7 +397,7 @@ export default function AdminDashboard() {
         animate={{ opacity: 1, y: 0 }}
         whileHover={{ y: -4, scale: 1.01 }}
         className={`bg-slate-900/60 backdrop-blur-sm border border-slate-700/50 rounded-2xl p-5 cursor-pointer ${config.border} transition-all group`}
-        onClick={() => setSelectedApp({ ...app, type })}
+        onClick={() => openApplication(app, type)}
       >
         <div className="flex items-start gap-4">
           {config.image ? (
@@ -468,15 +483,16 @@ export default function AdminDashboard() {
               <X className="w-5 h-5 text-slate-400" />
             </button>
             <div className="flex items-center gap-4">
-              {app.type === 'lawyer' ? (
+              {app.type === 'lawyer' && app.photo ? (
                 <img
-                  src={app.photo || `https://randomuser.me/api/portraits/men/${parseInt(app._id?.slice(-2) || '10', 16) % 90}.jpg`}
+                  src={app.photo}
                   alt={app.name}
                   className={`w-20 h-20 rounded-2xl object-cover border-2 border-${config.color}-500 shadow-lg shadow-${config.color}-500/20`}
                 />
               ) : (
                 <div className={`w-20 h-20 rounded-2xl bg-gradient-to-br from-${config.color}-600 to-${config.color}-400 flex items-center justify-center shadow-lg`}>
-                  {app.type === 'lawfirm' ? <Building2 className="w-10 h-10 text-white" /> : 
+                  {app.type === 'lawyer' ? <Scale className="w-10 h-10 text-white" /> :
+                   app.type === 'lawfirm' ? <Building2 className="w-10 h-10 text-white" /> : 
                    app.type === 'firmlawyer' ? <Users className="w-10 h-10 text-white" /> :
                    <User className="w-10 h-10 text-white" />}
                 </div>
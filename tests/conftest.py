@@ -0,0 +1,14 @@
+"""
+Shared setup for unit tests that import backend modules directly.
+
+The services package opens its Motor client at import time; Motor connects
+lazily, so placeholder settings are enough for tests that never touch Mongo.
+"""
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'lxwyer_up_test')
@@ -0,0 +1,21 @@
+"""
+Admin profile maintenance tests
+Tests for: facet/suggest failures after an approval not failing the request
+"""
+import asyncio
+
+from routes import admin
+
+
+class TestIndexProfile:
+    def test_facet_failure_is_logged_not_raised(self, monkeypatch, caplog):
+        indexed = []
+
+        async def failing_facets(profile, delta):
+            raise RuntimeError('bulk_write failed')
+
+        monkeypatch.setattr(admin, 'adjust_profile_facets', failing_facets)
+        monkeypatch.setattr(admin, 'update_suggest_index', lambda profile, delta: indexed.append((profile['id'], delta)))
+        asyncio.run(admin.index_profile({'id': 'l1', 'user_type': 'lawyer'}, 1))
+        assert indexed == [('l1', 1)]
+        assert 'bulk_write failed' in caplog.text
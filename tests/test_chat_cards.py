@@ -0,0 +1,19 @@
+"""
+Chat card parsing tests
+Tests for: card types the frontend renders, repair of malformed responses
+"""
+from services.chat_cards import CARDS_REPAIRED, CARDS_VALID, parse_cards
+
+
+class TestParseCards:
+    def test_definition_card_kept(self):
+        """QuickChat asks for definition cards and renders them"""
+        response = '{"cards": [{"type": "definition", "title": "Bail", "content": "Release pending trial."}]}'
+        cards, status = parse_cards(response)
+        assert cards == [{'type': 'definition', 'title': 'Bail', 'content': 'Release pending trial.'}]
+        assert status == CARDS_VALID
+
+    def test_unknown_type_repaired_to_info(self):
+        cards, status = parse_cards('{"cards": [{"type": "trivia", "title": "Bail", "content": "Release."}]}')
+        assert cards[0]['type'] == 'info'
+        assert status == CARDS_REPAIRED
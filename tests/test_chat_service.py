@@ -0,0 +1,68 @@
+"""
+Chat client pool tests
+Tests for: stateless turns reusing the session's pooled client with a fresh history
+"""
+import asyncio
+
+import pytest
+
+from services import chat_service, llm_providers
+
+
+class HistoryClient:
+    """Client that remembers every message it was sent, like a provider conversation"""
+
+    def __init__(self):
+        self.history = []
+        self.seen = []
+
+    def reset_history(self):
+        self.history = []
+
+    async def send_message(self, message) -> str:
+        self.history.append(message.text)
+        self.seen.append(list(self.history))
+        return '{"cards": []}'
+
+
+class HistoryProvider:
+    name = 'history'
+
+    def __init__(self):
+        self.built = []
+
+    def build_client(self, session_id: str, prompt: str):
+        self.built.append(HistoryClient())
+        return self.built[-1]
+
+    def user_message(self, text: str):
+        return llm_providers.TextMessage(text)
+
+
+@pytest.fixture
+def provider():
+    previous = llm_providers._provider
+    provider = HistoryProvider()
+    llm_providers.set_provider(provider)
+    chat_service._clients.clear()
+    yield provider
+    llm_providers.set_provider(previous)
+
+
+class TestSessionClients:
+    def test_stateless_turns_reuse_pooled_client(self, provider):
+        async def turns():
+            for text in ('first', 'second', 'third'):
+                await chat_service.send_chat_message(text, 'user-1', stateless=True)
+
+        asyncio.run(turns())
+        assert len(provider.built) == 1
+        assert provider.built[0].seen == [['first'], ['second'], ['third']]
+
+    def test_session_turns_keep_history(self, provider):
+        async def turns():
+            for text in ('first', 'second'):
+                await chat_service.send_chat_message(text, 'guest_a')
+
+        asyncio.run(turns())
+        assert provider.built[0].seen == [['first'], ['first', 'second']]
@@ -0,0 +1,75 @@
+"""
+Chat streaming tests
+Tests for: token-by-token SSE from a streaming client, admission 429 before the stream starts
+"""
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routes import chat
+from services import chat_service, llm_limiter, llm_providers
+
+CHUNKS = ['{"cards": [{"type": "info", ', '"title": "Bail", ', '"content": "Release pending trial."}]}']
+
+
+class ChunkedClient:
+    async def stream_message(self, message):
+        for chunk in CHUNKS:
+            yield chunk
+
+
+class ChunkedProvider:
+    """Provider whose clients stream CHUNKS"""
+    name = 'chunked'
+
+    def build_client(self, session_id: str, prompt: str):
+        return ChunkedClient()
+
+    def user_message(self, text: str):
+        return llm_providers.TextMessage(text)
+
+
+def events(body: str) -> list:
+    """(event, data) pairs from an SSE body"""
+    parsed = []
+    for block in body.strip().split('\n\n'):
+        event, data = block.split('\n', 1)
+        parsed.append((event[len('event: '):], json.loads(data[len('data: '):])))
+    return parsed
+
+
+@pytest.fixture
+def client():
+    previous = llm_providers._provider
+    llm_providers.set_provider(ChunkedProvider())
+    chat_service._clients.clear()
+    app = FastAPI()
+    app.include_router(chat.router)
+    with TestClient(app) as test_client:
+        yield test_client
+    llm_providers.set_provider(previous)
+
+
+class TestChatStream:
+    def test_tokens_arrive_as_separate_events(self, client):
+        response = client.post('/chat/guest/stream', json={'message': 'What is bail?', 'session_id': 'guest_a'})
+        assert response.status_code == 200
+        parsed = events(response.text)
+        assert [data['text'] for event, data in parsed if event == 'token'] == CHUNKS
+        assert [data['title'] for event, data in parsed if event == 'card'] == ['Bail']
+        assert parsed[-1][0] == 'done'
+        assert llm_limiter.get_llm_limiter_stats()['in_flight'] == 0
+
+    def test_admission_rejection_is_http_429(self, client, monkeypatch):
+        @asynccontextmanager
+        async def full(user_key):
+            llm_limiter._reject('rejected_queue_full', 'Assistant is busy, please try again shortly')
+            yield
+
+        monkeypatch.setattr(chat, 'llm_slot', full)
+        response = client.post('/chat/guest/stream', json={'message': 'What is bail?', 'session_id': 'guest_a'})
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == str(llm_limiter.LLM_RETRY_AFTER)
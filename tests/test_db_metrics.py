@@ -0,0 +1,33 @@
+"""
+Mongo pool metrics listener tests
+Tests for: pool and connection events updating PoolMetricsListener counters
+"""
+from pymongo import monitoring
+
+from services.db_metrics import PoolMetricsListener
+
+ADDRESS = ('localhost', 27017)
+
+
+class TestPoolMetricsListener:
+    """Tests for PoolMetricsListener"""
+
+    def test_pool_cleared_is_counted(self):
+        """pymongo calls listener.pool_cleared(event); it must stay callable and count"""
+        listener = PoolMetricsListener()
+        listener.pool_cleared(monitoring.PoolClearedEvent(ADDRESS))
+        listener.pool_cleared(monitoring.PoolClearedEvent(ADDRESS))
+        assert callable(listener.pool_cleared)
+        assert listener.stats()['pools_cleared'] == 2
+
+    def test_checkouts_tracked(self):
+        """A checkout and check-in leave in_use at zero and record one checkout"""
+        listener = PoolMetricsListener()
+        listener.connection_created(monitoring.ConnectionCreatedEvent(ADDRESS, 1))
+        listener.connection_check_out_started(monitoring.ConnectionCheckOutStartedEvent(ADDRESS))
+        listener.connection_checked_out(monitoring.ConnectionCheckedOutEvent(ADDRESS, 1))
+        listener.connection_checked_in(monitoring.ConnectionCheckedInEvent(ADDRESS, 1))
+        stats = listener.stats()
+        assert stats['open_connections'] == 1
+        assert stats['in_use'] == 0
+        assert stats['checkouts'] == 1
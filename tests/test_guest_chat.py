@@ -0,0 +1,79 @@
+"""
+Guest chat tests
+Tests for: first-turn response cache with client-chosen session ids, carrying a cached answer into the next turn
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routes import chat
+from services import chat_context, chat_service, llm_providers, response_cache
+
+ANSWER = '{"cards": [{"type": "info", "title": "Bail", "content": "Release pending trial."}]}'
+
+
+class RecordingClient:
+    def __init__(self, sent: list):
+        self._sent = sent
+
+    async def send_message(self, message) -> str:
+        self._sent.append(message.text)
+        return ANSWER
+
+
+class RecordingProvider:
+    """Provider that answers every message with ANSWER and records what was sent"""
+    name = 'recording'
+
+    def __init__(self):
+        self.sent = []
+
+    def build_client(self, session_id: str, prompt: str):
+        return RecordingClient(self.sent)
+
+    def user_message(self, text: str):
+        return llm_providers.TextMessage(text)
+
+
+@pytest.fixture
+def provider():
+    previous = llm_providers._provider
+    provider = RecordingProvider()
+    llm_providers.set_provider(provider)
+    response_cache.clear_response_cache()
+    chat_service._clients.clear()
+    chat_context._guest_seeds.clear()
+    yield provider
+    llm_providers.set_provider(previous)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(chat.router)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+class TestGuestChat:
+    def test_first_turn_with_session_id_hits_cache(self, provider, client):
+        """QuickChat sends its own guest id on the first message"""
+        hits = response_cache.get_response_cache_stats()['hits']
+        first = client.post('/chat/guest', json={'message': 'What is bail?', 'session_id': 'guest_a'})
+        second = client.post('/chat/guest', json={'message': 'what is bail', 'session_id': 'guest_b'})
+        assert first.status_code == 200 and second.status_code == 200
+        assert second.json()['response'] == ANSWER
+        assert provider.sent == ['What is bail?']
+        assert response_cache.get_response_cache_stats()['hits'] == hits + 1
+
+    def test_follow_up_is_not_cached(self, provider, client):
+        client.post('/chat/guest', json={'message': 'What is bail?', 'session_id': 'guest_a'})
+        client.post('/chat/guest', json={'message': 'What is bail?', 'session_id': 'guest_a'})
+        assert len(provider.sent) == 2
+
+    def test_cached_answer_carried_into_next_turn(self, provider, client):
+        client.post('/chat/guest', json={'message': 'What is bail?', 'session_id': 'guest_a'})
+        client.post('/chat/guest', json={'message': 'What is bail?', 'session_id': 'guest_b'})
+        client.post('/chat/guest', json={'message': 'And in Delhi?', 'session_id': 'guest_b'})
+        assert 'User: What is bail?' in provider.sent[-1]
+        assert provider.sent[-1].endswith('And in Delhi?')
@@ -323,6 +323,38 @@ class TestCaseCRUD:
         fetched_case = get_response.json()
         assert fetched_case["title"] == case_data["title"]
 
+    def test_list_cases_paginated(self, api_client, client_auth):
+        """Test GET /api/cases walks every page via X-Next-Cursor without repeats"""
+        headers = {"Authorization": f"Bearer {client_auth}"}
+        for _ in range(3):
+            api_client.post(f"{BASE_URL}/api/cases", json={
+                "title": f"TEST_Page_{uuid.uuid4().hex[:8]}",
+                "case_number": f"CASE-{uuid.uuid4().hex[:6].upper()}",
+                "description": "Pagination test case"
+            }, headers=headers)
+
+        seen = []
+        params = {"limit": 2}
+        while True:
+            response = api_client.get(f"{BASE_URL}/api/cases", params=params, headers=headers)
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page) <= 2
+            seen.extend(case["id"] for case in page)
+            next_cursor = response.headers.get("X-Next-Cursor")
+            if not next_cursor:
+                break
+            params = {"limit": 2, "cursor": next_cursor}
+
+        assert len(seen) >= 3
+        assert len(seen) == len(set(seen))
+
+    def test_list_cases_invalid_cursor(self, api_client, client_auth):
+        """Test a malformed cursor returns 400"""
+        headers = {"Authorization": f"Bearer {client_auth}"}
+        response = api_client.get(f"{BASE_URL}/api/cases", params={"cursor": "not-a-cursor"}, headers=headers)
+        assert response.status_code == 400
+
 
 class TestUnauthorizedAccess:
     """Tests for unauthorized access scenarios"""
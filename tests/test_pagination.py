@@ -0,0 +1,55 @@
+"""
+Pagination tests
+Tests for: per-route default page sizes, cursor validation
+"""
+import base64
+from datetime import datetime
+
+import pytest
+from bson import json_util
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, PageParams, decode_cursor, encode_cursor, page_params
+
+app = FastAPI()
+
+
+@app.get('/default')
+async def default_page(page: PageParams = Depends()):
+    return {'limit': page.limit, 'cursor': page.cursor}
+
+
+@app.get('/large')
+async def large_page(page: PageParams = Depends(page_params(1000))):
+    return {'limit': page.limit, 'cursor': page.cursor}
+
+
+client = TestClient(app)
+
+
+class TestPageParams:
+    def test_default_limit(self):
+        assert client.get('/default').json()['limit'] == DEFAULT_PAGE_SIZE
+        assert client.get('/default', params={'limit': MAX_PAGE_SIZE + 1}).status_code == 422
+
+    def test_route_default_limit(self):
+        """Lists that used to return up to 1000 items still do without a limit"""
+        assert client.get('/large').json() == {'limit': 1000, 'cursor': None}
+        assert client.get('/large', params={'limit': 20, 'cursor': 'abc'}).json() == {'limit': 20, 'cursor': 'abc'}
+        assert client.get('/large', params={'limit': 1001}).status_code == 422
+
+
+class TestDecodeCursor:
+    def test_round_trip(self):
+        created = datetime(2026, 1, 2, 3, 4, 5)
+        assert decode_cursor(encode_cursor(created, 'abc')) == (created, 'abc')
+        assert decode_cursor(encode_cursor(None, 'abc')) == (None, 'abc')
+
+    def test_operator_values_rejected(self):
+        """A crafted cursor must not inject query operators into the page filter"""
+        for values in ([{'$ne': None}, 'abc'], ['x', {'$gt': ''}], ['x', None], {'a': 1, 'b': 2}, ['x', 'y', 'z']):
+            cursor = base64.urlsafe_b64encode(json_util.dumps(values).encode('utf-8')).decode('ascii')
+            with pytest.raises(HTTPException) as error:
+                decode_cursor(cursor)
+            assert error.value.status_code == 400
@@ -0,0 +1,73 @@
+"""
+Typeahead suggest index tests
+Tests for: prefix lookups while typing, spelling variants, incremental updates
+"""
+from collections import OrderedDict
+
+import pytest
+
+from services import suggest_index
+
+PROFILES = [
+    {'id': 'l1', 'user_type': 'lawyer', 'full_name': 'Preeti Sharma', 'city': 'Mumbai',
+     'specialization': 'Property Law', 'rating': 4.8},
+    {'id': 'l2', 'user_type': 'lawyer', 'full_name': 'Naveen Kumar', 'city': 'Delhi',
+     'specialization': 'Criminal Law', 'rating': 4.2},
+    {'id': 'f1', 'user_type': 'law_firm', 'firm_name': 'Phoenix Legal', 'city': 'Pune', 'practice_areas': ['Tax Law']},
+    {'id': 'f2', 'user_type': 'law_firm', 'firm_name': 'Goodwill Associates', 'city': 'Chennai',
+     'practice_areas': ['Family Law']},
+]
+
+
+@pytest.fixture(autouse=True)
+def index():
+    """Fresh index holding PROFILES"""
+    suggest_index._index.update({'keys': [], 'entries': {}, 'cache': OrderedDict(), 'built_at': None})
+    for profile in PROFILES:
+        suggest_index.update_suggest_index(profile, 1)
+    yield suggest_index._index
+
+
+def labels(q: str) -> list:
+    return [suggestion['label'] for suggestion in suggest_index.suggest(q, limit=20)]
+
+
+class TestTypingPrefixes:
+    """Every prefix of a name, typed one character at a time, keeps suggesting it"""
+
+    @pytest.mark.parametrize('name', ['Preeti Sharma', 'Naveen Kumar', 'Phoenix Legal', 'Goodwill Associates'])
+    def test_each_prefix_suggests_name(self, name):
+        for end in range(1, len(name) + 1):
+            typed = name[:end]
+            if not typed.strip():
+                continue
+            assert name in labels(typed), f'{typed!r} lost {name!r}'
+
+    def test_later_word_prefixes(self):
+        """Typing a surname on its own finds the full name"""
+        for end in range(1, len('Sharma') + 1):
+            assert 'Preeti Sharma' in labels('Sharma'[:end])
+
+    def test_spelling_variants_meet(self):
+        """Alternative spellings and Devanagari reach the same entry"""
+        assert 'Preeti Sharma' in labels('Priti Sarma')
+        assert 'Preeti Sharma' in labels('शर्मा')
+        assert 'Phoenix Legal' in labels('Foenix')
+        assert 'Mumbai' in labels('Bombay')
+
+
+class TestUpdates:
+    """Incremental updates keep lookups current"""
+
+    def test_removed_profile_disappears(self):
+        assert 'Goodwill Associates' in labels('Go')
+        suggest_index.update_suggest_index(PROFILES[3], -1)
+        assert 'Goodwill Associates' not in labels('Go')
+        assert 'Chennai' not in labels('Che')
+
+    def test_shared_city_counts_profiles(self):
+        suggest_index.update_suggest_index(
+            {'id': 'l3', 'user_type': 'lawyer', 'full_name': 'Asha Rao', 'city': 'Mumbai'}, 1
+        )
+        city = next(s for s in suggest_index.suggest('Mum') if s['type'] == 'city')
+        assert city == {'type': 'city', 'label': 'Mumbai', 'count': 2}